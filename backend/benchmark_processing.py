@@ -0,0 +1,328 @@
+"""
+Page Processing Benchmark for Physical AI Book Content
+
+Measures throughput and peak memory of the CPU-bound page processing stages on the
+book's pages. Pages are either loaded from a directory of saved HTML files or
+rendered from the book's Markdown sources into Docusaurus-like HTML (navbar,
+sidebar, article, footer), so the benchmark runs without network access.
+
+Usage:
+    python benchmark_processing.py
+    python benchmark_processing.py --stage extract --parsers selectolax lxml html.parser
+    python benchmark_processing.py --html-dir ./saved_pages --repeat 5
+"""
+import argparse
+import html
+import os
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# Processing components only need the configuration to load; no API calls are made
+os.environ.setdefault("COHERE_API_KEY", "benchmark")
+os.environ.setdefault("PHYSICAL_AI_BOOK_BASE_URL", "https://example.github.io/physical-ai-book/")
+os.environ.setdefault("QDRANT_URL", "http://localhost:6333")
+os.environ.setdefault("QDRANT_API_KEY", "benchmark")
+
+from src.utils.config import Config
+from src.processor.text_extractor import TextExtractor, SELECTOLAX_AVAILABLE, LXML_AVAILABLE
+from src.processor.cleaner import ContentCleaner
+from src.processor.chunker import ContentChunker
+
+DEFAULT_DOCS_DIR = Path(__file__).resolve().parent.parent / "docs"
+
+PAGE_TEMPLATE = """<!doctype html>
+<html lang="en"><head><meta charset="utf-8"><title>{title} | Physical AI Book</title>
+<script>window.__DOCUSAURUS__ = {{"theme": "light"}};</script>
+<style>.navbar {{ display: flex; }}</style></head>
+<body><div id="__docusaurus">
+<nav class="navbar navbar--fixed-top"><div class="navbar__inner"><a class="navbar__brand" href="/physical-ai-book/">Physical AI Book</a>
+<a class="navbar__item navbar__link" href="/physical-ai-book/docs/intro/">Book</a></div></nav>
+<div class="main-wrapper docs-wrapper"><div class="docRoot">
+<aside class="theme-doc-sidebar-container"><nav class="menu"><ul class="menu__list">{sidebar}</ul></nav></aside>
+<main class="docMainContainer"><div class="container"><div class="row"><div class="col docItemCol">
+<article><div class="theme-doc-markdown markdown">{body}</div></article>
+</div></div></div></main></div></div>
+<footer class="footer"><div class="footer__copyright">Copyright Physical AI Book</div></footer>
+</div></body></html>
+"""
+
+
+def render_markdown(markdown: str) -> str:
+    """
+    Render Markdown to HTML, well enough to give realistic page structure.
+
+    Args:
+        markdown: Markdown source
+
+    Returns:
+        HTML fragment
+    """
+    markdown = re.sub(r"\A---\n.*?\n---\n", "", markdown, flags=re.DOTALL)
+    parts = []
+    paragraph: List[str] = []
+    in_code = False
+    code_lines: List[str] = []
+
+    def flush_paragraph():
+        if paragraph:
+            parts.append(f"<p>{html.escape(' '.join(paragraph))}</p>")
+            paragraph.clear()
+
+    for line in markdown.splitlines():
+        if line.startswith("```"):
+            if in_code:
+                parts.append(f"<pre><code>{html.escape(chr(10).join(code_lines))}</code></pre>")
+                code_lines = []
+            else:
+                flush_paragraph()
+            in_code = not in_code
+        elif in_code:
+            code_lines.append(line)
+        elif re.match(r"#{1,6} ", line):
+            flush_paragraph()
+            level = len(line.split(" ", 1)[0])
+            parts.append(f"<h{level}>{html.escape(line[level + 1:].strip())}</h{level}>")
+        elif re.match(r"\s*[-*] ", line):
+            flush_paragraph()
+            parts.append(f"<ul><li>{html.escape(line.strip()[2:])}</li></ul>")
+        elif not line.strip():
+            flush_paragraph()
+        else:
+            paragraph.append(line.strip())
+    flush_paragraph()
+    return "\n".join(parts)
+
+
+def load_pages(docs_dir: Path, html_dir: Path = None) -> List[Tuple[str, str]]:
+    """
+    Load the pages to benchmark.
+
+    Args:
+        docs_dir: Directory of Markdown sources to render
+        html_dir: Optional directory of saved HTML pages, used instead of docs_dir
+
+    Returns:
+        List of (url, html) tuples
+    """
+    if html_dir:
+        return [(path.as_uri(), path.read_text(encoding="utf-8", errors="replace"))
+                for path in sorted(html_dir.rglob("*.html"))]
+
+    sources = sorted(docs_dir.rglob("*.md"))
+    sidebar = "".join(
+        f'<li class="menu__list-item"><a class="menu__link" href="/physical-ai-book/docs/{path.stem}/">{path.stem}</a></li>'
+        for path in sources
+    )
+    pages = []
+    for path in sources:
+        relative = path.relative_to(docs_dir).with_suffix("")
+        url = f"https://example.github.io/physical-ai-book/docs/{relative.as_posix()}/"
+        page = PAGE_TEMPLATE.format(
+            title=html.escape(path.stem),
+            sidebar=sidebar,
+            body=render_markdown(path.read_text(encoding="utf-8"))
+        )
+        pages.append((url, page))
+    return pages
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict:
+    """
+    Time a function and measure its peak Python memory allocation.
+
+    Args:
+        func: Function to benchmark
+        repeat: Number of timed runs; the fastest is reported
+
+    Returns:
+        Dictionary with "seconds" and "peak_mb"
+    """
+    func()  # Warm up
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": min(timings), "peak_mb": peak / (1024 * 1024)}
+
+
+def benchmark_extract(pages: List[Tuple[str, str]], parsers: List[str], repeat: int) -> List[Dict]:
+    """
+    Benchmark TextExtractor.extract_text with each parser backend.
+
+    Args:
+        pages: List of (url, html) tuples
+        parsers: Parser backends to compare
+        repeat: Number of timed runs per backend
+
+    Returns:
+        List of result rows
+    """
+    config = Config()
+    rows = []
+    reference_texts = None
+    for parser in parsers:
+        extractor = TextExtractor(config)
+        extractor.parser = parser
+
+        def run():
+            return [extractor.extract_text(page, url) for url, page in pages]
+
+        texts = [result["text"] for result in run()]
+        if reference_texts is None:
+            reference_texts = texts
+        matches = sum(1 for a, b in zip(texts, reference_texts) if a == b)
+
+        result = measure(run, repeat)
+        result.update({"stage": "extract", "variant": parser, "matches": f"{matches}/{len(pages)}"})
+        rows.append(result)
+    return rows
+
+
+def benchmark_clean(pages: List[Tuple[str, str]], repeat: int) -> List[Dict]:
+    """
+    Benchmark ContentCleaner.clean_content on the extracted text of each page.
+
+    Args:
+        pages: List of (url, html) tuples
+        repeat: Number of timed runs
+
+    Returns:
+        List of result rows; throughput is relative to the extracted text size
+    """
+    config = Config()
+    extractor = TextExtractor(config)
+    extracted = [extractor.extract_text(page, url) for url, page in pages]
+    cleaner = ContentCleaner(config)
+
+    def run():
+        return [cleaner.clean_content(result["text"], result["metadata"]) for result in extracted]
+
+    result = measure(run, repeat)
+    result.update({
+        "stage": "clean",
+        "variant": "ContentCleaner",
+        "matches": "-",
+        "input_mb": sum(len(r["text"].encode("utf-8")) for r in extracted) / (1024 * 1024)
+    })
+    return [result]
+
+
+def benchmark_chunk(pages: List[Tuple[str, str]], repeat: int) -> List[Dict]:
+    """
+    Benchmark ContentChunker.chunk_content on the cleaned text of each page and on
+    all pages joined into one long document, and ContentChunker.chunk_sections on
+    the cleaned sections of each page.
+
+    Args:
+        pages: List of (url, html) tuples
+        repeat: Number of timed runs
+
+    Returns:
+        List of result rows; throughput is relative to the cleaned text size
+    """
+    config = Config()
+    extractor = TextExtractor(config)
+    cleaner = ContentCleaner(config)
+    chunker = ContentChunker(config)
+
+    documents = []
+    for url, page in pages:
+        result = extractor.extract_text(page, url)
+        documents.append((cleaner.clean_content(result["text"], result["metadata"]), result["metadata"]))
+    long_document = [(" ".join(text for text, _ in documents), {"url": "long"})]
+
+    # Cleaned sections for the section-aware strategy
+    sectioned = []
+    for url, page in pages:
+        result = extractor.extract_sections(page, url)
+        sections = [
+            {"heading_path": section["heading_path"], "blocks": [
+                {"type": block["type"],
+                 "text": block["text"] if block["type"] == "code" else cleaner.clean_content(block["text"])}
+                for block in section["blocks"]
+            ]}
+            for section in result["sections"]
+        ]
+        sectioned.append((sections, result["metadata"]))
+
+    rows = []
+    for variant, inputs in (("pages", documents), ("long page", long_document)):
+        def run():
+            return [chunker.chunk_content(text, metadata) for text, metadata in inputs]
+
+        result = measure(run, repeat)
+        result.update({
+            "stage": "chunk",
+            "variant": variant,
+            "matches": "-",
+            "input_mb": sum(len(text.encode("utf-8")) for text, _ in inputs) / (1024 * 1024)
+        })
+        rows.append(result)
+
+    def run_sections():
+        return [chunker.chunk_sections(sections, metadata) for sections, metadata in sectioned]
+
+    result = measure(run_sections, repeat)
+    result.update({
+        "stage": "chunk",
+        "variant": "sections",
+        "matches": "-",
+        "input_mb": sum(len(block["text"].encode("utf-8")) for sections, _ in sectioned
+                        for section in sections for block in section["blocks"]) / (1024 * 1024)
+    })
+    rows.append(result)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark page processing on the Physical AI Book pages")
+    parser.add_argument("--stage", choices=["extract", "clean", "chunk", "all"], default="all", help="Stage to benchmark")
+    parser.add_argument("--docs-dir", type=Path, default=DEFAULT_DOCS_DIR, help="Directory of Markdown sources")
+    parser.add_argument("--html-dir", type=Path, help="Directory of saved HTML pages (overrides --docs-dir)")
+    parser.add_argument("--parsers", nargs="+", help="Parser backends to compare (default: all installed)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per variant (default: 3)")
+    parser.add_argument("--scale", type=int, default=1, help="Repeat the page set this many times (default: 1)")
+    args = parser.parse_args()
+
+    pages = load_pages(args.docs_dir, args.html_dir) * args.scale
+    if not pages:
+        print("No pages found")
+        sys.exit(1)
+
+    total_mb = sum(len(page.encode("utf-8")) for _, page in pages) / (1024 * 1024)
+    print(f"Benchmarking {len(pages)} pages ({total_mb:.2f} MB of HTML), best of {args.repeat} runs")
+
+    parsers = args.parsers or [name for name, installed in
+                               (("html.parser", True), ("lxml", LXML_AVAILABLE), ("selectolax", SELECTOLAX_AVAILABLE))
+                               if installed]
+
+    rows = []
+    if args.stage in ("extract", "all"):
+        rows.extend(benchmark_extract(pages, parsers, args.repeat))
+    if args.stage in ("clean", "all"):
+        rows.extend(benchmark_clean(pages, args.repeat))
+    if args.stage in ("chunk", "all"):
+        rows.extend(benchmark_chunk(pages, args.repeat))
+
+    print(f"\n{'stage':<10}{'variant':<14}{'ms/page':>10}{'MB/s':>10}{'peak MB':>10}{'same output':>14}")
+    for row in rows:
+        ms_per_page = row["seconds"] * 1000 / (1 if row["variant"] == "long page" else len(pages))
+        mb_per_second = row.get("input_mb", total_mb) / row["seconds"]
+        print(f"{row['stage']:<10}{row['variant']:<14}{ms_per_page:>10.2f}{mb_per_second:>10.2f}"
+              f"{row['peak_mb']:>10.2f}{row['matches']:>14}")
+
+
+if __name__ == "__main__":
+    main()
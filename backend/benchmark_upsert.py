@@ -0,0 +1,82 @@
+"""
+Qdrant Upload Benchmark for Physical AI Book Content
+
+Measures QdrantManager.store_vectors throughput against the configured Qdrant server
+for a range of batch sizes and parallelism levels, using random vectors in a temporary
+collection that is deleted afterwards. Throughput should grow with parallelism until
+the server saturates.
+
+Usage:
+    python benchmark_upsert.py
+    python benchmark_upsert.py --points 20000 --batch-sizes 128 256 512 --parallelism 1 2 4 8 16
+    python benchmark_upsert.py --method upload_points
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+
+from dotenv import load_dotenv
+
+from src.utils.config import Config
+from src.storage.qdrant_manager import QdrantManager
+
+
+async def run_benchmark(args) -> List[dict]:
+    """
+    Upload the same points with every batch size and parallelism combination.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        List of result rows
+    """
+    config = Config()
+    config.qdrant_collection_name = f"{config.qdrant_collection_name}_upsert_benchmark"
+    config.qdrant_upsert_method = args.method
+    # Measure the uploads, not the client-side rate limit
+    config.qdrant_rpm_limit = 1_000_000
+
+    rng = random.Random(0)
+    vectors = [[rng.uniform(-1, 1) for _ in range(args.dim)] for _ in range(args.points)]
+    payloads = [{"url": f"https://example.com/page-{i // 20}/", "chunk_index": i % 20, "text": f"chunk {i}"}
+                for i in range(args.points)]
+
+    rows = []
+    manager = QdrantManager(config)
+    try:
+        await manager.ensure_collection_exists(vector_size=args.dim)
+        for batch_size in args.batch_sizes:
+            for parallelism in args.parallelism:
+                config.qdrant_upsert_batch_size = batch_size
+                config.qdrant_upsert_parallelism = parallelism
+
+                start = time.perf_counter()
+                await manager.store_vectors(vectors, payloads, wait=True)
+                seconds = time.perf_counter() - start
+                rows.append({"batch_size": batch_size, "parallelism": parallelism, "seconds": seconds})
+                print(f"batch {batch_size:>6}  parallel {parallelism:>3}  {args.points / seconds:>10.0f} points/s")
+    finally:
+        await manager.client.delete_collection(config.qdrant_collection_name)
+        await manager.close()
+    return rows
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Benchmark bulk vector uploads to Qdrant")
+    parser.add_argument("--points", type=int, default=5000, help="Points per upload (default: 5000)")
+    parser.add_argument("--dim", type=int, default=1024, help="Vector dimension (default: 1024)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[256], help="Batch sizes to compare")
+    parser.add_argument("--parallelism", type=int, nargs="+", default=[1, 2, 4, 8], help="Parallelism levels to compare")
+    parser.add_argument("--method", choices=["upsert", "upload_points"], default="upsert", help="Upload method")
+    args = parser.parse_args()
+
+    print(f"Uploading {args.points} points of dimension {args.dim} with {args.method}")
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,10 @@ import argparse
 import sys
 import os
 import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -34,6 +36,7 @@ setup_import_paths()
 # Import the modules after setting up paths
 from src.crawler.url_discovery import URLDiscoverer
 from src.crawler.html_fetcher import HTMLFetcher
+from src.crawler.docs_loader import DocsLoader
 from src.processor.text_extractor import TextExtractor
 from src.processor.cleaner import ContentCleaner
 from src.processor.chunker import ContentChunker
@@ -42,16 +45,39 @@ from src.embedder.batch_processor import BatchProcessor
 from src.storage.qdrant_manager import QdrantManager
 from src.storage.validator import Validator
 from src.chat.chat_manager import ChatManager
+from src.pipeline.streaming_pipeline import StreamingIngestionPipeline
 from src.utils.config import Config
 from src.utils.logger import app_logger
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the shared chat components on startup and release their connections on shutdown."""
+    try:
+        await get_chat_manager()
+    except Exception as e:
+        # Keep serving health/config endpoints; /chat reports the error per request
+        app_logger.error(f"Chat components not initialized: {str(e)}")
+
+    yield
+
+    if app.state.chat_manager is not None:
+        await app.state.chat_manager.close()
+        app.state.chat_manager = None
+
+
 # Create FastAPI app instance
 app = FastAPI(
     title="Physical AI Book Content Ingestion API",
     description="API for the Physical AI Book Content Ingestion System",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Shared chat state, set up at import so endpoints also work when lifespan does not run;
+# the ChatManager itself is created on first use
+app.state.chat_manager = None
+app.state.chat_manager_lock = asyncio.Lock()
+
 # Add CORS middleware to allow requests from the frontend
 app.add_middleware(
     CORSMiddleware,
@@ -109,6 +135,27 @@ async def config_check():
 from fastapi import Request
 import json
 
+
+async def get_chat_manager() -> ChatManager:
+    """
+    Get the application-wide ChatManager, creating it on first use.
+
+    Returns:
+        Shared ChatManager instance
+    """
+    async with app.state.chat_manager_lock:
+        if app.state.chat_manager is None:
+            app.state.chat_manager = ChatManager(Config())
+        return app.state.chat_manager
+
+
+@app.get("/chat/stats")
+async def chat_stats():
+    """Chat cache metrics endpoint."""
+    chat_manager = app.state.chat_manager
+    return chat_manager.cache_stats() if chat_manager else {}
+
+
 @app.post("/chat")
 async def chat(request: Request):
     """Chat endpoint that accepts user queries and returns responses based on book content."""
@@ -118,8 +165,7 @@ async def chat(request: Request):
         query = data.get('query', '')
         context = data.get('context', None)  # Additional context from selected text
 
-        config = Config()
-        chat_manager = ChatManager(config)
+        chat_manager = await get_chat_manager()
 
         # Pass context to the chat manager if available
         if context:
@@ -137,10 +183,75 @@ async def chat(request: Request):
         }
 
 
+@app.post("/chat/stream")
+async def chat_stream(request: Request):
+    """
+    Streaming chat endpoint using Server-Sent Events.
+
+    Emits a "sources" event as soon as retrieval finishes, "token" events as the answer
+    is generated, and a final "metadata" event (or "error" event on failure). A body that
+    is not a JSON object is rejected with 400 before the stream starts.
+    """
+    try:
+        data = await request.json()
+    except ValueError as e:
+        app_logger.warning(f"Invalid chat stream request body: {str(e)}")
+        data = None
+    if not isinstance(data, dict):
+        return JSONResponse(status_code=400, content={"message": "Request body must be a JSON object"})
+
+    query = data.get('query', '')
+    context = data.get('context', None)  # Additional context from selected text
+
+    async def event_stream():
+        try:
+            chat_manager = await get_chat_manager()
+            async for event in chat_manager.stream_answer(query, context):
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+        except Exception as e:
+            app_logger.error(f"Error in chat stream endpoint: {str(e)}")
+            error = {"message": "Sorry, I encountered an error while processing your query. Please try again."}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def run_local_ingestion(config: Config, docs_dir: str = None, force_rerun: bool = False) -> bool:
+    """
+    Ingest the book's Markdown sources from the docs/ tree, without crawling the site.
+
+    Args:
+        config: Configuration object
+        docs_dir: Directory of Markdown sources (DOCS_DIR by default)
+        force_rerun: Re-embed every chunk even if the manifest says it is unchanged
+
+    Returns:
+        True if every chunk was embedded and stored
+    """
+    pipeline = StreamingIngestionPipeline(config, force_rerun=force_rerun,
+                                          docs_loader=DocsLoader(config, docs_dir))
+    try:
+        stats = await pipeline.run()
+    finally:
+        await pipeline.close()
+
+    app_logger.info(f"Ingested {stats['pages_ingested']} of {stats['discovered_urls']} docs "
+                    f"({stats['pages_unchanged']} unchanged), stored {stats['vectors_stored']} vectors, "
+                    f"deleted {stats['vectors_deleted']}, {stats['chunks_failed']} chunks failed")
+    return stats["chunks_failed"] == 0
+
+
 def main():
     parser = argparse.ArgumentParser(description='Physical AI Book Content Ingestion System')
-    parser.add_argument('--mode', choices=['crawl', 'process', 'embed', 'store', 'full'],
-                        default='full', help='Execution mode for the ingestion pipeline')
+    parser.add_argument('--mode', choices=['crawl', 'process', 'embed', 'store', 'full', 'local'],
+                        default='full', help='Execution mode for the ingestion pipeline '
+                                             '("local" ingests the Markdown sources in DOCS_DIR)')
+    parser.add_argument('--docs-dir', help='Directory of Markdown sources for --mode local (default: DOCS_DIR)')
+    parser.add_argument('--force', action='store_true', help='Re-embed all chunks, ignoring the ingestion manifest')
     args = parser.parse_args()
 
     try:
@@ -148,6 +259,12 @@ def main():
         config = Config()
         app_logger.info(f"Starting Physical AI Book Content Ingestion System in {args.mode} mode")
 
+        if args.mode == 'local':
+            if not asyncio.run(run_local_ingestion(config, args.docs_dir, args.force)):
+                sys.exit(1)
+            app_logger.info("Physical AI Book Content Ingestion System completed successfully")
+            return
+
         if args.mode in ['full', 'crawl']:
             app_logger.info("Starting URL discovery...")
             url_discoverer = URLDiscoverer(config)
@@ -14,14 +14,7 @@ from pydantic import BaseModel
 import uvicorn
 
 # Import pipeline modules
-from src.crawler.url_discovery import URLDiscoverer
-from src.crawler.html_fetcher import HTMLFetcher
-from src.processor.text_extractor import TextExtractor
-from src.processor.cleaner import ContentCleaner
-from src.processor.chunker import ContentChunker
-from src.embedder.cohere_client import CohereEmbedder
-from src.embedder.batch_processor import BatchProcessor
-from src.storage.qdrant_manager import QdrantManager
+from src.pipeline.streaming_pipeline import StreamingIngestionPipeline
 from src.storage.validator import Validator
 from src.utils.config import Config
 from src.utils.logger import app_logger
@@ -115,8 +108,15 @@ async def get_pipeline_status():
         raise HTTPException(status_code=500, detail=f"Status error: {str(e)}")
 
 
-async def run_ingestion_pipeline(max_depth: int = 2):
-    """Background task to run the full ingestion pipeline"""
+async def run_ingestion_pipeline(max_depth: int = 2, force_rerun: bool = False):
+    """
+    Background task to run the full ingestion pipeline.
+
+    Discovery, fetching, processing, embedding and storage run as concurrent stages
+    of a streaming pipeline. Unless force_rerun is set, pages and chunks recorded in
+    the ingestion manifest with unchanged content are skipped, so only new or changed
+    chunks are embedded.
+    """
     global pipeline_state
 
     try:
@@ -132,86 +132,38 @@ async def run_ingestion_pipeline(max_depth: int = 2):
         # Initialize configuration
         config = Config()
 
-        # Initialize all components
-        url_discoverer = URLDiscoverer(config)
-        html_fetcher = HTMLFetcher(config)
-        text_extractor = TextExtractor(config)
-        content_cleaner = ContentCleaner(config)
-        content_chunker = ContentChunker(config)
-        cohere_embedder = CohereEmbedder(config)
-        batch_processor = BatchProcessor(config)
-        qdrant_manager = QdrantManager(config)
-        validator = Validator(config)
-
-        # Phase 1: URL Discovery
-        pipeline_state.progress = "Discovering URLs"
-        app_logger.info("Phase 1: Discovering URLs...")
-        discovered_urls = await url_discoverer.discover_urls(max_depth=max_depth)
-        app_logger.info(f"Discovered {len(discovered_urls)} URLs")
-
-        # Phase 2: Content Fetching and Processing
-        pipeline_state.progress = "Fetching and processing content"
-        app_logger.info("Phase 2: Fetching and processing content...")
-        all_chunks = []
-
-        html_contents = await html_fetcher.fetch_multiple_html(list(discovered_urls)[:10])  # Limit for testing
-
-        for url, html_content in html_contents.items():
-            if html_content:
-                # Extract text
-                extraction_result = text_extractor.extract_text(html_content, url)
-
-                # Clean content
-                cleaned_content = content_cleaner.clean_content(extraction_result["text"], extraction_result["metadata"])
-
-                # Chunk content
-                chunks = content_chunker.chunk_content(cleaned_content, extraction_result["metadata"])
-                all_chunks.extend(chunks)
+        def update_progress(message: str):
+            pipeline_state.progress = message
 
-        app_logger.info(f"Processed {len(all_chunks)} content chunks")
-
-        # Phase 3: Embedding Generation
-        pipeline_state.progress = "Generating embeddings"
-        app_logger.info("Phase 3: Generating embeddings...")
-        # Extract just the text from chunks for embedding
-        texts_to_embed = [chunk["text"] for chunk in all_chunks]
-
-        # Process embeddings in batches
-        embeddings = await batch_processor.process_batches(texts_to_embed, cohere_embedder)
-
-        if embeddings is None:
-            raise Exception("Failed to generate embeddings")
-
-        app_logger.info(f"Generated embeddings for {len(embeddings)} text chunks")
-
-        # Phase 4: Vector Storage
-        pipeline_state.progress = "Storing vectors"
-        app_logger.info("Phase 4: Storing vectors in Qdrant...")
-
-        # Prepare payloads with chunk metadata
-        payloads = []
-        for chunk in all_chunks:
-            payload = chunk["metadata"].copy()
-            payload["text"] = chunk["text"]  # Include the text in the payload
-            payload["chunk_id"] = chunk["chunk_id"]
-            payloads.append(payload)
+        pipeline = StreamingIngestionPipeline(
+            config,
+            force_rerun=force_rerun,
+            max_pages=10,  # Limit for testing
+            on_progress=update_progress
+        )
+        validator = Validator(config)
 
-        # Ensure the collection exists
-        await qdrant_manager.ensure_collection_exists(vector_size=len(embeddings[0]) if embeddings else 1024)
+        try:
+            pipeline_state.progress = "Discovering and ingesting pages"
+            stats = await pipeline.run(max_depth=max_depth)
 
-        # Store vectors
-        await qdrant_manager.store_vectors(embeddings, payloads)
+            # Validate storage
+            stored_count = await pipeline.qdrant_manager.get_vector_count()
+        finally:
+            await pipeline.close()
 
-        # Validate storage
-        stored_count = await qdrant_manager.get_vector_count()
-        validation_results = validator.validate_stored_vectors(len(embeddings), stored_count)
+        validation_results = validator.validate_stored_vectors(pipeline.manifest.total_chunks(), stored_count)
 
-        app_logger.info(f"Stored {stored_count} vectors in Qdrant.")
+        app_logger.info(f"Stored {stored_count} vectors in Qdrant "
+                        f"(embedding cache: {pipeline.cohere_embedder.cache_stats()})")
         app_logger.info(f"Validation passed: {validation_results['validation_passed']}")
 
         # Update state on success
         pipeline_state.status = "completed"
         pipeline_state.progress = f"Completed successfully. Stored {stored_count} vectors."
+        if stats["chunks_failed"]:
+            pipeline_state.progress += (f" {stats['chunks_failed']} chunks failed to embed "
+                                        f"and will be retried on the next run.")
         pipeline_state.end_time = datetime.now()
 
         app_logger.info("Ingestion pipeline completed successfully")
@@ -238,7 +190,7 @@ async def trigger_ingestion(background_tasks: BackgroundTasks, request: Ingestio
 
     try:
         # Run the ingestion pipeline in the background
-        background_tasks.add_task(run_ingestion_pipeline, request.max_depth)
+        background_tasks.add_task(run_ingestion_pipeline, request.max_depth, request.force_rerun)
 
         return {
             "message": "Ingestion pipeline started successfully",
@@ -10,6 +10,10 @@ setup(
         "uvicorn[standard]>=0.24.0",
         "python-dotenv>=1.0.0",
         "beautifulsoup4>=4.12.2",
+        "lxml>=4.9.0",
+        "selectolax>=0.3.21",
+        "tokenizers>=0.15.0",
+        "PyYAML>=6.0",
         "playwright>=1.40.0",
         "cohere>=4.9.0",
         "qdrant-client>=1.7.0",
@@ -18,7 +22,7 @@ setup(
         "pydantic-core>=2.14.0",
         "asyncio",
         "python-multipart>=0.0.6",
-        "httpx>=0.25.0",
+        "httpx[http2,brotli]>=0.25.0",
         "numpy>=1.24.0",
         "grpcio>=1.59.0",
         "greenlet>=3.0.0",
@@ -0,0 +1,160 @@
+"""
+Semantic Answer Cache Module for RAG-based Chatbot
+
+This module caches generated answers and serves them for new queries whose embedding
+is close enough to a cached query and whose retrieved chunks are unchanged.
+"""
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from ..utils.logger import app_logger
+from ..utils.config import Config
+
+
+class SemanticAnswerCache:
+    """Class to cache chat answers keyed by query-embedding similarity and retrieved chunks."""
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.max_size = config.answer_cache_size
+        self.similarity_threshold = config.answer_cache_similarity
+        self.ttl_seconds = config.answer_cache_ttl_seconds
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()
+        self._next_key = 0
+        self._ingestion_version = self._read_ingestion_version()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def context_key(provided_context: Optional[str]) -> str:
+        """
+        Build a key for user-provided context, which changes the answer independently of retrieval.
+
+        Args:
+            provided_context: Additional context provided by the frontend
+
+        Returns:
+            Hash of the context, or an empty string if there is none
+        """
+        if not provided_context:
+            return ""
+        return hashlib.sha256(provided_context.encode('utf-8')).hexdigest()
+
+    def _read_ingestion_version(self) -> Optional[float]:
+        """
+        Read the modification time of the ingestion manifest, which changes on every ingestion run.
+
+        Returns:
+            Manifest modification time, or None if no manifest exists
+        """
+        try:
+            return os.path.getmtime(self.config.manifest_path)
+        except OSError:
+            return None
+
+    def _check_ingestion_version(self):
+        """Drop all cached answers if content has been re-ingested since they were stored."""
+        version = self._read_ingestion_version()
+        if version != self._ingestion_version:
+            if self._entries:
+                app_logger.info("Content was re-ingested, invalidating answer cache")
+            self.invalidate()
+            self._ingestion_version = version
+
+    def invalidate(self):
+        """Remove all cached answers."""
+        self._entries.clear()
+
+    def lookup(self, query_embedding: List[float], chunk_ids: Sequence[str], context_key: str = "") -> Optional[Dict]:
+        """
+        Find a cached answer for a semantically similar query over the same retrieved chunks.
+
+        Args:
+            query_embedding: Embedding of the new query
+            chunk_ids: Ids of the chunks retrieved for the new query
+            context_key: Key of any user-provided context (see context_key)
+
+        Returns:
+            Cached response dictionary, or None on a miss
+        """
+        self._check_ingestion_version()
+
+        now = time.monotonic()
+        chunk_set = frozenset(chunk_ids)
+        query_vector = self._normalize(query_embedding)
+
+        best_key, best_score = None, self.similarity_threshold
+        for key, entry in list(self._entries.items()):
+            if entry["expires_at"] <= now:
+                del self._entries[key]
+                continue
+            if entry["chunk_ids"] != chunk_set or entry["context_key"] != context_key:
+                continue
+
+            score = float(np.dot(entry["embedding"], query_vector))
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        if best_key is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(best_key)
+        self.hits += 1
+        app_logger.debug(f"Answer cache hit (similarity {best_score:.3f})")
+        return self._entries[best_key]["response"]
+
+    def store(self, query_embedding: List[float], chunk_ids: Sequence[str], response: Dict, context_key: str = ""):
+        """
+        Cache a generated answer, evicting the least recently used entry if full.
+
+        Args:
+            query_embedding: Embedding of the query that was answered
+            chunk_ids: Ids of the chunks retrieved for the query
+            response: Response dictionary returned to the client
+            context_key: Key of any user-provided context (see context_key)
+        """
+        self._entries[self._next_key] = {
+            "embedding": self._normalize(query_embedding),
+            "chunk_ids": frozenset(chunk_ids),
+            "context_key": context_key,
+            "response": response,
+            "expires_at": time.monotonic() + self.ttl_seconds
+        }
+        self._next_key += 1
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        """
+        Get answer cache size and hit/miss counters.
+
+        Returns:
+            Dictionary with size, hits, misses and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        """
+        Convert an embedding to a unit-length float32 vector, so dot products are cosine similarities.
+
+        Args:
+            embedding: Embedding vector
+
+        Returns:
+            Normalized numpy vector
+        """
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
@@ -5,24 +5,93 @@ This module handles chat functionality using retrieval-augmented generation with
 """
 import asyncio
 import time
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+import cohere
+import httpx
 from ..utils.logger import app_logger
 from ..utils.config import Config
 from ..embedder.cohere_client import CohereEmbedder
 from ..storage.qdrant_manager import QdrantManager
 from .cohere_chat_client import CohereChatClient
+from .query_cache import QueryEmbeddingCache
+from .answer_cache import SemanticAnswerCache
 
 
 class ChatManager:
-    """Class to handle chat functionality using RAG (Retrieval-Augmented Generation)."""
+    """
+    Class to handle chat functionality using RAG (Retrieval-Augmented Generation).
 
-    def __init__(self, config: Config):
+    A ChatManager is meant to be long-lived: its API clients share one pooled HTTP
+    connection pool, and its caches and rate limiting state persist across requests.
+    Call close() when it is no longer needed.
+    """
+
+    def __init__(self, config: Config, query_cache: Optional[QueryEmbeddingCache] = None,
+                 answer_cache: Optional[SemanticAnswerCache] = None):
         self.config = config
-        self.cohere_embedder = CohereEmbedder(config)
-        self.cohere_chat_client = CohereChatClient(config)
+        self.query_cache = query_cache or QueryEmbeddingCache(config)
+        self.answer_cache = answer_cache or SemanticAnswerCache(config)
+
+        # One pooled HTTP client is shared by the embedding and chat API wrappers
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config.max_concurrent_requests * 4,
+                max_keepalive_connections=config.max_concurrent_requests * 4
+            )
+        )
+        cohere_client = cohere.AsyncClient(config.cohere_api_key, httpx_client=self.http_client)
+        self.cohere_embedder = CohereEmbedder(config, client=cohere_client,
+                                              disk_cache=config.chat_embedding_cache_enabled)
+        self.cohere_chat_client = CohereChatClient(config, client=cohere_client)
         self.qdrant_manager = QdrantManager(config)
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # Minimum interval between requests
+
+    async def close(self):
+        """Close the shared HTTP connections and the Qdrant client."""
+        await self.http_client.aclose()
+        await self.qdrant_manager.close()
+
+    def cache_stats(self) -> Dict:
+        """
+        Get metrics for the chat caches.
+
+        Returns:
+            Dictionary with query embedding, embedding and answer cache stats
+        """
+        return {
+            "query_embedding_cache": self.query_cache.stats(),
+            "embedding_cache": self.cohere_embedder.cache_stats(),
+            "answer_cache": self.answer_cache.stats()
+        }
+
+    def _prepare_context(self, search_results) -> Tuple[List[str], List[Dict]]:
+        """
+        Collect context texts and source information from Qdrant search results.
+
+        Args:
+            search_results: Scored points returned by the Qdrant search
+
+        Returns:
+            Tuple of (context texts, source dictionaries)
+        """
+        context_parts = []
+        sources = []
+        for result in search_results:
+            if result.payload:
+                # Try to get content from 'text' field first (as stored in test), then 'content'
+                content = result.payload.get('text') or result.payload.get('content')
+                if content:
+                    context_parts.append(content)
+
+                # Collect source information
+                source_info = {
+                    "title": result.payload.get('title', 'Unknown Source'),
+                    "url": result.payload.get('url', ''),
+                    "page": result.payload.get('page', ''),
+                    "score": result.score if hasattr(result, 'score') else None
+                }
+                sources.append(source_info)
+
+        return context_parts, sources
 
     async def get_answer(self, query: str, max_results: int = 5):
         """
@@ -42,17 +111,11 @@ class ChatManager:
                 "metadata": {}
             }
 
-        # Rate limiting
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        if time_since_last_request < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - time_since_last_request)
-
         try:
             app_logger.info(f"Processing chat query: {query[:50]}...")
 
             # Generate embedding for the query
-            query_embedding = await self.cohere_embedder.generate_single_embedding(query)
+            query_embedding = await self.query_cache.get_embedding(query, self.cohere_embedder)
             if not query_embedding:
                 app_logger.error("Failed to generate embedding for query")
                 return {
@@ -76,23 +139,7 @@ class ChatManager:
                 }
 
             # Prepare context from search results
-            context_parts = []
-            sources = []
-            for result in search_results:
-                if result.payload:
-                    # Try to get content from 'text' field first (as stored in test), then 'content'
-                    content = result.payload.get('text') or result.payload.get('content')
-                    if content:
-                        context_parts.append(content)
-
-                    # Collect source information
-                    source_info = {
-                        "title": result.payload.get('title', 'Unknown Source'),
-                        "url": result.payload.get('url', ''),
-                        "page": result.payload.get('page', ''),
-                        "score": result.score if hasattr(result, 'score') else None
-                    }
-                    sources.append(source_info)
+            context_parts, sources = self._prepare_context(search_results)
 
             if not context_parts:
                 app_logger.warning("Search results returned no content")
@@ -102,6 +149,13 @@ class ChatManager:
                     "metadata": {}
                 }
 
+            # Serve a cached answer for a similar question over the same chunks
+            chunk_ids = [str(result.id) for result in search_results]
+            cached_response = self.answer_cache.lookup(query_embedding, chunk_ids)
+            if cached_response:
+                app_logger.info("Serving cached response for query")
+                return {**cached_response, "metadata": {**cached_response["metadata"], "cached": True}}
+
             # Use Cohere's chat functionality to generate a proper answer based on context
             answer = await self.cohere_chat_client.generate_answer_with_context(
                 query=query,
@@ -110,11 +164,13 @@ class ChatManager:
 
             if answer:
                 app_logger.info("Successfully generated response for query")
-                return {
+                response = {
                     "response": answer,
                     "sources": sources,
                     "metadata": {"retrieved_chunks": len(context_parts)}
                 }
+                self.answer_cache.store(query_embedding, chunk_ids, response)
+                return response
             else:
                 # Fallback to simple response if Cohere fails
                 app_logger.warning("Cohere chat generation failed, using fallback")
@@ -155,17 +211,29 @@ class ChatManager:
                 "metadata": {}
             }
 
-        # Rate limiting
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        if time_since_last_request < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - time_since_last_request)
+        timings = {}
+        start_time = time.perf_counter()
+
+        # Start everything that does not need the query embedding together: the embedding
+        # call, the optional keyword retrieval, and hashing the provided context for the
+        # answer cache key (in a thread; hashlib releases the GIL on large inputs)
+        embed_task = asyncio.create_task(self._timed(
+            self.query_cache.get_embedding(query, self.cohere_embedder), timings, "embed"
+        ))
+        context_task = asyncio.create_task(self._timed(
+            asyncio.to_thread(self.answer_cache.context_key, provided_context), timings, "context_key"
+        ))
+        keyword_task = None
+        if self.config.keyword_search_enabled:
+            keyword_task = asyncio.create_task(self._timed(
+                self.qdrant_manager.keyword_search(query, limit=self.config.keyword_search_limit),
+                timings, "keyword_search"
+            ))
 
         try:
             app_logger.info(f"Processing chat query with context: {query[:50]}...")
 
-            # Search for relevant content in Qdrant
-            query_embedding = await self.cohere_embedder.generate_single_embedding(query)
+            query_embedding = await embed_task
             if not query_embedding:
                 app_logger.error("Failed to generate embedding for query")
                 return {
@@ -174,59 +242,63 @@ class ChatManager:
                     "metadata": {}
                 }
 
-            search_results = await self.qdrant_manager.search_vectors(
-                query_vector=query_embedding,
-                limit=max_results
+            # Search for relevant content in Qdrant
+            search_results = await self._timed(
+                self.qdrant_manager.search_vectors(query_vector=query_embedding, limit=max_results),
+                timings, "search"
             )
+            if keyword_task:
+                search_results = self._merge_keyword_results(search_results, await self._keyword_results(keyword_task))
 
             # Prepare context from search results
-            context_parts = []
-            sources = []
-            for result in search_results:
-                if result.payload:
-                    # Try to get content from 'text' field first (as stored in test), then 'content'
-                    content = result.payload.get('text') or result.payload.get('content')
-                    if content:
-                        context_parts.append(content)
-
-                    # Collect source information
-                    source_info = {
-                        "title": result.payload.get('title', 'Unknown Source'),
-                        "url": result.payload.get('url', ''),
-                        "page": result.payload.get('page', ''),
-                        "score": result.score if hasattr(result, 'score') else None
-                    }
-                    sources.append(source_info)
+            context_parts, sources = self._prepare_context(search_results)
 
             # Combine provided context with retrieved context
-            combined_contexts = [provided_context] + context_parts[:max_results]
+            combined_contexts = [provided_context] + context_parts[:max_results + self.config.keyword_search_limit]
+
+            # Serve a cached answer for a similar question over the same chunks and context
+            chunk_ids = [str(result.id) for result in search_results]
+            context_key = await context_task
+            cached_response = self.answer_cache.lookup(query_embedding, chunk_ids, context_key)
+            if cached_response:
+                app_logger.info("Serving cached response for query with provided context")
+                timings["total"] = self._elapsed_ms(start_time)
+                return {
+                    **cached_response,
+                    "metadata": {**cached_response["metadata"], "cached": True, "timings_ms": timings}
+                }
 
             # Use Cohere's chat functionality to generate a proper answer based on all contexts
-            answer = await self.cohere_chat_client.generate_answer_with_context(
-                query=query,
-                contexts=combined_contexts
+            answer = await self._timed(
+                self.cohere_chat_client.generate_answer_with_context(query=query, contexts=combined_contexts),
+                timings, "generate"
             )
+            metadata = {"retrieved_chunks": len(context_parts), "provided_context_used": True}
 
             if answer:
                 app_logger.info("Successfully generated response for query with provided context")
-                return {
+                response = {
                     "response": answer,
                     "sources": sources,
-                    "metadata": {"retrieved_chunks": len(context_parts), "provided_context_used": True}
+                    "metadata": metadata
                 }
+                self.answer_cache.store(query_embedding, chunk_ids, response, context_key)
             else:
                 # Fallback to simple response if Cohere fails
                 app_logger.warning("Cohere chat generation failed, using fallback")
                 all_context = "\n\n".join(combined_contexts)
-                response = f"Based on the provided context and book content:\n\n{all_context[:500]}..."
+                fallback = f"Based on the provided context and book content:\n\n{all_context[:500]}..."
                 if len(all_context) > 500:
-                    response += "\n\n(Additional context was retrieved but truncated for brevity.)"
-                return {
-                    "response": response,
+                    fallback += "\n\n(Additional context was retrieved but truncated for brevity.)"
+                response = {
+                    "response": fallback,
                     "sources": sources,
-                    "metadata": {"retrieved_chunks": len(context_parts), "provided_context_used": True}
+                    "metadata": metadata
                 }
 
+            timings["total"] = self._elapsed_ms(start_time)
+            return {**response, "metadata": {**metadata, "timings_ms": timings}}
+
         except Exception as e:
             app_logger.error(f"Error processing chat query with context: {str(e)}")
             return {
@@ -234,4 +306,170 @@ class ChatManager:
                 "sources": [],
                 "metadata": {}
             }
+        finally:
+            # Cancel whatever is still running after an early return or error
+            for task in (embed_task, context_task, keyword_task):
+                if task is None:
+                    continue
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # Mark a failure as retrieved so it is not logged as unhandled
+
+    @staticmethod
+    def _elapsed_ms(start_time: float) -> float:
+        """
+        Get the time elapsed since a perf_counter() reading.
+
+        Args:
+            start_time: Earlier time.perf_counter() value
+
+        Returns:
+            Elapsed time in milliseconds, rounded to 0.1 ms
+        """
+        return round((time.perf_counter() - start_time) * 1000, 1)
+
+    async def _timed(self, awaitable, timings: Dict, stage: str):
+        """
+        Await a stage of the request and record how long it took.
+
+        Args:
+            awaitable: Coroutine running the stage
+            timings: Dictionary to record the stage duration in (milliseconds)
+            stage: Name of the stage
+
+        Returns:
+            Result of the awaitable
+        """
+        start_time = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[stage] = self._elapsed_ms(start_time)
 
+    async def _keyword_results(self, keyword_task: asyncio.Task) -> List:
+        """
+        Wait for keyword retrieval, treating failures as no results.
+
+        Args:
+            keyword_task: Task running QdrantManager.keyword_search
+
+        Returns:
+            Keyword search results, or an empty list if the search failed
+        """
+        try:
+            return await keyword_task
+        except Exception as e:
+            app_logger.warning(f"Keyword retrieval failed, using vector results only: {str(e)}")
+            return []
+
+    @staticmethod
+    def _merge_keyword_results(search_results: List, keyword_results: List) -> List:
+        """
+        Append keyword matches that vector search did not already return.
+
+        Args:
+            search_results: Vector search results
+            keyword_results: Keyword search results
+
+        Returns:
+            Vector results followed by the new keyword results
+        """
+        seen_ids = {str(result.id) for result in search_results}
+        merged = list(search_results)
+        for result in keyword_results:
+            if str(result.id) not in seen_ids:
+                seen_ids.add(str(result.id))
+                merged.append(result)
+        return merged
+
+    async def stream_answer(self, query: str, provided_context: Optional[str] = None,
+                            max_results: int = 5) -> AsyncIterator[Dict]:
+        """
+        Generate an answer using RAG, yielding events as soon as each part is available.
+
+        Events are dictionaries with an "event" name and "data" payload: one "sources"
+        event once retrieval finishes, "token" events carrying answer text as it is
+        generated, and a final "metadata" event (or an "error" event on failure).
+
+        Args:
+            query: User's question
+            provided_context: Optional additional context provided by the frontend
+            max_results: Maximum number of results to retrieve from Qdrant
+
+        Yields:
+            Event dictionaries
+        """
+        if not query.strip():
+            yield {"event": "token", "data": {"text": "Please ask a question about the Physical AI book content."}}
+            yield {"event": "metadata", "data": {}}
+            return
+
+        try:
+            app_logger.info(f"Streaming chat query: {query[:50]}...")
+
+            # Generate embedding for the query
+            query_embedding = await self.query_cache.get_embedding(query, self.cohere_embedder)
+            if not query_embedding:
+                app_logger.error("Failed to generate embedding for query")
+                yield {"event": "error", "data": {"message": "Sorry, I couldn't process your query. Please try again."}}
+                return
+
+            # Search for relevant content in Qdrant
+            search_results = await self.qdrant_manager.search_vectors(
+                query_vector=query_embedding,
+                limit=max_results
+            )
+            context_parts, sources = self._prepare_context(search_results)
+
+            # Sources are sent before generation starts
+            yield {"event": "sources", "data": sources}
+
+            metadata = {"retrieved_chunks": len(context_parts)}
+            if provided_context:
+                metadata["provided_context_used"] = True
+
+            contexts = ([provided_context] if provided_context else []) + context_parts[:max_results]
+            if not contexts:
+                app_logger.warning("No relevant content found for query")
+                yield {"event": "token", "data": {"text": "I couldn't find relevant information in the book content to answer your question."}}
+                yield {"event": "metadata", "data": metadata}
+                return
+
+            # Serve a cached answer for a similar question over the same chunks and context
+            chunk_ids = [str(result.id) for result in search_results]
+            context_key = self.answer_cache.context_key(provided_context)
+            cached_response = self.answer_cache.lookup(query_embedding, chunk_ids, context_key)
+            if cached_response:
+                app_logger.info("Serving cached response for streamed query")
+                yield {"event": "token", "data": {"text": cached_response["response"]}}
+                yield {"event": "metadata", "data": {**cached_response["metadata"], "cached": True}}
+                return
+
+            answer_parts = []
+            async for text in self.cohere_chat_client.stream_answer_with_context(query=query, contexts=contexts):
+                answer_parts.append(text)
+                yield {"event": "token", "data": {"text": text}}
+
+            if answer_parts:
+                app_logger.info("Successfully streamed response for query")
+                self.answer_cache.store(
+                    query_embedding,
+                    chunk_ids,
+                    {"response": "".join(answer_parts).strip(), "sources": sources, "metadata": metadata},
+                    context_key
+                )
+            else:
+                # Fallback to simple response if Cohere fails
+                app_logger.warning("Cohere chat streaming failed, using fallback")
+                all_context = "\n\n".join(contexts)
+                response = f"Based on the book content:\n\n{all_context[:500]}..."
+                if len(all_context) > 500:
+                    response += "\n\n(Additional context was retrieved but truncated for brevity.)"
+                yield {"event": "token", "data": {"text": response}}
+
+            yield {"event": "metadata", "data": metadata}
+
+        except Exception as e:
+            app_logger.error(f"Error streaming chat query: {str(e)}")
+            yield {"event": "error", "data": {"message": "Sorry, I encountered an error while processing your query. Please try again."}}
@@ -3,22 +3,46 @@ Cohere Chat Client Module for Answer Generation
 
 This module handles interaction with the Cohere API for generating answers using chat functionality.
 """
-import asyncio
-import time
-from typing import Optional
+from typing import AsyncIterator, Optional
 import cohere
 from ..utils.logger import app_logger
 from ..utils.config import Config
+from ..utils.rate_limiter import get_limiter
 
 
 class CohereChatClient:
     """Class to handle interaction with Cohere API for generating answers using chat functionality."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, client: Optional[cohere.AsyncClient] = None):
         self.config = config
-        self.client = cohere.AsyncClient(config.cohere_api_key)
-        self.last_request_time = 0
-        self.min_request_interval = 60.0 / config.cohere_rpm_limit  # Respect rate limits
+        self.client = client or cohere.AsyncClient(config.cohere_api_key)
+        # Shared with every other Cohere caller using the same API key
+        self.rate_limiter = get_limiter("cohere", config.cohere_rpm_limit, config.cohere_burst)
+
+    @staticmethod
+    def _build_prompt(query: str, context: str) -> str:
+        """
+        Build the answer generation prompt from the query and retrieved context.
+
+        Args:
+            query: User's question
+            context: Retrieved context from Qdrant
+
+        Returns:
+            Prompt string for the chat model
+        """
+        return f"""
+            Based on the following context, please answer the user's question.
+            If the context doesn't contain enough information to answer the question,
+            please say so and explain what information is missing.
+
+            Context:
+            {context}
+
+            Question: {query}
+
+            Answer:
+            """
 
     async def generate_answer(self, query: str, context: str, max_tokens: int = 300) -> Optional[str]:
         """
@@ -36,27 +60,13 @@ class CohereChatClient:
             return None
 
         # Rate limiting
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        if time_since_last_request < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - time_since_last_request)
+        await self.rate_limiter.acquire()
 
         try:
             app_logger.debug(f"Generating answer for query: {query[:50]}...")
 
             # Prepare the prompt with context and query
-            prompt = f"""
-            Based on the following context, please answer the user's question.
-            If the context doesn't contain enough information to answer the question,
-            please say so and explain what information is missing.
-
-            Context:
-            {context}
-
-            Question: {query}
-
-            Answer:
-            """
+            prompt = self._build_prompt(query, context)
 
             # Call Cohere API for chat generation
             # Use current supported models (as of late 2025)
@@ -72,6 +82,7 @@ class CohereChatClient:
                 app_logger.warning(f"Chat API failed with error: {str(e)}, trying alternative approach")
                 try:
                     # Try with different model name format
+                    await self.rate_limiter.acquire()
                     response = await self.client.chat(
                         message=prompt,
                         model="command-nightly",  # Using nightly model as fallback
@@ -86,7 +97,6 @@ class CohereChatClient:
             answer = answer.strip()
             app_logger.debug(f"Successfully generated answer with {len(answer)} characters")
 
-            self.last_request_time = time.time()
             return answer
 
         except Exception as e:
@@ -111,4 +121,49 @@ class CohereChatClient:
         # Combine all contexts
         combined_context = "\n\n".join(contexts)
 
-        return await self.generate_answer(query, combined_context, max_tokens)
\ No newline at end of file
+        return await self.generate_answer(query, combined_context, max_tokens)
+
+    async def stream_answer_with_context(self, query: str, contexts: list, max_tokens: int = 300) -> AsyncIterator[str]:
+        """
+        Stream an answer using multiple context chunks, yielding text as it is generated.
+
+        If the primary model fails before producing any text, the fallback model is tried.
+
+        Args:
+            query: User's question
+            contexts: List of context strings from Qdrant
+            max_tokens: Maximum number of tokens for the response
+
+        Yields:
+            Fragments of the generated answer
+        """
+        if not query.strip() or not contexts:
+            return
+
+        prompt = self._build_prompt(query, "\n\n".join(contexts))
+        app_logger.debug(f"Streaming answer for query: {query[:50]}...")
+
+        for model in ("command", "command-nightly"):
+            # Rate limiting, once per stream request including the fallback
+            await self.rate_limiter.acquire()
+
+            produced_text = False
+            try:
+                async for event in self.client.chat_stream(
+                    message=prompt,
+                    model=model,
+                    temperature=0.3,  # Lower temperature for more factual responses
+                    max_tokens=max_tokens
+                ):
+                    if event.event_type == "text-generation" and event.text:
+                        produced_text = True
+                        yield event.text
+
+                return
+            except Exception as e:
+                if produced_text:
+                    app_logger.error(f"Chat stream interrupted: {str(e)}")
+                    raise
+                app_logger.warning(f"Chat stream with model {model} failed: {str(e)}")
+
+        app_logger.error("Both chat models failed to stream an answer")
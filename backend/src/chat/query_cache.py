@@ -0,0 +1,69 @@
+"""
+Query Embedding Cache Module for RAG-based Chatbot
+
+This module caches query embeddings in process, so repeated questions skip the
+embedding API round-trip on the chat path.
+"""
+import re
+from typing import Dict, List, Optional
+from ..utils.logger import app_logger
+from ..utils.config import Config
+from ..utils.lru_cache import LRUCache
+
+
+class QueryEmbeddingCache:
+    """Class to cache query embeddings by normalized query text and model."""
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.cache = LRUCache(config.query_cache_size, config.query_cache_ttl_seconds)
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """
+        Normalize a query for use as a cache key.
+
+        Args:
+            query: User's question
+
+        Returns:
+            Lowercased query with collapsed whitespace
+        """
+        return re.sub(r'\s+', ' ', query).strip().lower()
+
+    async def get_embedding(self, query: str, embedder, model: str = "embed-multilingual-v3.0") -> Optional[List[float]]:
+        """
+        Get the embedding for a query, calling the embedder only on a cache miss.
+
+        Misses fall through to the embedder, whose own on-disk embedding cache acts as
+        a shared second tier when CHAT_EMBEDDING_CACHE_ENABLED is set.
+
+        Args:
+            query: User's question
+            embedder: Embedder instance (e.g., CohereEmbedder)
+            model: Embedding model name
+
+        Returns:
+            Query embedding vector, or None if embedding failed
+        """
+        key = (model, self.normalize_query(query))
+
+        embedding = self.cache.get(key)
+        if embedding is not None:
+            app_logger.debug("Query embedding served from cache")
+            return embedding
+
+        embedding = await embedder.generate_single_embedding(query, model)
+        if embedding:
+            self.cache.set(key, embedding)
+
+        return embedding
+
+    def stats(self) -> Dict:
+        """
+        Get query embedding cache metrics.
+
+        Returns:
+            Dictionary with size, hits, misses and hit_rate
+        """
+        return self.cache.stats()
@@ -0,0 +1,145 @@
+"""
+Browser Pool Module for Physical AI Book Website
+
+This module manages a long-lived headless Chromium instance with a fixed number of
+reusable pages, so crawling does not pay a browser cold start for every URL.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+from playwright.async_api import async_playwright
+from ..utils.logger import app_logger
+from ..utils.config import Config
+
+
+class _PooledPage:
+    """A browser context and page pair tracked by the pool."""
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.navigations = 0
+
+
+class BrowserPool:
+    """Class to lend reusable Playwright pages from a single shared browser."""
+
+    def __init__(self, config: Config, size: Optional[int] = None, max_navigations: Optional[int] = None):
+        self.config = config
+        self.size = size or config.max_concurrent_requests
+        self.max_navigations = max_navigations or config.browser_page_max_navigations
+        self._playwright = None
+        self._browser = None
+        self._available: Optional[asyncio.Queue] = None
+        self._start_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the underlying browser has been launched."""
+        return self._browser is not None
+
+    async def start(self):
+        """Launch the shared browser if it is not already running."""
+        async with self._start_lock:
+            if self._browser is not None:
+                return
+
+            self._playwright = await async_playwright().start()
+            try:
+                self._browser = await self._playwright.chromium.launch(headless=True)
+            except Exception:
+                await self._playwright.stop()
+                self._playwright = None
+                raise
+
+            # Pages are created lazily on first borrow; empty slots are represented by None
+            self._available = asyncio.Queue()
+            for _ in range(self.size):
+                self._available.put_nowait(None)
+
+            app_logger.info(f"Browser pool started with {self.size} pages "
+                            f"(recycling after {self.max_navigations} navigations)")
+
+    async def close(self):
+        """Close all pages, the browser and the Playwright driver."""
+        async with self._start_lock:
+            if self._browser is None:
+                return
+
+            try:
+                await self._browser.close()
+            except Exception as e:
+                app_logger.warning(f"Error closing pooled browser: {str(e)}")
+            finally:
+                await self._playwright.stop()
+                self._browser = None
+                self._playwright = None
+                self._available = None
+
+            app_logger.info("Browser pool closed")
+
+    @asynccontextmanager
+    async def page(self):
+        """
+        Borrow a page from the pool for the duration of the context.
+
+        The page is returned to the pool afterwards and is recycled once it has served
+        the configured number of navigations, or if the borrower raised an exception.
+
+        Yields:
+            Playwright page object
+        """
+        if self._browser is None:
+            await self.start()
+
+        available = self._available
+        slot = await available.get()
+        healthy = False
+
+        try:
+            if slot is None:
+                slot = await self._new_slot()
+
+            yield slot.page
+            slot.navigations += 1
+            healthy = True
+        finally:
+            if slot is not None and (not healthy or slot.navigations >= self.max_navigations):
+                await self._close_slot(slot)
+                slot = None
+            available.put_nowait(slot)
+
+    async def _new_slot(self) -> _PooledPage:
+        """
+        Create a fresh browser context and page.
+
+        Returns:
+            New pooled page
+        """
+        context = await self._browser.new_context()
+        page = await context.new_page()
+
+        # Set a reasonable timeout
+        page.set_default_timeout(30000)
+
+        return _PooledPage(context, page)
+
+    async def _close_slot(self, slot: _PooledPage):
+        """
+        Close a pooled page and its context to release browser memory.
+
+        Args:
+            slot: Pooled page to close
+        """
+        try:
+            await slot.context.close()
+            app_logger.debug(f"Recycled pooled page after {slot.navigations} navigations")
+        except Exception as e:
+            app_logger.debug(f"Error closing pooled page: {str(e)}")
@@ -0,0 +1,343 @@
+"""
+Docs Loader Module for Physical AI Book Content
+
+This module reads the book's Markdown sources from the docs/ tree and turns each
+file into the same sections, text and metadata the text extractor produces for the
+published page, at the URL Docusaurus publishes it under. Ingestion can then run
+offline, without crawling the site or starting a browser.
+"""
+import html
+import posixpath
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from ..utils.logger import app_logger
+from ..utils.config import Config
+from ..processor.text_extractor import SectionBuilder
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+DOC_EXTENSIONS = ('.md', '.mdx')
+
+# Docusaurus number prefixes on file and directory names ("01-intro", "2_setup", "3.basics")
+_NUMBER_PREFIX_RE = re.compile(r'^\d+\s*[-_.]+\s*(?=[^\d])')
+
+_FRONT_MATTER_RE = re.compile(r'\A---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|\Z)', re.DOTALL)
+_FENCE_RE = re.compile(r'^(\s*)(`{3,}|~{3,})')
+_HEADING_RE = re.compile(r'^ {0,3}(#{1,6})\s+(.*?)(?:\s+#+)?\s*$')
+_HEADING_ID_RE = re.compile(r'\s*\{#[^}]*\}\s*$')
+_LIST_ITEM_RE = re.compile(r'^\s*(?:[-*+]|\d+[.)])\s+')
+_TABLE_DELIMITER_RE = re.compile(r'^\s*\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*$')
+_ADMONITION_RE = re.compile(r'^\s*:::\s*(\w+)?(.*)$')
+_THEMATIC_BREAK_RE = re.compile(r'^\s*(?:(?:-\s*){3,}|(?:\*\s*){3,}|(?:_\s*){3,})$')
+_MDX_STATEMENT_RE = re.compile(r'^(?:import|export)\s')
+
+# Inline Markdown, replaced by its visible text
+_INLINE_RULES = [
+    (re.compile(r'<!--.*?-->'), ''),
+    (re.compile(r'!\[([^\]]*)\]\([^)]*\)'), r'\1'),  # Images
+    (re.compile(r'\[([^\]]*)\]\([^)]*\)'), r'\1'),  # Links
+    (re.compile(r'\[([^\]]*)\]\[[^\]]*\]'), r'\1'),  # Reference links
+    (re.compile(r'<(https?://[^>\s]+)>'), r'\1'),  # Autolinks
+    (re.compile(r'</?[A-Za-z][^>]*>'), ''),  # HTML and JSX tags
+    (re.compile(r'`+([^`]+?)`+'), r'\1'),  # Inline code
+    (re.compile(r'(\*\*|__)(?=\S)(.+?)(?<=\S)\1'), r'\2'),  # Strong
+    (re.compile(r'(?<![\w*])\*(?=\S)(.+?)(?<=\S)\*(?![\w*])'), r'\1'),  # Emphasis
+    (re.compile(r'(?<!\w)_(?=\S)(.+?)(?<=\S)_(?!\w)'), r'\1'),
+    (re.compile(r'~~(.+?)~~'), r'\1'),  # Strikethrough
+]
+
+
+def strip_number_prefix(name: str) -> str:
+    """
+    Remove a Docusaurus number prefix from a file or directory name.
+
+    Args:
+        name: File or directory name
+
+    Returns:
+        Name without its number prefix
+    """
+    return _NUMBER_PREFIX_RE.sub('', name)
+
+
+def parse_front_matter(source: str) -> Tuple[Dict, str]:
+    """
+    Split a Markdown document into its front matter and body.
+
+    Front matter is parsed as YAML. Without PyYAML, only flat "key: value" lines are read.
+
+    Args:
+        source: Markdown source
+
+    Returns:
+        Tuple of (front matter dictionary, body)
+    """
+    match = _FRONT_MATTER_RE.match(source)
+    if not match:
+        return {}, source
+
+    body = source[match.end():]
+    if YAML_AVAILABLE:
+        try:
+            front_matter = yaml.safe_load(match.group(1))
+        except yaml.YAMLError as e:
+            app_logger.warning(f"Invalid front matter: {str(e)}")
+            return {}, body
+        return (front_matter if isinstance(front_matter, dict) else {}), body
+
+    front_matter = {}
+    for line in match.group(1).splitlines():
+        key, separator, value = line.partition(':')
+        if separator and key and not key[0].isspace():
+            front_matter[key.strip()] = value.strip().strip('"\'')
+    return front_matter, body
+
+
+def _inline_text(text: str) -> str:
+    """Replace inline Markdown with its visible text."""
+    for pattern, replacement in _INLINE_RULES:
+        text = pattern.sub(replacement, text)
+    return html.unescape(text)
+
+
+class DocsLoader:
+    """
+    Class to load the book's Markdown sources as processed pages.
+
+    Files are mapped to URLs with Docusaurus' docs routing rules: number prefixes are
+    stripped, index and README files (or files named after their directory) map to
+    the directory, and front matter "id" and "slug" override the path. Files and
+    directories starting with "_", and drafts, are not published and are skipped.
+    """
+
+    def __init__(self, config: Config, docs_dir: Optional[str] = None):
+        self.config = config
+        self.docs_dir = Path(docs_dir or config.docs_dir)
+        self.site_url = config.physical_ai_book_base_url.rstrip('/')
+        self.route_base_path = config.docs_route_base_path.strip('/')
+
+    def find_sources(self) -> List[Path]:
+        """
+        Find the published Markdown files under the docs directory.
+
+        Returns:
+            Sorted list of file paths
+
+        Raises:
+            ValueError: If the docs directory does not exist
+        """
+        if not self.docs_dir.is_dir():
+            raise ValueError(f"Docs directory {self.docs_dir} does not exist")
+
+        sources = []
+        for path in self.docs_dir.rglob('*'):
+            relative = path.relative_to(self.docs_dir)
+            if path.suffix in DOC_EXTENSIONS and path.is_file() \
+                    and not any(part.startswith('_') for part in relative.parts):
+                sources.append(path)
+        return sorted(sources)
+
+    def doc_url(self, relative_path: str, front_matter: Optional[Dict] = None) -> str:
+        """
+        Get the published URL of a doc.
+
+        Args:
+            relative_path: Path of the file relative to the docs directory, with "/" separators
+            front_matter: Front matter of the file
+
+        Returns:
+            Absolute URL with a trailing slash
+        """
+        front_matter = front_matter or {}
+        directory, file_name = posixpath.split(relative_path)
+        stem = posixpath.splitext(file_name)[0]
+        directory_slug = '/' + '/'.join(strip_number_prefix(part) for part in directory.split('/') if part)
+        if not directory_slug.endswith('/'):
+            directory_slug += '/'
+
+        slug = front_matter.get('slug')
+        slug = str(slug) if slug is not None else None
+        if slug and slug.startswith('/'):
+            path = slug
+        elif slug is None and stem.lower() in ('index', 'readme', posixpath.basename(directory).lower()):
+            path = directory_slug
+        else:
+            base = slug if slug is not None else str(front_matter.get('id') or strip_number_prefix(stem))
+            path = posixpath.normpath(posixpath.join(directory_slug, base))
+
+        path = '/'.join(part for part in path.split('/') if part)
+        route = '/'.join(part for part in (self.route_base_path, path) if part)
+        return f"{self.site_url}/{route}/" if route else f"{self.site_url}/"
+
+    def is_doc_url(self, url: str) -> bool:
+        """
+        Check whether a URL is under the docs route, where every doc is published.
+
+        Args:
+            url: Absolute URL
+
+        Returns:
+            True if the URL could belong to a doc
+        """
+        prefix = f"{self.site_url}/{self.route_base_path}/" if self.route_base_path else f"{self.site_url}/"
+        return url.startswith(prefix) or url == prefix.rstrip('/')
+
+    def load_document(self, path: Path) -> Optional[Dict]:
+        """
+        Load one Markdown file as a processed page.
+
+        Args:
+            path: Path of the Markdown file
+
+        Returns:
+            Dictionary with "url", "sections", "text" and "metadata" like
+            TextExtractor.extract_sections, or None if the doc is a draft
+        """
+        source = path.read_text(encoding='utf-8')
+        front_matter, body = parse_front_matter(source)
+        if front_matter.get('draft') is True:
+            return None
+
+        relative_path = path.relative_to(self.docs_dir).as_posix()
+        url = self.doc_url(relative_path, front_matter)
+        sections, text_content, headings = self._parse_markdown(body, front_matter)
+
+        title = str(front_matter.get('title') or next(
+            (heading["text"] for heading in headings if heading["level"] == 1), strip_number_prefix(path.stem)
+        ))
+        metadata = {
+            "url": url,
+            "title": title,
+            "headings": headings,
+            "word_count": len(text_content.split()),
+            "content_type": "documentation",
+            "source_path": relative_path
+        }
+        return {"url": url, "sections": sections, "text": text_content, "metadata": metadata}
+
+    def iter_documents(self) -> Iterator[Dict]:
+        """
+        Load every published Markdown file.
+
+        Yields:
+            Result of load_document for each file that is not a draft
+        """
+        for path in self.find_sources():
+            try:
+                document = self.load_document(path)
+            except (OSError, UnicodeDecodeError) as e:
+                app_logger.error(f"Error reading {path}: {str(e)}")
+                continue
+            if document is not None:
+                yield document
+
+    def _parse_markdown(self, body: str, front_matter: Dict) -> Tuple[List[Dict], str, List[Dict]]:
+        """
+        Parse a Markdown body into heading sections.
+
+        Paragraphs, list items, table cells and blockquote lines become text blocks
+        and fenced code becomes code blocks, as on the rendered page. Like Docusaurus,
+        the front matter title is used as the page heading when the body has no
+        level 1 heading.
+
+        Args:
+            body: Markdown without front matter
+            front_matter: Front matter of the document
+
+        Returns:
+            Tuple of (sections, text in page order including headings, heading hierarchy)
+        """
+        builder = SectionBuilder()
+        text_parts: List[str] = []
+        paragraph: List[str] = []
+        headings: List[Dict] = []
+
+        def add_heading(level: int, text: str):
+            text = " ".join(_inline_text(_HEADING_ID_RE.sub('', text)).split())
+            headings.append({"level": level, "text": text})
+            text_parts.append(text)
+            builder.add_heading(level, text)
+
+        def end_paragraph():
+            if paragraph:
+                text = " ".join(_inline_text(" ".join(paragraph)).split())
+                paragraph.clear()
+                if text:
+                    text_parts.append(text)
+                    builder.add_text(text)
+            builder.end_block()
+
+        lines = body.splitlines()
+        if front_matter.get('title') and not any(
+                (match := _HEADING_RE.match(line)) and len(match.group(1)) == 1 for line in lines):
+            add_heading(1, str(front_matter['title']))
+
+        fence: Optional[Tuple[str, int]] = None
+        code_lines: List[str] = []
+        in_comment = False
+
+        for line in lines:
+            if fence is not None:
+                match = _FENCE_RE.match(line)
+                if match and match.group(2)[0] == fence[0][0] and len(match.group(2)) >= len(fence[0]) \
+                        and not line[match.end():].strip():
+                    code = "\n".join(code_lines)
+                    text_parts.append(code)
+                    builder.add_code(code)
+                    fence, code_lines = None, []
+                else:
+                    # Remove up to the fence's own indentation, as in a list item
+                    indent = len(line) - len(line.lstrip())
+                    code_lines.append(line[min(indent, fence[1]):])
+                continue
+
+            if in_comment:
+                in_comment = '-->' not in line
+                continue
+            if '<!--' in line and '-->' not in line.split('<!--', 1)[1]:
+                line, in_comment = line.split('<!--', 1)[0], True
+
+            stripped = line.strip()
+            match = _FENCE_RE.match(line)
+            if match:
+                end_paragraph()
+                fence = (match.group(2), len(match.group(1)))
+            elif not stripped or _THEMATIC_BREAK_RE.match(line) or _MDX_STATEMENT_RE.match(line):
+                end_paragraph()
+            elif (match := _HEADING_RE.match(line)):
+                end_paragraph()
+                add_heading(len(match.group(1)), match.group(2))
+            elif (match := _ADMONITION_RE.match(line)):
+                # ":::note Title" opens an admonition and ":::" closes it; keep only the title
+                end_paragraph()
+                paragraph.append(match.group(2).strip())
+                end_paragraph()
+            elif stripped.startswith('|') or (paragraph == [] and stripped.count('|') >= 2):
+                end_paragraph()
+                if not _TABLE_DELIMITER_RE.match(line):
+                    for cell in stripped.strip('|').split('|'):
+                        paragraph.append(cell)
+                        end_paragraph()
+            elif stripped.startswith('>'):
+                end_paragraph()
+                paragraph.append(stripped.lstrip('> '))
+                end_paragraph()
+            elif _LIST_ITEM_RE.match(line):
+                end_paragraph()
+                paragraph.append(_LIST_ITEM_RE.sub('', line))
+            else:
+                paragraph.append(stripped)
+
+        if fence is not None:
+            # Unclosed fences run to the end of the document
+            code = "\n".join(code_lines)
+            text_parts.append(code)
+            builder.add_code(code)
+        end_paragraph()
+
+        return builder.build(), "\n\n".join(text_parts), headings
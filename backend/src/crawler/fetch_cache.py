@@ -0,0 +1,131 @@
+"""
+Fetch Cache Module for Physical AI Book Website
+
+This module persists fetched pages on disk together with their HTTP validators,
+so unchanged pages can be revalidated with a conditional request instead of refetched.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+from ..utils.logger import app_logger
+
+
+class FetchCache:
+    """
+    Class to store fetched page bodies and their ETag/Last-Modified validators in SQLite.
+
+    Methods may be called from worker threads (asyncio.to_thread); a lock serializes
+    access to the connection. After close(), the connection is reopened on next use.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        with self._lock:
+            self._get_connection()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get the database connection, opening it and creating the table on first use."""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+                """
+            )
+            self._connection.commit()
+        return self._connection
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Get the cached entry for a URL.
+
+        Args:
+            url: URL to look up
+
+        Returns:
+            Dictionary with body, etag, last_modified, content_hash and fetched_at,
+            or None if the URL is not cached
+        """
+        with self._lock:
+            row = self._get_connection().execute(
+                "SELECT body, etag, last_modified, content_hash, fetched_at FROM pages WHERE url = ?",
+                (url,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        body, etag, last_modified, content_hash, fetched_at = row
+        return {
+            "body": zlib.decompress(body).decode('utf-8'),
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": content_hash,
+            "fetched_at": fetched_at
+        }
+
+    def put(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> str:
+        """
+        Store a fetched page body and its validators.
+
+        Args:
+            url: URL the body was fetched from
+            body: Page body
+            etag: ETag response header, if any
+            last_modified: Last-Modified response header, if any
+
+        Returns:
+            SHA-256 hash of the page body
+        """
+        encoded_body = body.encode('utf-8')
+        content_hash = hashlib.sha256(encoded_body).hexdigest()
+
+        compressed_body = zlib.compress(encoded_body)
+
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO pages (url, body, etag, last_modified, content_hash, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, compressed_body, etag, last_modified, content_hash, time.time())
+            )
+            connection.commit()
+
+        app_logger.debug(f"Cached {url} ({len(encoded_body)} bytes, hash {content_hash[:12]})")
+        return content_hash
+
+    def touch(self, url: str):
+        """
+        Record that a cached page was successfully revalidated.
+
+        Args:
+            url: URL that was revalidated
+        """
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            connection.commit()
+
+    def close(self):
+        """Close the underlying database connection, if it is open."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
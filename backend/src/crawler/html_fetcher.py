@@ -4,25 +4,45 @@ HTML Fetcher Module for Physical AI Book Website
 This module handles fetching HTML content from discovered URLs.
 """
 import asyncio
-import time
 from typing import Dict, Optional
-from playwright.async_api import async_playwright
 from ..utils.logger import app_logger
 from ..utils.config import Config
+from ..utils.rate_limiter import get_limiter
+from ..processor.text_extractor import TextExtractor
+from .browser_pool import BrowserPool
+from .http_fetcher import HTTPFetcher
 
 
 class HTMLFetcher:
     """Class to fetch HTML content from URLs with proper error handling and rate limiting."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, browser_pool: Optional[BrowserPool] = None):
         self.config = config
-        self.last_request_time = 0
-        self.min_request_interval = 1.0 / (self.config.max_concurrent_requests * 0.8)  # Respect rate limits
+        self.browser_pool = browser_pool or BrowserPool(config)
+        self.http_fetcher = HTTPFetcher(config)
+        self.text_extractor = TextExtractor(config)
+        # Requests per second to the book website, shared by every fetcher
+        self.rate_limiter = get_limiter("website", self.config.max_concurrent_requests * 0.8 * 60)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Release the shared browser pool and HTTP connections."""
+        await self.http_fetcher.close()
+        await self.browser_pool.close()
 
     async def fetch_html(self, url: str) -> Optional[str]:
         """
         Fetch HTML content from a URL.
 
+        Depending on FETCH_MODE, the page is fetched over plain HTTP ("http"), rendered
+        in the browser ("browser"), or fetched over HTTP first and rendered in the browser
+        only when the static HTML has no usable main content ("auto").
+
         Args:
             url: URL to fetch
 
@@ -30,21 +50,52 @@ class HTMLFetcher:
             HTML content as string, or None if failed
         """
         # Rate limiting
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        if time_since_last_request < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - time_since_last_request)
+        await self.rate_limiter.acquire()
 
         app_logger.debug(f"Fetching HTML from: {url}")
 
-        try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
+        if self.config.fetch_mode != "browser":
+            result = await self.http_fetcher.fetch(url)
+            html_content = result["text"]
+
+            # A client error from the static host will not be fixed by rendering the page
+            client_error = result["status"] is not None and 400 <= result["status"] < 500
+
+            if self.config.fetch_mode == "http" or client_error:
+                return html_content
 
-                # Set a reasonable timeout
-                page.set_default_timeout(30000)
+            if html_content and self._has_main_content(html_content):
+                return html_content
+
+            app_logger.debug(f"Static HTML for {url} has no usable main content, rendering in browser")
+
+        return await self._fetch_with_browser(url)
+
+    def _has_main_content(self, html_content: str) -> bool:
+        """
+        Check whether statically served HTML already contains the page's main content.
+
+        Args:
+            html_content: HTML content to check
 
+        Returns:
+            True if the main content area holds at least STATIC_MIN_CONTENT_CHARS characters
+        """
+        text_content = self.text_extractor.extract_main_text(html_content)
+        return len(text_content) >= self.config.static_min_content_chars
+
+    async def _fetch_with_browser(self, url: str) -> Optional[str]:
+        """
+        Fetch HTML content from a URL by rendering it in a pooled browser page.
+
+        Args:
+            url: URL to fetch
+
+        Returns:
+            HTML content as string, or None if failed
+        """
+        try:
+            async with self.browser_pool.page() as page:
                 # Navigate to the page
                 response = await page.goto(url, wait_until="domcontentloaded")
 
@@ -53,30 +104,27 @@ class HTMLFetcher:
                     html_content = await page.content()
                     app_logger.debug(f"Successfully fetched HTML from {url} ({len(html_content)} characters)")
 
-                    await browser.close()
-                    self.last_request_time = time.time()
                     return html_content
                 else:
                     app_logger.warning(f"Failed to fetch {url}, status code: {response.status if response else 'N/A'}")
-                    await browser.close()
                     return None
 
         except Exception as e:
             app_logger.warning(f"Error fetching HTML from {url}: {str(e)}")
             return None
 
-    async def fetch_multiple_html(self, urls: list, max_concurrent: int = 5) -> Dict[str, Optional[str]]:
+    async def fetch_multiple_html(self, urls: list, max_concurrent: Optional[int] = None) -> Dict[str, Optional[str]]:
         """
         Fetch HTML content from multiple URLs with controlled concurrency.
 
         Args:
             urls: List of URLs to fetch
-            max_concurrent: Maximum number of concurrent requests
+            max_concurrent: Maximum number of concurrent requests (default: browser pool size)
 
         Returns:
             Dictionary mapping URLs to their HTML content (or None if failed)
         """
-        semaphore = asyncio.Semaphore(max_concurrent)
+        semaphore = asyncio.Semaphore(max_concurrent or self.browser_pool.size)
 
         async def fetch_with_semaphore(url):
             async with semaphore:
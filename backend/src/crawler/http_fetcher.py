@@ -0,0 +1,130 @@
+"""
+HTTP Fetcher Module for Physical AI Book Website
+
+This module handles fetching pages over plain HTTP with a pooled, keep-alive client.
+It is used as a fast path for statically rendered pages that do not need a browser.
+"""
+import asyncio
+from typing import AsyncIterator, Dict, Optional
+import httpx
+from ..utils.logger import app_logger
+from ..utils.config import Config
+from .fetch_cache import FetchCache
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 support in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HTTPFetcher:
+    """Class to fetch pages over a shared, connection-pooled async HTTP client."""
+
+    def __init__(self, config: Config, cache: Optional[FetchCache] = None):
+        self.config = config
+        self.cache = cache
+        if self.cache is None and config.fetch_cache_enabled:
+            self.cache = FetchCache(config.fetch_cache_path)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared HTTP client, creating it on first use.
+
+        Returns:
+            Shared httpx.AsyncClient instance
+        """
+        if self._client is None or self._client.is_closed:
+            pool_size = self.config.max_concurrent_requests * 2
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                follow_redirects=True,
+                timeout=httpx.Timeout(30.0),
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                # httpx advertises gzip/deflate, plus br when a brotli package is installed
+                headers={"User-Agent": "PhysicalAIBookIngestion/1.0"}
+            )
+        return self._client
+
+    async def close(self):
+        """Close the shared HTTP client, its pooled connections and the fetch cache."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self.cache is not None:
+            self.cache.close()
+
+    async def fetch(self, url: str) -> Dict:
+        """
+        Fetch a page body over HTTP.
+
+        When the page is in the fetch cache, the request is made conditional with
+        If-None-Match/If-Modified-Since and a 304 response is served from the cache.
+
+        Args:
+            url: URL to fetch
+
+        Returns:
+            Dictionary with the HTTP "status" (None on transport errors), the response
+            "text" (None unless the page was fetched or revalidated) and "not_modified"
+            (True if the cached copy was still current)
+        """
+        # The cache is SQLite on disk; keep its reads and writes off the event loop
+        cached = await asyncio.to_thread(self.cache.get, url) if self.cache else None
+
+        headers = {}
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            response = await self._get_client().get(url, headers=headers)
+
+            if response.status_code == 304 and cached:
+                app_logger.debug(f"Not modified, serving {url} from fetch cache")
+                await asyncio.to_thread(self.cache.touch, url)
+                return {"status": response.status_code, "text": cached["body"], "not_modified": True}
+
+            if response.status_code == 200:
+                app_logger.debug(f"Fetched {url} over {response.http_version} ({len(response.content)} bytes)")
+                if self.cache:
+                    await asyncio.to_thread(
+                        self.cache.put,
+                        url,
+                        response.text,
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified")
+                    )
+                return {"status": response.status_code, "text": response.text, "not_modified": False}
+
+            app_logger.warning(f"Failed to fetch {url} over HTTP, status code: {response.status_code}")
+            return {"status": response.status_code, "text": None, "not_modified": False}
+
+        except httpx.HTTPError as e:
+            app_logger.warning(f"HTTP error fetching {url}: {str(e)}")
+            return {"status": None, "text": None, "not_modified": False}
+
+    async def iter_bytes(self, url: str) -> AsyncIterator[bytes]:
+        """
+        Stream a response body over HTTP without buffering it in memory.
+
+        Args:
+            url: URL to fetch
+
+        Yields:
+            Chunks of the decoded response body (nothing if the request failed)
+        """
+        try:
+            async with self._get_client().stream("GET", url) as response:
+                if response.status_code != 200:
+                    app_logger.warning(f"Failed to stream {url} over HTTP, status code: {response.status_code}")
+                    return
+
+                async for chunk in response.aiter_bytes():
+                    yield chunk
+
+        except httpx.HTTPError as e:
+            app_logger.warning(f"HTTP error streaming {url}: {str(e)}")
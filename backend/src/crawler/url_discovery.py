@@ -5,118 +5,273 @@ This module handles the discovery of all pages on the Physical AI Book website.
 """
 import asyncio
 import re
+from contextlib import aclosing
 from urllib.parse import urljoin, urlparse
-from typing import Set, List
-from playwright.async_api import async_playwright
+from xml.etree import ElementTree
+from typing import Awaitable, Callable, Dict, Set, List, Optional
+from bs4 import BeautifulSoup
 from ..utils.logger import app_logger
 from ..utils.config import Config
+from .browser_pool import BrowserPool
+from .html_fetcher import HTMLFetcher
 
 
 class URLDiscoverer:
     """Class to discover and collect all URLs from the Physical AI Book website."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, html_fetcher: Optional[HTMLFetcher] = None):
         self.config = config
+        self._owns_fetcher = html_fetcher is None
+        self.html_fetcher = html_fetcher or HTMLFetcher(config, BrowserPool(config, size=config.discovery_workers))
         self.visited_urls: Set[str] = set()
         self.discovered_urls: Set[str] = set()
+        self.url_lastmod: Dict[str, Optional[str]] = {}
         self.base_domain = urlparse(config.physical_ai_book_base_url).netloc
+        self._on_discovered: Optional[Callable[[str], Awaitable[None]]] = None
 
-    async def discover_urls(self, max_depth: int = 3) -> Set[str]:
+    async def discover_urls(self, max_depth: int = 3, num_workers: Optional[int] = None,
+                            mode: Optional[str] = None,
+                            on_discovered: Optional[Callable[[str], Awaitable[None]]] = None) -> Set[str]:
         """
         Discover all URLs on the Physical AI Book website up to a specified depth.
 
+        In "sitemap" mode the pages listed in the site's sitemap.xml are discovered right
+        away, then crawled for links so pages the sitemap misses are found as well (the
+        whole site is crawled from the base URL if no sitemap is available). In "crawl"
+        mode the site is crawled breadth-first from the base URL.
+
         Args:
             max_depth: Maximum depth to crawl (default: 3)
+            num_workers: Number of concurrent workers (default: DISCOVERY_WORKERS)
+            mode: Discovery mode, "sitemap" or "crawl" (default: DISCOVERY_MODE)
+            on_discovered: Optional async callback awaited with each newly discovered URL,
+                so downstream processing can start before discovery finishes
 
         Returns:
             Set of discovered URLs
         """
-        app_logger.info(f"Starting URL discovery for {self.config.physical_ai_book_base_url} with max depth {max_depth}")
+        mode = mode or self.config.discovery_mode
+        base_url = self.config.physical_ai_book_base_url
+        app_logger.info(f"Starting URL discovery for {base_url} in {mode} mode")
 
-        async with async_playwright() as p:
-            # Launch browser
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+        self._on_discovered = on_discovered
 
-            try:
-                # Start with the base URL
-                await self._crawl_page(self.config.physical_ai_book_base_url, page, 0, max_depth)
-            finally:
-                await browser.close()
+        try:
+            seed_urls = [base_url]
+
+            if mode == "sitemap":
+                sitemap_entries = await self.discover_from_sitemap()
+
+                if sitemap_entries:
+                    # Sitemap pages are passed on before crawling starts; the crawl from them
+                    # only adds pages the sitemap does not list
+                    for url, lastmod in sitemap_entries.items():
+                        self.url_lastmod[url] = lastmod
+                        await self._add_discovered(url)
+
+                    seed_urls = list(sitemap_entries) + [url for url in seed_urls if url not in sitemap_entries]
+                else:
+                    app_logger.warning("Sitemap unavailable or empty, falling back to link crawling")
+
+            if seed_urls:
+                await self._crawl(seed_urls, max_depth, num_workers or self.config.discovery_workers)
+        finally:
+            self._on_discovered = None
+            if self._owns_fetcher:
+                await self.html_fetcher.close()
 
         app_logger.info(f"URL discovery completed. Found {len(self.discovered_urls)} unique URLs")
         return self.discovered_urls
 
-    async def _crawl_page(self, url: str, page, current_depth: int, max_depth: int):
+    async def _add_discovered(self, url: str):
         """
-        Crawl a single page and extract URLs.
+        Record a newly discovered URL and notify the on_discovered callback, if any.
 
         Args:
-            url: URL to crawl
-            page: Playwright page object
-            current_depth: Current depth in the crawl
-            max_depth: Maximum allowed depth
+            url: Discovered URL
         """
-        if current_depth > max_depth:
-            return
+        self.discovered_urls.add(url)
+        if self._on_discovered:
+            await self._on_discovered(url)
 
-        if url in self.visited_urls:
-            return
+    async def discover_from_sitemap(self, sitemap_url: Optional[str] = None) -> Dict[str, Optional[str]]:
+        """
+        Discover URLs from the site's sitemap, following sitemap indexes.
 
-        app_logger.debug(f"Crawling page: {url} at depth {current_depth}")
+        The sitemap is streamed and parsed incrementally, so large sitemaps are never
+        held in memory as a whole.
+
+        Args:
+            sitemap_url: Sitemap URL (default: SITEMAP_URL)
+
+        Returns:
+            Dictionary mapping each valid URL to its lastmod value (or None if not given)
+        """
+        pending = [sitemap_url or self.config.sitemap_url]
+        seen_sitemaps: Set[str] = set()
+        entries: Dict[str, Optional[str]] = {}
+
+        while pending:
+            current_sitemap = pending.pop()
+            if current_sitemap in seen_sitemaps:
+                continue
+            seen_sitemaps.add(current_sitemap)
+
+            app_logger.debug(f"Reading sitemap: {current_sitemap}")
+            parser = ElementTree.XMLPullParser(events=("end",))
+
+            try:
+                # Close the stream (and its connection) even if parsing fails part way
+                async with aclosing(self.html_fetcher.http_fetcher.iter_bytes(current_sitemap)) as chunks:
+                    async for chunk in chunks:
+                        parser.feed(chunk)
+                        self._read_sitemap_events(parser, entries, pending)
+                parser.close()
+                self._read_sitemap_events(parser, entries, pending)
+            except ElementTree.ParseError as e:
+                app_logger.warning(f"Error parsing sitemap {current_sitemap}: {str(e)}")
+
+        app_logger.info(f"Found {len(entries)} URLs in sitemap")
+        return entries
+
+    def _read_sitemap_events(self, parser: ElementTree.XMLPullParser, entries: Dict[str, Optional[str]],
+                             pending: List[str]):
+        """
+        Collect page and nested sitemap entries from parsed sitemap elements.
+
+        Args:
+            parser: Incremental XML parser fed with sitemap data
+            entries: Dictionary of page URLs to lastmod values to add to
+            pending: List of nested sitemap URLs still to be read
+        """
+        for _, element in parser.read_events():
+            tag = element.tag.rsplit('}', 1)[-1]
+            if tag not in ('url', 'sitemap'):
+                continue
+
+            loc, lastmod = None, None
+            for child in element:
+                child_tag = child.tag.rsplit('}', 1)[-1]
+                if child_tag == 'loc' and child.text:
+                    loc = child.text.strip()
+                elif child_tag == 'lastmod' and child.text:
+                    lastmod = child.text.strip()
+
+            if loc:
+                if tag == 'sitemap':
+                    pending.append(loc)
+                elif self._is_valid_url(loc):
+                    entries[loc.split('#')[0]] = lastmod
+
+            # Release parsed elements to keep memory flat
+            element.clear()
+
+    async def _crawl(self, seed_urls: List[str], max_depth: int, num_workers: int):
+        """
+        Crawl the site breadth-first from the seed URLs.
+
+        A shared frontier queue is served by concurrent workers, and URLs are deduplicated
+        before they are enqueued. Pages are fetched with the HTMLFetcher, so static pages
+        skip the browser entirely (see FETCH_MODE).
+
+        Args:
+            seed_urls: URLs to start crawling from at depth 0
+            max_depth: Maximum depth to crawl
+            num_workers: Number of concurrent workers
+        """
+        app_logger.info(f"Crawling links from {len(seed_urls)} seed URLs "
+                        f"with max depth {max_depth} and {num_workers} workers")
+
+        frontier: asyncio.Queue = asyncio.Queue()
+        for seed_url in seed_urls:
+            self.visited_urls.add(seed_url)
+            frontier.put_nowait((seed_url, 0))
+
+        workers = [
+            asyncio.create_task(self._crawl_worker(frontier, max_depth))
+            for _ in range(num_workers)
+        ]
 
         try:
-            # Navigate to the page
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            # Wait until every enqueued URL has been crawled
+            await frontier.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _crawl_worker(self, frontier: asyncio.Queue, max_depth: int):
+        """
+        Take URLs off the frontier, crawl them and enqueue newly found links.
 
-            # Mark as visited
-            self.visited_urls.add(url)
+        Args:
+            frontier: Queue of (url, depth) pairs waiting to be crawled
+            max_depth: Maximum allowed depth
+        """
+        while True:
+            url, current_depth = await frontier.get()
 
-            # Extract URLs from the page
-            page_urls = await self._extract_urls_from_page(page, url)
+            try:
+                page_urls = await self._crawl_page(url, current_depth)
 
-            # Add new URLs to discovered set
-            for new_url in page_urls:
-                if self._is_valid_url(new_url) and new_url not in self.discovered_urls:
-                    self.discovered_urls.add(new_url)
-                    app_logger.debug(f"Discovered URL: {new_url}")
+                for new_url in page_urls:
+                    if self._is_valid_url(new_url) and new_url not in self.discovered_urls:
+                        await self._add_discovered(new_url)
+                        app_logger.debug(f"Discovered URL: {new_url}")
 
-                    # Recursively crawl if within depth limits
-                    if current_depth < max_depth:
-                        await self._crawl_page(new_url, page, current_depth + 1, max_depth)
+                    # Enqueue only unseen URLs within depth limits
+                    if current_depth < max_depth and new_url in self.discovered_urls and new_url not in self.visited_urls:
+                        self.visited_urls.add(new_url)
+                        frontier.put_nowait((new_url, current_depth + 1))
 
-        except Exception as e:
-            app_logger.warning(f"Error crawling {url}: {str(e)}")
+            except Exception as e:
+                app_logger.warning(f"Error crawling {url}: {str(e)}")
+            finally:
+                frontier.task_done()
 
-    async def _extract_urls_from_page(self, page, current_url: str) -> Set[str]:
+    async def _crawl_page(self, url: str, current_depth: int) -> Set[str]:
         """
-        Extract all URLs from the current page.
+        Crawl a single page and extract URLs.
 
         Args:
-            page: Playwright page object
+            url: URL to crawl
+            current_depth: Current depth in the crawl
+
+        Returns:
+            Set of URLs found on the page
+        """
+        app_logger.debug(f"Crawling page: {url} at depth {current_depth}")
+
+        html_content = await self.html_fetcher.fetch_html(url)
+        if not html_content:
+            return set()
+
+        # Extract URLs from the page
+        return self._extract_urls_from_html(html_content, url)
+
+    def _extract_urls_from_html(self, html_content: str, current_url: str) -> Set[str]:
+        """
+        Extract all URLs from the HTML of a page.
+
+        Args:
+            html_content: HTML content of the page
             current_url: Current page URL for relative URL resolution
 
         Returns:
             Set of URLs found on the page
         """
-        # Get all links from the page
-        links = await page.query_selector_all('a')
+        soup = BeautifulSoup(html_content, 'html.parser')
         urls = set()
 
-        for link in links:
-            try:
-                href = await link.get_attribute('href')
-                if href:
-                    # Resolve relative URLs
-                    absolute_url = urljoin(current_url, href)
-
-                    # Only include URLs from the same domain
-                    if self._is_same_domain(absolute_url):
-                        # Normalize the URL by removing fragments
-                        normalized_url = absolute_url.split('#')[0]
-                        urls.add(normalized_url)
-            except Exception as e:
-                app_logger.debug(f"Error extracting URL from link: {str(e)}")
+        for link in soup.find_all('a', href=True):
+            # Resolve relative URLs
+            absolute_url = urljoin(current_url, link['href'])
+
+            # Only include URLs from the same domain
+            if self._is_same_domain(absolute_url):
+                # Normalize the URL by removing fragments
+                normalized_url = absolute_url.split('#')[0]
+                urls.add(normalized_url)
 
         return urls
 
@@ -4,9 +4,13 @@ Batch Processor Module for Embedding Generation
 This module handles batching text chunks for efficient embedding generation.
 """
 import asyncio
+import heapq
 from typing import List, Dict, Optional
 from ..utils.logger import app_logger
 from ..utils.config import Config
+from ..utils.retry import is_throttled, retry_async
+from ..utils.adaptive_concurrency import AdaptiveConcurrencyLimiter
+from ..utils.tokenizer import estimate_tokens, get_token_counter
 
 
 class BatchProcessor:
@@ -14,31 +18,88 @@ class BatchProcessor:
 
     def __init__(self, config: Config):
         self.config = config
+        # Shared by every call, so concurrent callers adapt to throttling together
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            initial_limit=config.max_concurrent_requests,
+            min_limit=config.min_concurrent_requests,
+            max_limit=config.max_concurrent_requests
+        )
+        self.token_counter = get_token_counter(config)
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """
+        Estimate the number of tokens in a text.
 
-    def create_batches(self, texts: List[str], max_batch_size: int = 96) -> List[List[str]]:
+        Args:
+            text: Text to measure
+
+        Returns:
+            Approximate token count (about four characters per token)
         """
-        Create batches of texts for embedding generation.
+        return estimate_tokens(text)
+
+    def create_index_batches(self, texts: List[str], max_batch_size: int = 96,
+                             target_tokens: Optional[int] = None) -> List[List[int]]:
+        """
+        Pack texts into batches of similar token count.
+
+        Uses as few batches as the item cap and the token target allow, then assigns
+        texts longest first to the batch with the fewest tokens so far, so long and
+        short texts are mixed and every request carries a similar payload.
 
         Args:
             texts: List of text strings to batch
             max_batch_size: Maximum size of each batch (Cohere's limit is 96)
+            target_tokens: Target tokens per batch (EMBED_BATCH_TARGET_TOKENS if None, 0 for no target)
 
         Returns:
-            List of text batches
+            List of batches of indices into texts, largest batches first
         """
         if not texts:
             return []
 
         # Ensure batch size doesn't exceed Cohere's limit
         effective_batch_size = min(max_batch_size, 96)
+        if target_tokens is None:
+            target_tokens = self.config.embed_batch_target_tokens
+
+        # Exact counts with the configured tokenizer, estimates otherwise
+        token_counts = self.token_counter.count_tokens(texts)
+        total_tokens = sum(token_counts)
+
+        num_batches = -(-len(texts) // effective_batch_size)
+        if target_tokens:
+            num_batches = min(len(texts), max(num_batches, -(-total_tokens // target_tokens)))
+
+        # Longest-first assignment to the least loaded batch with room left
+        batches: List[List[int]] = [[] for _ in range(num_batches)]
+        heap = [(0, batch_index) for batch_index in range(num_batches)]
+        for index in sorted(range(len(texts)), key=lambda i: token_counts[i], reverse=True):
+            tokens, batch_index = heapq.heappop(heap)
+            batches[batch_index].append(index)
+            if len(batches[batch_index]) < effective_batch_size:
+                heapq.heappush(heap, (tokens + token_counts[index], batch_index))
+
+        batches = [sorted(batch) for batch in batches if batch]
+        batches.sort(key=lambda batch: sum(token_counts[i] for i in batch), reverse=True)
+
+        app_logger.debug(f"Packed {len(texts)} texts (~{total_tokens} tokens) into {len(batches)} batches "
+                         f"(batch size: {effective_batch_size}, target tokens: {target_tokens or 'none'})")
+        return batches
 
-        batches = []
-        for i in range(0, len(texts), effective_batch_size):
-            batch = texts[i:i + effective_batch_size]
-            batches.append(batch)
+    def create_batches(self, texts: List[str], max_batch_size: int = 96) -> List[List[str]]:
+        """
+        Create batches of texts for embedding generation.
 
-        app_logger.debug(f"Created {len(batches)} batches from {len(texts)} texts (batch size: {effective_batch_size})")
-        return batches
+        Args:
+            texts: List of text strings to batch
+            max_batch_size: Maximum size of each batch (Cohere's limit is 96)
+
+        Returns:
+            List of text batches, packed by token count (see create_index_batches)
+        """
+        return [[texts[i] for i in batch] for batch in self.create_index_batches(texts, max_batch_size)]
 
     async def process_batches(self, texts: List[str], embedder, max_batch_size: int = 96) -> Optional[List[List[float]]]:
         """
@@ -50,35 +111,82 @@ class BatchProcessor:
             max_batch_size: Maximum size of each batch
 
         Returns:
-            List of embedding vectors, or None if failed
+            List of embedding vectors, or None if any batch failed after retries
         """
-        if not texts:
-            return []
+        report = await self.process_batches_with_report(texts, embedder, max_batch_size)
+        if report["failed_indices"]:
+            return None
+        return report["embeddings"]
+
+    async def process_batches_with_report(self, texts: List[str], embedder, max_batch_size: int = 96) -> Dict:
+        """
+        Embed texts in batches, retrying failed batches and keeping partial results.
 
-        # Create batches
-        batches = self.create_batches(texts, max_batch_size)
-        all_embeddings = []
+        Retryable failures (throttling, 5xx, network errors) are retried with
+        exponential backoff and jitter, honoring Retry-After. Concurrency starts at
+        MAX_CONCURRENT_REQUESTS, halves when the API throttles and grows back while
+        batches succeed.
 
-        # Process batches with concurrency control
-        semaphore = asyncio.Semaphore(self.config.max_concurrent_requests)
+        Args:
+            texts: List of text strings to embed
+            embedder: Embedder instance (e.g., CohereEmbedder)
+            max_batch_size: Maximum size of each batch
 
-        async def process_batch(batch):
-            async with semaphore:
-                return await embedder.generate_embeddings(batch)
+        Returns:
+            Dictionary with "embeddings" (aligned with texts, None where a batch failed),
+            "failed_indices", "total_batches", "failed_batches" and "retries"
+        """
+        report = {"embeddings": [None] * len(texts), "failed_indices": [], "total_batches": 0,
+                  "failed_batches": 0, "retries": 0}
+        if not texts:
+            return report
+
+        # Pack texts into token-balanced batches; the largest are dispatched first
+        batches = self.create_index_batches(texts, max_batch_size)
+        report["total_batches"] = len(batches)
+
+        concurrency = self.concurrency
+
+        def on_retry(error: BaseException):
+            report["retries"] += 1
+            if is_throttled(error):
+                concurrency.on_throttle()
+
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            async with concurrency:
+                embeddings = await embedder.generate_embeddings(batch, raise_on_error=True)
+            if embeddings is None or len(embeddings) != len(batch):
+                raise ValueError("Embedder returned no embeddings for the batch")
+            concurrency.on_success()
+            return embeddings
+
+        async def process_batch(batch_index: int, batch: List[int]):
+            batch_texts = [texts[i] for i in batch]
+            return await retry_async(
+                lambda: embed_batch(batch_texts),
+                max_attempts=self.config.max_retries + 1,
+                base_delay=self.config.retry_base_delay,
+                max_delay=self.config.retry_max_delay,
+                on_retry=on_retry,
+                description=f"Embedding batch {batch_index}"
+            )
 
         # Process all batches concurrently
-        batch_results = await asyncio.gather(*[process_batch(batch) for batch in batches], return_exceptions=True)
+        batch_results = await asyncio.gather(*[process_batch(i, batch) for i, batch in enumerate(batches)],
+                                             return_exceptions=True)
 
-        # Collect results
-        for i, result in enumerate(batch_results):
-            if isinstance(result, Exception):
+        # Collect results in input order, keeping the embeddings of every successful batch
+        for i, (batch, result) in enumerate(zip(batches, batch_results)):
+            if isinstance(result, BaseException):
                 app_logger.error(f"Error processing batch {i}: {result}")
-                return None
-            elif result is not None:
-                all_embeddings.extend(result)
+                report["failed_batches"] += 1
+                report["failed_indices"].extend(batch)
             else:
-                app_logger.warning(f"Batch {i} returned None embeddings")
-                return None
-
-        app_logger.info(f"Successfully processed {len(texts)} texts in {len(batches)} batches")
-        return all_embeddings
\ No newline at end of file
+                for index, embedding in zip(batch, result):
+                    report["embeddings"][index] = embedding
+        report["failed_indices"].sort()
+
+        succeeded = len(texts) - len(report["failed_indices"])
+        app_logger.info(f"Embedded {succeeded}/{len(texts)} texts in {len(batches)} batches "
+                        f"({report['failed_batches']} failed, {report['retries']} retries)")
+        return report
@@ -4,29 +4,59 @@ Cohere Client Module for Embedding Generation
 This module handles interaction with the Cohere API for generating embeddings.
 """
 import asyncio
-import time
+import sqlite3
 from typing import List, Optional
 import cohere
 from ..utils.logger import app_logger
 from ..utils.config import Config
+from ..utils.rate_limiter import get_limiter
+from .embedding_cache import EmbeddingCache
+
+# Maximum number of texts Cohere accepts in one embed request
+MAX_EMBED_BATCH_SIZE = 96
 
 
 class CohereEmbedder:
     """Class to handle interaction with Cohere API for generating embeddings."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, cache: Optional[EmbeddingCache] = None,
+                 client: Optional[cohere.AsyncClient] = None, disk_cache: Optional[bool] = None):
         self.config = config
-        self.client = cohere.AsyncClient(config.cohere_api_key)
-        self.last_request_time = 0
-        self.min_request_interval = 60.0 / config.cohere_rpm_limit  # Respect rate limits
+        self.client = client or cohere.AsyncClient(config.cohere_api_key)
+        self.cache = cache
+        if disk_cache is None:
+            disk_cache = config.embedding_cache_enabled
+        if self.cache is None and disk_cache:
+            try:
+                self.cache = EmbeddingCache(config.embedding_cache_path)
+            except (OSError, sqlite3.Error) as e:
+                # A read-only or unavailable filesystem only costs the cache, not embedding
+                app_logger.warning(f"Embedding cache unavailable at {config.embedding_cache_path}, "
+                                   f"continuing without it: {str(e)}")
+        # Shared with every other Cohere caller using the same API key
+        self.rate_limiter = get_limiter("cohere", config.cohere_rpm_limit, config.cohere_burst)
+        self.input_limiter = None
+        if config.cohere_embed_inputs_per_minute:
+            # Embed requests are also limited per text; one full batch can burst
+            self.input_limiter = get_limiter(
+                "cohere_embed_inputs", config.cohere_embed_inputs_per_minute, MAX_EMBED_BATCH_SIZE
+            )
 
-    async def generate_embeddings(self, texts: List[str], model: str = "embed-multilingual-v3.0") -> Optional[List[List[float]]]:
+    async def generate_embeddings(self, texts: List[str], model: str = "embed-multilingual-v3.0",
+                                  input_type: str = "search_document",
+                                  raise_on_error: bool = False) -> Optional[List[List[float]]]:
         """
         Generate embeddings for a list of texts.
 
+        Texts found in the embedding cache are served locally; only cache misses are
+        sent to the Cohere API. Cache reads and writes run in a thread, and cache
+        errors are logged and treated as misses.
+
         Args:
             texts: List of text strings to embed
             model: Cohere model to use for embeddings
+            input_type: Cohere input type for the embeddings
+            raise_on_error: Raise API errors instead of returning None, so callers can retry them
 
         Returns:
             List of embedding vectors, or None if failed
@@ -34,11 +64,61 @@ class CohereEmbedder:
         if not texts:
             return []
 
+        if self.cache is None:
+            return await self._embed(texts, model, input_type, raise_on_error)
+
+        try:
+            embeddings = await asyncio.to_thread(self.cache.get_many, texts, model, input_type)
+        except sqlite3.Error as e:
+            app_logger.warning(f"Embedding cache lookup failed: {str(e)}")
+            embeddings = [None] * len(texts)
+        missing_texts = list(dict.fromkeys(text for text, embedding in zip(texts, embeddings) if embedding is None))
+
+        if missing_texts:
+            app_logger.debug(f"Embedding cache: {len(texts) - len(missing_texts)} hits, {len(missing_texts)} texts to embed")
+            new_embeddings = await self._embed(missing_texts, model, input_type, raise_on_error)
+            if new_embeddings is None:
+                return None
+
+            try:
+                await asyncio.to_thread(self.cache.put_many, missing_texts, new_embeddings, model, input_type)
+            except sqlite3.Error as e:
+                app_logger.warning(f"Embedding cache write failed: {str(e)}")
+            embedded = dict(zip(missing_texts, new_embeddings))
+            embeddings = [embedding if embedding is not None else embedded[text]
+                          for text, embedding in zip(texts, embeddings)]
+
+        return embeddings
+
+    def cache_stats(self) -> dict:
+        """
+        Get embedding cache hit/miss counters.
+
+        Returns:
+            Dictionary with hits, misses and hit_rate (all zero if caching is disabled)
+        """
+        if self.cache is None:
+            return {"hits": 0, "misses": 0, "hit_rate": 0.0}
+        return self.cache.stats()
+
+    async def _embed(self, texts: List[str], model: str, input_type: str,
+                     raise_on_error: bool = False) -> Optional[List[List[float]]]:
+        """
+        Call the Cohere API to embed a list of texts.
+
+        Args:
+            texts: List of text strings to embed
+            model: Cohere model to use for embeddings
+            input_type: Cohere input type for the embeddings
+            raise_on_error: Raise API errors instead of returning None
+
+        Returns:
+            List of embedding vectors, or None if failed
+        """
         # Rate limiting
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        if time_since_last_request < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - time_since_last_request)
+        await self.rate_limiter.acquire()
+        if self.input_limiter:
+            await self.input_limiter.acquire(len(texts))
 
         try:
             app_logger.debug(f"Generating embeddings for {len(texts)} texts using model {model}")
@@ -47,31 +127,34 @@ class CohereEmbedder:
             response = await self.client.embed(
                 texts=texts,
                 model=model,
-                input_type="search_document"  # Optimize for search use case
+                input_type=input_type
             )
 
             embeddings = response.embeddings
             app_logger.debug(f"Successfully generated embeddings for {len(texts)} texts")
 
-            self.last_request_time = time.time()
             return embeddings
 
         except Exception as e:
+            if raise_on_error:
+                raise
             app_logger.error(f"Error generating embeddings: {str(e)}")
             return None
 
-    async def generate_single_embedding(self, text: str, model: str = "embed-multilingual-v3.0") -> Optional[List[float]]:
+    async def generate_single_embedding(self, text: str, model: str = "embed-multilingual-v3.0",
+                                        input_type: str = "search_document") -> Optional[List[float]]:
         """
         Generate embedding for a single text.
 
         Args:
             text: Text string to embed
             model: Cohere model to use for embeddings
+            input_type: Cohere input type for the embedding
 
         Returns:
             Embedding vector as a list of floats, or None if failed
         """
-        embeddings = await self.generate_embeddings([text], model)
+        embeddings = await self.generate_embeddings([text], model, input_type)
         if embeddings and len(embeddings) > 0:
             return embeddings[0]
         return None
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Embedding Cache Module for Embedding Generation
+
+This module persists embeddings keyed by model, input type and a hash of the text,
+so identical texts are never sent to the embedding API twice.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from typing import Dict, List, Optional
+from ..utils.logger import app_logger
+
+# SQLite limits the number of bound parameters per statement
+_MAX_LOOKUP_SIZE = 500
+
+
+class EmbeddingCache:
+    """
+    Class to store embedding vectors as float32 blobs in SQLite.
+
+    Methods may be called from worker threads (asyncio.to_thread); a lock serializes
+    access to the connection and the hit/miss counters.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                input_type TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, input_type, text_hash)
+            )
+            """
+        )
+        self.connection.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """
+        Hash a text for use as a cache key.
+
+        Args:
+            text: Text to hash
+
+        Returns:
+            SHA-256 hex digest of the text
+        """
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get_many(self, texts: List[str], model: str, input_type: str) -> List[Optional[List[float]]]:
+        """
+        Look up cached embeddings for a list of texts.
+
+        Args:
+            texts: Texts to look up
+            model: Embedding model name
+            input_type: Embedding input type
+
+        Returns:
+            List aligned with texts holding the cached vector, or None for a miss
+        """
+        hashes = [self.hash_text(text) for text in texts]
+        found: Dict[str, List[float]] = {}
+
+        unique_hashes = list(dict.fromkeys(hashes))
+        rows = []
+        with self._lock:
+            for i in range(0, len(unique_hashes), _MAX_LOOKUP_SIZE):
+                lookup = unique_hashes[i:i + _MAX_LOOKUP_SIZE]
+                placeholders = ",".join("?" * len(lookup))
+                rows += self.connection.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND input_type = ? AND text_hash IN ({placeholders})",
+                    (model, input_type, *lookup)
+                ).fetchall()
+
+        for text_hash, blob in rows:
+            vector = array('f')
+            vector.frombytes(blob)
+            found[text_hash] = vector.tolist()
+
+        results = [found.get(text_hash) for text_hash in hashes]
+
+        hit_count = sum(1 for result in results if result is not None)
+        with self._lock:
+            self.hits += hit_count
+            self.misses += len(results) - hit_count
+
+        return results
+
+    def put_many(self, texts: List[str], embeddings: List[List[float]], model: str, input_type: str):
+        """
+        Store embeddings for a list of texts.
+
+        Args:
+            texts: Texts that were embedded
+            embeddings: Embedding vectors aligned with texts
+            model: Embedding model name
+            input_type: Embedding input type
+        """
+        rows = [
+            (model, input_type, self.hash_text(text), array('f', embedding).tobytes())
+            for text, embedding in zip(texts, embeddings)
+        ]
+        with self._lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, input_type, text_hash, vector) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self.connection.commit()
+
+        app_logger.debug(f"Cached {len(rows)} embeddings for model {model} ({input_type})")
+
+    def stats(self) -> Dict:
+        """
+        Get cache hit/miss counters.
+
+        Returns:
+            Dictionary with hits, misses and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self.connection.close()
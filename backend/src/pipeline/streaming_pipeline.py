@@ -0,0 +1,463 @@
+"""
+Streaming Ingestion Pipeline Module
+
+This module runs ingestion as concurrent stages connected by bounded queues
+(discover -> fetch -> extract/clean/chunk -> embed -> upsert), so pages flow through
+the pipeline as soon as they are discovered and memory use stays bounded. With a
+docs loader, the book's Markdown sources replace the discover and fetch stages.
+"""
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Set
+from ..utils.logger import app_logger
+from ..utils.config import Config
+from ..crawler.url_discovery import URLDiscoverer
+from ..crawler.html_fetcher import HTMLFetcher
+from ..crawler.docs_loader import DocsLoader
+from ..processor.page_processor import PageProcessor
+from ..embedder.cohere_client import CohereEmbedder
+from ..embedder.batch_processor import BatchProcessor
+from ..storage.qdrant_manager import QdrantManager
+from ..storage.validator import Validator
+from ..storage.manifest import IngestionManifest
+
+# Marks the end of a queue's input; one is sent per consuming worker
+_DONE = object()
+
+
+class StreamingIngestionPipeline:
+    """
+    Class to run incremental ingestion as a streaming, backpressured pipeline.
+
+    Each stage has its own worker count (PIPELINE_*_WORKERS) and hands work to the
+    next through a queue of at most PIPELINE_QUEUE_SIZE items, so a slow stage
+    throttles the ones before it instead of letting work pile up in memory.
+    Pages are recorded in the ingestion manifest once all their chunks are stored.
+
+    Pages come from crawling the published site, or from the Markdown sources when
+    a DocsLoader is given, in which case no browser or network access is needed
+    until embedding.
+    """
+
+    def __init__(self, config: Config, manifest: Optional[IngestionManifest] = None,
+                 force_rerun: bool = False, max_pages: Optional[int] = None,
+                 on_progress: Optional[Callable[[str], None]] = None,
+                 docs_loader: Optional[DocsLoader] = None):
+        self.config = config
+        self.docs_loader = docs_loader
+        self.manifest = manifest or IngestionManifest(config.manifest_path)
+        self.force_rerun = force_rerun
+        self.max_pages = max_pages
+        self.on_progress = on_progress
+
+        # Discovery and the fetch stage share one browser pool and HTTP client
+        self.html_fetcher = HTMLFetcher(config)
+        self.url_discoverer = URLDiscoverer(config, html_fetcher=self.html_fetcher)
+        self.cohere_embedder = CohereEmbedder(config)
+        self.batch_processor = BatchProcessor(config)
+        self.qdrant_manager = QdrantManager(config)
+        self.validator = Validator(config)
+
+        self.page_processor: Optional[PageProcessor] = None
+        self._source_urls: Set[str] = set()
+        self._pages: Dict[str, Dict] = {}
+        # Pages whose other points are stale, with the point ids to keep
+        self._stale_pages: Dict[str, List[str]] = {}
+        self._collection_ready: Optional[asyncio.Task] = None
+        self.stats = {
+            "pages_discovered": 0,
+            "pages_fetched": 0,
+            "pages_unchanged": 0,
+            "pages_ingested": 0,
+            "chunks_embedded": 0,
+            "chunks_failed": 0,
+            "vectors_stored": 0,
+            "vectors_deleted": 0
+        }
+
+    async def run(self, max_depth: int = 2) -> Dict:
+        """
+        Run the pipeline to completion.
+
+        Args:
+            max_depth: Maximum crawl depth for URL discovery
+
+        Returns:
+            Dictionary of pipeline statistics, including "discovered_urls" and "elapsed_seconds"
+        """
+        config = self.config
+        queue_size = config.pipeline_queue_size
+        url_queue: asyncio.Queue = asyncio.Queue(queue_size)
+        html_queue: asyncio.Queue = asyncio.Queue(queue_size)
+        chunk_queue: asyncio.Queue = asyncio.Queue(queue_size * config.pipeline_embed_batch_size)
+        batch_queue: asyncio.Queue = asyncio.Queue(queue_size)
+        upsert_queue: asyncio.Queue = asyncio.Queue(queue_size)
+
+        start_time = time.perf_counter()
+
+        # Extract, clean and chunk in worker processes so parsing does not block the loop
+        self.page_processor = PageProcessor(config)
+        app_logger.info(f"Starting streaming ingestion pipeline (fetch: {config.pipeline_fetch_workers}, "
+                        f"process: {config.pipeline_process_workers}, embed: {config.pipeline_embed_workers}, "
+                        f"upsert: {config.pipeline_upsert_workers} workers)")
+
+        # Stages are listed in order; each closes its output queue once its workers have finished
+        if self.docs_loader is not None:
+            stages = [
+                ([asyncio.create_task(self._load_docs(html_queue))], html_queue, config.pipeline_process_workers)
+            ]
+        else:
+            stages = [
+                ([asyncio.create_task(self._discover(url_queue, max_depth))], url_queue, config.pipeline_fetch_workers),
+                ([asyncio.create_task(self._fetch_worker(url_queue, html_queue))
+                  for _ in range(config.pipeline_fetch_workers)], html_queue, config.pipeline_process_workers)
+            ]
+        stages += [
+            ([asyncio.create_task(self._process_worker(html_queue, chunk_queue))
+              for _ in range(config.pipeline_process_workers)], chunk_queue, 1),
+            ([asyncio.create_task(self._batch_chunks(chunk_queue, batch_queue))],
+             batch_queue, config.pipeline_embed_workers),
+            ([asyncio.create_task(self._embed_worker(batch_queue, upsert_queue))
+              for _ in range(config.pipeline_embed_workers)], upsert_queue, config.pipeline_upsert_workers),
+            ([asyncio.create_task(self._upsert_worker(upsert_queue))
+              for _ in range(config.pipeline_upsert_workers)], None, 0)
+        ]
+        stage_tasks = [asyncio.create_task(self._close_stage(tasks, output_queue, consumers))
+                       for tasks, output_queue, consumers in stages]
+        all_tasks = [task for tasks, _, _ in stages for task in tasks] + stage_tasks
+
+        try:
+            # Supervise all stages together: a failing worker stops the run right away instead of
+            # leaving the other stages blocked on full queues
+            done, _ = await asyncio.wait(stage_tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+
+            # Points are written without waiting; make sure they are all applied
+            await self.qdrant_manager.flush()
+
+            # Drop pages that are no longer part of the site; the docs only cover the docs route,
+            # so crawled pages outside it are kept
+            if self.docs_loader is not None:
+                discovered_urls = self._source_urls
+                removable = [url for url in self.manifest.pages if self.docs_loader.is_doc_url(url)]
+            else:
+                discovered_urls = self.url_discoverer.discovered_urls
+                removable = list(self.manifest.pages)
+            if discovered_urls:
+                for url in [url for url in removable if url not in discovered_urls]:
+                    self.manifest.remove_page(url)
+                    self._stale_pages[url] = []
+
+            # Remove vectors of changed and removed pages that are no longer part of them
+            if self._stale_pages and await self.qdrant_manager.collection_exists():
+                deleted = await asyncio.gather(*(self.qdrant_manager.delete_by_url(url, keep_ids)
+                                                 for url, keep_ids in self._stale_pages.items()))
+                self.stats["vectors_deleted"] = sum(deleted)
+            self.manifest.save()
+        finally:
+            for task in all_tasks:
+                task.cancel()
+            await asyncio.gather(*all_tasks, return_exceptions=True)
+            await self.html_fetcher.close()
+            self.page_processor.close()
+
+        elapsed = time.perf_counter() - start_time
+        app_logger.info(f"Streaming ingestion pipeline finished in {elapsed:.1f}s: {self.stats}")
+        return {**self.stats, "discovered_urls": len(discovered_urls),
+                "elapsed_seconds": round(elapsed, 2)}
+
+    async def close(self):
+        """Close the Qdrant client."""
+        await self.qdrant_manager.close()
+
+    @staticmethod
+    async def _close_stage(tasks: List[asyncio.Task], output_queue: Optional[asyncio.Queue], consumers: int):
+        """
+        Wait for a stage's workers, then tell each consumer of its output queue that no more input is coming.
+
+        Args:
+            tasks: Worker tasks of the stage
+            output_queue: Queue the stage feeds, or None for the last stage
+            consumers: Number of workers reading output_queue
+        """
+        await asyncio.gather(*tasks)
+        for _ in range(consumers):
+            await output_queue.put(_DONE)
+
+    async def _discover(self, url_queue: asyncio.Queue, max_depth: int):
+        """
+        Discover URLs and feed them to the fetch stage as they are found.
+
+        Args:
+            url_queue: Queue of URLs to fetch
+            max_depth: Maximum crawl depth
+        """
+        async def on_discovered(url: str):
+            # Page state is keyed by URL, so each page goes through the pipeline once
+            if url in self._source_urls:
+                return
+            self._source_urls.add(url)
+            if self.max_pages is not None and self.stats["pages_discovered"] >= self.max_pages:
+                return
+            self.stats["pages_discovered"] += 1
+            await url_queue.put(url)
+
+        await self.url_discoverer.discover_urls(max_depth=max_depth, on_discovered=on_discovered)
+
+    async def _load_docs(self, html_queue: asyncio.Queue):
+        """
+        Load the Markdown sources and feed them to the process stage.
+
+        Files are read and parsed in a thread so the event loop stays free. Files past
+        max_pages are still read, so their pages are not treated as removed.
+
+        Args:
+            html_queue: Queue of (url, document) pairs to process
+        """
+        paths = await asyncio.to_thread(self.docs_loader.find_sources)
+        for path in paths:
+            try:
+                document = await asyncio.to_thread(self.docs_loader.load_document, path)
+            except (OSError, UnicodeDecodeError) as e:
+                app_logger.error(f"Error reading {path}: {str(e)}")
+                continue
+            if document is None:
+                continue
+
+            # Page state is keyed by URL, so only the first doc published at a URL is ingested
+            if document["url"] in self._source_urls:
+                app_logger.warning(f"Skipping {path}: another doc is already published at {document['url']}")
+                continue
+            self._source_urls.add(document["url"])
+            if self.max_pages is not None and self.stats["pages_discovered"] >= self.max_pages:
+                continue
+            self.stats["pages_discovered"] += 1
+            self.stats["pages_fetched"] += 1
+            await html_queue.put((document["url"], document))
+
+    async def _fetch_worker(self, url_queue: asyncio.Queue, html_queue: asyncio.Queue):
+        """
+        Fetch the HTML of discovered pages.
+
+        Args:
+            url_queue: Queue of URLs to fetch
+            html_queue: Queue of (url, html) pairs to process
+        """
+        while (url := await url_queue.get()) is not _DONE:
+            try:
+                html_content = await self.html_fetcher.fetch_html(url)
+            except Exception as e:
+                app_logger.error(f"Error fetching {url}: {str(e)}")
+                continue
+
+            if html_content:
+                self.stats["pages_fetched"] += 1
+                await html_queue.put((url, html_content))
+
+    async def _process_worker(self, html_queue: asyncio.Queue, chunk_queue: asyncio.Queue):
+        """
+        Extract, clean and chunk fetched pages, and queue the chunks that need embedding.
+
+        Args:
+            html_queue: Queue of (url, html) pairs, or (url, document) pairs from the docs loader
+            chunk_queue: Queue of chunks to embed
+        """
+        while (item := await html_queue.get()) is not _DONE:
+            url, content = item
+            known_page_hash = None if self.force_rerun else self.manifest.pages.get(url, {}).get("page_hash")
+            try:
+                if self.docs_loader is not None:
+                    result = await self.page_processor.process_document(url, content, known_page_hash)
+                else:
+                    result = await self.page_processor.process(url, content, known_page_hash)
+            except Exception as e:
+                app_logger.error(f"Error processing {url}: {str(e)}")
+                continue
+
+            for chunk in self._plan_page(result):
+                await chunk_queue.put(chunk)
+
+    def _plan_page(self, result: Dict) -> List[Dict]:
+        """
+        Plan which chunks of a processed page need to be embedded.
+
+        Args:
+            result: Result of process_page for the page
+
+        Returns:
+            Chunks to embed, annotated with url, chunk_hash and point_id
+        """
+        url = result["url"]
+        page_hash = result["page_hash"]
+
+        # Skip pages whose cleaned content has not changed since the last run
+        if result["chunks"] is None or (not self.force_rerun and self.manifest.is_page_unchanged(url, page_hash)):
+            self.stats["pages_unchanged"] += 1
+            return []
+
+        if url in self._pages:
+            app_logger.warning(f"Skipping {url}: the page is already being ingested")
+            return []
+
+        # Only new or changed chunks need to be embedded
+        plan = self.manifest.plan_page(url, result["chunks"], force=self.force_rerun)
+        self._pages[url] = {
+            "page_hash": page_hash,
+            "chunk_ids": plan["chunk_ids"],
+            "pending": len(plan["chunks_to_embed"]),
+            "failed_hashes": set()
+        }
+        if not plan["chunks_to_embed"]:
+            self._finish_page(url)
+
+        return [{**chunk, "url": url} for chunk in plan["chunks_to_embed"]]
+
+    async def _batch_chunks(self, chunk_queue: asyncio.Queue, batch_queue: asyncio.Queue):
+        """
+        Group chunks from any number of pages into embedding batches.
+
+        A batch is sent when it is full, or when no new chunk has arrived for
+        PIPELINE_BATCH_TIMEOUT_SECONDS so a partial batch does not wait for slow upstream stages.
+
+        Args:
+            chunk_queue: Queue of chunks to embed
+            batch_queue: Queue of chunk batches
+        """
+        batch_size = self.config.pipeline_embed_batch_size
+        batch: List[Dict] = []
+
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunk_queue.get(), self.config.pipeline_batch_timeout_seconds)
+            except asyncio.TimeoutError:
+                if batch:
+                    await batch_queue.put(batch)
+                    batch = []
+                continue
+
+            if chunk is _DONE:
+                break
+
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                await batch_queue.put(batch)
+                batch = []
+
+        if batch:
+            await batch_queue.put(batch)
+
+    async def _embed_worker(self, batch_queue: asyncio.Queue, upsert_queue: asyncio.Queue):
+        """
+        Embed chunk batches, passing successful chunks on for storage.
+
+        Args:
+            batch_queue: Queue of chunk batches
+            upsert_queue: Queue of (chunks, embeddings) pairs to store
+        """
+        while (batch := await batch_queue.get()) is not _DONE:
+            report = await self.batch_processor.process_batches_with_report(
+                [chunk["text"] for chunk in batch], self.cohere_embedder
+            )
+
+            embedded_chunks, embeddings, failed_chunks = [], [], []
+            for chunk, embedding in zip(batch, report["embeddings"]):
+                if embedding is not None and self.validator.validate_embedding(embedding):
+                    embedded_chunks.append(chunk)
+                    embeddings.append(embedding)
+                else:
+                    failed_chunks.append(chunk)
+
+            self.stats["chunks_embedded"] += len(embedded_chunks)
+            self._record_stored(failed_chunks, failed=True)
+            if embedded_chunks:
+                await upsert_queue.put((embedded_chunks, embeddings))
+
+    async def _upsert_worker(self, upsert_queue: asyncio.Queue):
+        """
+        Store embedded chunks in Qdrant without waiting for them to be applied (run flushes at the end).
+
+        Args:
+            upsert_queue: Queue of (chunks, embeddings) pairs to store
+        """
+        while (item := await upsert_queue.get()) is not _DONE:
+            chunks, embeddings = item
+
+            # Prepare payloads with chunk metadata
+            payloads = []
+            for chunk in chunks:
+                payload = chunk["metadata"].copy()
+                payload["text"] = chunk["text"]  # Include the text in the payload
+                payload["url"] = chunk["url"]  # Page key for delete_by_url
+                payload["chunk_id"] = chunk["chunk_id"]
+                payload["chunk_hash"] = chunk["chunk_hash"]
+                payloads.append(payload)
+
+            try:
+                await self._ensure_collection(len(embeddings[0]))
+                await self.qdrant_manager.store_vectors(embeddings, payloads, ids=[chunk["point_id"] for chunk in chunks],
+                                                        wait=False)
+            except Exception as e:
+                app_logger.error(f"Error storing {len(chunks)} vectors: {str(e)}")
+                self._record_stored(chunks, failed=True)
+                continue
+
+            self.stats["vectors_stored"] += len(chunks)
+            self._record_stored(chunks, failed=False)
+
+    async def _ensure_collection(self, vector_size: int):
+        """
+        Make sure the Qdrant collection exists, checking only once per run.
+
+        Args:
+            vector_size: Size of the embedding vectors
+        """
+        if self._collection_ready is None:
+            self._collection_ready = asyncio.ensure_future(
+                self.qdrant_manager.ensure_collection_exists(vector_size=vector_size)
+            )
+        try:
+            await asyncio.shield(self._collection_ready)
+        except Exception:
+            # Let the next batch try again
+            self._collection_ready = None
+            raise
+
+    def _record_stored(self, chunks: List[Dict], failed: bool):
+        """
+        Account for chunks that were stored or failed, finishing pages that are complete.
+
+        Args:
+            chunks: Chunks whose outcome is known
+            failed: Whether the chunks failed to embed or store
+        """
+        for chunk in chunks:
+            page = self._pages.get(chunk["url"])
+            if page is None:
+                app_logger.warning(f"Ignoring chunk of {chunk['url']}: the page is not being ingested")
+                continue
+            page["pending"] -= 1
+            if failed:
+                page["failed_hashes"].add(chunk["chunk_hash"])
+                self.stats["chunks_failed"] += 1
+            if page["pending"] == 0:
+                self._finish_page(chunk["url"])
+
+    def _finish_page(self, url: str):
+        """
+        Record a fully processed page in the manifest, and mark its other points as stale.
+
+        Args:
+            url: Page URL
+        """
+        page = self._pages.pop(url, None)
+        if page is None:
+            app_logger.warning(f"Cannot finish {url}: the page is not being ingested")
+            return
+        self.manifest.update_page(url, page["page_hash"], page["chunk_ids"], page["failed_hashes"])
+        self._stale_pages[url] = list(page["chunk_ids"].values())
+        self.stats["pages_ingested"] += 1
+
+        if self.on_progress:
+            self.on_progress(f"Ingested {self.stats['pages_ingested']} pages "
+                             f"({self.stats['vectors_stored']} vectors stored)")
@@ -3,16 +3,28 @@ Content Chunker Module for Physical AI Book Content
 
 This module handles splitting content into semantically coherent chunks for embedding.
 """
-from typing import List, Dict
+import re
+from typing import List, Dict, Optional, Tuple
 from ..utils.logger import app_logger
 from ..utils.config import Config
+from ..utils.tokenizer import get_token_counter
+
+# A sentence ending and the whitespace after it. Matching the punctuation (rather than
+# looking behind for it) lets the regex engine skip ahead to candidate characters.
+_SENTENCE_BOUNDARY_RE = re.compile(r'[.!?]\s+')
 
 
 class ContentChunker:
-    """Class to split content into semantically coherent chunks for embedding."""
+    """
+    Class to split content into semantically coherent chunks for embedding.
+
+    chunk_size and chunk_overlap are measured in whitespace words, or in tokens of
+    the configured tokenizer when CHUNK_SIZE_UNIT is "tokens".
+    """
 
     def __init__(self, config: Config):
         self.config = config
+        self.token_counter = get_token_counter(config) if config.chunk_size_unit == "tokens" else None
 
     def chunk_content(self, content: str, metadata: Dict = None) -> List[Dict]:
         """
@@ -36,6 +48,218 @@ class ContentChunker:
 
         return chunks
 
+    def chunk_sections(self, sections: List[Dict], metadata: Dict = None) -> List[Dict]:
+        """
+        Split heading sections into chunks that follow the page's heading hierarchy.
+
+        A heading's whole subtree becomes one chunk when it fits chunk_size; otherwise
+        it is split at the next heading level, and adjacent small sections are merged
+        back together while they fit. A single section larger than chunk_size is split
+        between sentences and code blocks, with overlap as in chunk_content. Code
+        blocks stay whole unless one block alone exceeds the budget, in which case it
+        is split between lines.
+
+        Every chunk starts with its heading path, which is also stored in its metadata;
+        merged sections keep their own headings inside the chunk text. Headings,
+        separators and paragraph breaks count towards chunk_size, and every
+        assembled chunk is measured, so no chunk exceeds chunk_size unless its
+        heading path alone does.
+
+        Args:
+            sections: Sections from TextExtractor.extract_sections (text blocks already cleaned)
+            metadata: Metadata associated with the page
+
+        Returns:
+            List of chunk dictionaries with text and metadata
+        """
+        if not sections:
+            return []
+
+        # Base units: sentences of text blocks and whole code blocks, with the block
+        # they came from and the separator used between units of the same block
+        section_units = []
+        for section in sections:
+            units = []
+            for block_index, block in enumerate(section["blocks"]):
+                if block["type"] == "code":
+                    units.append((block["text"], block_index, "\n"))
+                else:
+                    units.extend((sentence, block_index, " ") for sentence in self._split_into_sentences(block["text"]))
+            section_units.append(units)
+
+        # Measure every unit, heading and separator of the page in one call
+        heading_texts = sorted({heading for section in sections for heading in section["heading_path"]})
+        unit_texts = [text for units in section_units for text, _, _ in units]
+        lengths = self._measure(unit_texts + heading_texts + [" > ", "\n\n"])
+        heading_lengths = dict(zip(heading_texts, lengths[len(unit_texts):-2]))
+        separator_length, break_length = lengths[-2:]
+
+        section_lengths = []
+        content_lengths = []
+        offset = 0
+        for units in section_units:
+            unit_lengths = lengths[offset:offset + len(units)]
+            offset += len(units)
+            section_lengths.append(unit_lengths)
+            # Blocks are joined with paragraph breaks
+            block_breaks = sum(1 for index in range(1, len(units)) if units[index][1] != units[index - 1][1])
+            content_lengths.append(sum(unit_lengths) + block_breaks * break_length)
+
+        paths = [section["heading_path"] for section in sections]
+        grouping = _SectionGrouping(paths, content_lengths, heading_lengths, self.config.chunk_size,
+                                    separator_length, break_length)
+
+        chunks = []
+        for group in grouping.group(list(range(len(sections))), 0):
+            for chunk_group, prefix, text in self._group_chunks(group, grouping, section_units, section_lengths):
+                chunk_metadata = self._create_chunk_metadata(metadata, chunk_group[-1] + 1, len(sections))
+                chunk_metadata.update({
+                    "heading_path": prefix,
+                    "section_index": chunk_group[0],
+                    "section_count": len(chunk_group)
+                })
+                chunks.append({
+                    "text": text,
+                    "metadata": chunk_metadata,
+                    "chunk_id": f"chunk_{len(chunks)}"
+                })
+
+        return chunks
+
+    def _group_chunks(self, group: List[int], grouping: "_SectionGrouping", section_units: List[List[Tuple[str, int, str]]],
+                      section_lengths: List[List[int]], slack: int = 0) -> List[Tuple[List[int], List[str], str]]:
+        """
+        Build the chunk texts of a group of sections.
+
+        The assembled texts are measured; a chunk still over chunk_size (token counts
+        are not exactly additive) is rebuilt with a budget reduced by the overshoot,
+        and a merged group is then chunked section by section.
+
+        Args:
+            group: Indexes of consecutive sections
+            grouping: Section grouping of the page
+            section_units: (text, block index, separator) units of each section
+            section_lengths: Length of each unit of each section
+            slack: Length to leave unused below chunk_size
+
+        Returns:
+            List of (section indexes, heading path, chunk text) tuples, in order
+        """
+        chunk_size = self.config.chunk_size
+        prefix = grouping.common_prefix(group)
+        budget = None
+
+        if len(group) == 1 and (slack or grouping.cost(group) > chunk_size):
+            # Split an oversized section, leaving room for its heading path in every chunk
+            section_index = group[0]
+            budget = max(1, chunk_size - grouping.header_length(prefix) - slack)
+            units, unit_lengths = self._fit_units(section_units[section_index], section_lengths[section_index], budget)
+            bodies = [self._join_units(units[start:end])
+                      for start, end, _ in self._chunk_ranges(unit_lengths, budget, strict=True)]
+        elif slack:
+            return [item for section_index in group
+                    for item in self._group_chunks([section_index], grouping, section_units, section_lengths)]
+        else:
+            parts = []
+            for section_index in group:
+                body = self._join_units(section_units[section_index])
+                subheadings = grouping.paths[section_index][len(prefix):]
+                parts.append(f"{' > '.join(subheadings)}\n\n{body}" if subheadings else body)
+            bodies = ["\n\n".join(parts)]
+
+        heading = " > ".join(prefix)
+        texts = [f"{heading}\n\n{body}" if heading else body for body in bodies]
+
+        overshoot = max(self._measure(texts)) - chunk_size
+        if overshoot > 0 and (len(group) > 1 or budget is None or budget > 1):
+            return self._group_chunks(group, grouping, section_units, section_lengths, slack + overshoot)
+        return [(group, prefix, text) for text in texts]
+
+    @staticmethod
+    def _join_units(units: List[Tuple[str, int, str]]) -> str:
+        """
+        Join units back into text, separating blocks with blank lines.
+
+        Args:
+            units: (text, block index, separator) tuples
+
+        Returns:
+            Joined text
+        """
+        parts = []
+        for index, (text, block_index, separator) in enumerate(units):
+            if index:
+                parts.append(separator if block_index == units[index - 1][1] else "\n\n")
+            parts.append(text)
+        return "".join(parts)
+
+    def _fit_units(self, units: List[Tuple[str, int, str]], unit_lengths: List[int],
+                   budget: int) -> Tuple[List[Tuple[str, int, str]], List[int]]:
+        """
+        Split units longer than the budget into pieces that fit.
+
+        Code is split between lines and text between words; in token mode, a single
+        line or word that is still too long is split by tokens.
+
+        Args:
+            units: (text, block index, separator) tuples
+            unit_lengths: Length of each unit
+            budget: Maximum length per unit
+
+        Returns:
+            Tuple of (units, lengths) with oversized units replaced by their pieces
+        """
+        if all(length <= budget for length in unit_lengths):
+            return units, unit_lengths
+
+        fitted_units = []
+        fitted_lengths = []
+        for unit, length in zip(units, unit_lengths):
+            if length <= budget:
+                fitted_units.append(unit)
+                fitted_lengths.append(length)
+                continue
+
+            text, block_index, separator = unit
+            parts = text.split(separator)
+            part_lengths = self._measure(parts)
+
+            pieces = []
+            current_parts = []
+            current_length = 0
+            for part, part_length in zip(parts, part_lengths):
+                if current_parts and current_length + part_length > budget:
+                    pieces.append(separator.join(current_parts))
+                    current_parts = []
+                    current_length = 0
+                if part_length > budget and self.token_counter is not None:
+                    pieces.extend(self.token_counter.split_text(part, budget))
+                    continue
+                current_parts.append(part)
+                current_length += part_length
+            if current_parts:
+                pieces.append(separator.join(current_parts))
+
+            pieces = [piece for piece in pieces if piece.strip()]
+            fitted_units.extend((piece, block_index, separator) for piece in pieces)
+            fitted_lengths.extend(self._measure(pieces))
+
+        return fitted_units, fitted_lengths
+
+    def _measure(self, texts: List[str]) -> List[int]:
+        """
+        Measure texts in the configured chunk size unit.
+
+        Args:
+            texts: Texts to measure
+
+        Returns:
+            Number of words (or tokens) in each text
+        """
+        if self.token_counter is not None:
+            return self.token_counter.count_tokens(texts)
+        return [len(text.split()) for text in texts]
+
     def _split_into_sentences(self, content: str) -> List[str]:
         """
         Split content into sentences while preserving paragraph structure.
@@ -46,18 +270,17 @@ class ContentChunker:
         Returns:
             List of sentences or paragraph segments
         """
-        # Split by common sentence endings first
-        import re
-        sentences = re.split(r'(?<=[.!?])\s+', content)
+        # Split after common sentence endings followed by whitespace
+        segments = []
+        segment_start = 0
+        for boundary in _SENTENCE_BOUNDARY_RE.finditer(content):
+            segments.append(content[segment_start:boundary.start() + 1])
+            segment_start = boundary.end()
+        segments.append(content[segment_start:])
 
         # Clean up the sentences
-        cleaned_sentences = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if sentence:
-                cleaned_sentences.append(sentence)
-
-        return cleaned_sentences
+        sentences = (segment.strip() for segment in segments)
+        return [sentence for sentence in sentences if sentence]
 
     def _create_chunks(self, sentences: List[str], metadata: Dict) -> List[Dict]:
         """
@@ -70,82 +293,120 @@ class ContentChunker:
         Returns:
             List of chunk dictionaries
         """
-        chunks = []
-        current_chunk = ""
-        current_length = 0
-        sentence_idx = 0
-
-        while sentence_idx < len(sentences):
-            sentence = sentences[sentence_idx]
-            sentence_length = len(sentence.split())
-
-            # Check if adding this sentence would exceed the chunk size
-            if current_length + sentence_length <= self.config.chunk_size or current_chunk == "":
-                # Add sentence to current chunk
-                if current_chunk:
-                    current_chunk += " " + sentence
-                else:
-                    current_chunk = sentence
-                current_length += sentence_length
-                sentence_idx += 1
-            else:
-                # Create a chunk with the current content
-                chunk_metadata = self._create_chunk_metadata(metadata, sentence_idx, len(sentences))
-                chunks.append({
-                    "text": current_chunk,
-                    "metadata": chunk_metadata,
-                    "chunk_id": f"chunk_{len(chunks)}"
-                })
-
-                # Start a new chunk with overlap if possible
-                if self.config.chunk_overlap > 0 and sentence_idx > 0:
-                    # Create overlap by going back and including some previous sentences
-                    overlap_sentences = self._get_overlap_sentences(sentences, sentence_idx)
-                    current_chunk = " ".join(overlap_sentences) + " " + sentence
-                    current_length = len(current_chunk.split())
-                    sentence_idx += 1
-                else:
-                    current_chunk = sentence
-                    current_length = sentence_length
-                    sentence_idx += 1
+        sentences, sentence_lengths = self._measure_sentences(sentences)
 
-        # Add the final chunk if it has content
-        if current_chunk:
-            chunk_metadata = self._create_chunk_metadata(metadata, sentence_idx, len(sentences))
+        chunks = []
+        for start, end, padded in self._chunk_ranges(sentence_lengths):
+            text = " ".join(sentences[start:end])
             chunks.append({
-                "text": current_chunk,
-                "metadata": chunk_metadata,
+                # A chunk started with an empty overlap keeps the separator of the overlap join
+                "text": " " + text if padded else text,
+                "metadata": self._create_chunk_metadata(metadata, end, len(sentences)),
                 "chunk_id": f"chunk_{len(chunks)}"
             })
 
         return chunks
 
-    def _get_overlap_sentences(self, sentences: List[str], current_idx: int) -> List[str]:
+    def _measure_sentences(self, sentences: List[str]) -> Tuple[List[str], List[int]]:
         """
-        Get sentences for overlap from previous content.
+        Measure each sentence in the configured chunk size unit.
+
+        In token mode, sentences longer than chunk_size tokens are split so every
+        chunk fits the budget.
 
         Args:
-            sentences: List of all sentences
-            current_idx: Current sentence index
+            sentences: List of sentences
 
         Returns:
-            List of sentences for overlap
+            Tuple of (sentences, number of words or tokens in each sentence)
         """
-        overlap_sentences = []
-        words_count = 0
+        # One batched tokenizer call per document
+        lengths = self._measure(sentences)
+        if self.token_counter is None or all(length <= self.config.chunk_size for length in lengths):
+            return sentences, lengths
+
+        fitted_sentences = []
+        for sentence, length in zip(sentences, lengths):
+            if length <= self.config.chunk_size:
+                fitted_sentences.append(sentence)
+            else:
+                fitted_sentences.extend(self.token_counter.split_text(sentence, self.config.chunk_size))
+        return fitted_sentences, self.token_counter.count_tokens(fitted_sentences)
 
-        # Go backwards from the current index to get overlap
-        for i in range(current_idx - 1, max(-1, current_idx - 5), -1):  # Look at most 5 sentences back
-            sentence = sentences[i]
-            sentence_words = len(sentence.split())
+    def _chunk_ranges(self, sentence_lengths: List[int], chunk_size: int = None,
+                      strict: bool = False) -> List[Tuple[int, int, bool]]:
+        """
+        Compute chunk boundaries as sentence index ranges.
+
+        Sentences are added to a chunk while it stays within chunk_size; a sentence
+        is always added to an empty chunk. Each new chunk starts with up to
+        chunk_overlap of the preceding sentences (at most 4 sentences). Chunk sizes
+        come from a prefix sum of sentence lengths, so this is linear in the number
+        of sentences.
+
+        Args:
+            sentence_lengths: Number of words (or tokens) in each sentence
+            chunk_size: Maximum chunk length (the configured chunk_size if None)
+            strict: Shorten the overlap so that it and the sentence starting a chunk
+                fit in chunk_size together
 
-            if words_count + sentence_words <= self.config.chunk_overlap:
-                overlap_sentences.insert(0, sentence)  # Insert at the beginning to maintain order
-                words_count += sentence_words
+        Returns:
+            List of (start, end, padded) tuples, where padded marks chunks started
+            with an empty overlap
+        """
+        if chunk_size is None:
+            chunk_size = self.config.chunk_size
+
+        prefix_lengths = [0]
+        for length in sentence_lengths:
+            prefix_lengths.append(prefix_lengths[-1] + length)
+
+        ranges = []
+        start = 0
+        padded = False
+        for sentence_idx in range(1, len(sentence_lengths)):
+            if prefix_lengths[sentence_idx + 1] - prefix_lengths[start] <= chunk_size:
+                continue
+
+            # Close the current chunk and start a new one with this sentence
+            ranges.append((start, sentence_idx, padded))
+            if self.config.chunk_overlap > 0:
+                start = self._overlap_start(sentence_lengths, sentence_idx)
+                while strict and start < sentence_idx and \
+                        prefix_lengths[sentence_idx + 1] - prefix_lengths[start] > chunk_size:
+                    start += 1
+                padded = start == sentence_idx
             else:
+                start = sentence_idx
+                padded = False
+
+        if sentence_lengths:
+            ranges.append((start, len(sentence_lengths), padded))
+
+        return ranges
+
+    def _overlap_start(self, sentence_lengths: List[int], current_idx: int) -> int:
+        """
+        Get the first sentence of the overlap carried into a new chunk.
+
+        Args:
+            sentence_lengths: Number of words (or tokens) in each sentence
+            current_idx: Index of the sentence starting the new chunk
+
+        Returns:
+            Index of the first overlap sentence (current_idx if there is no overlap)
+        """
+        overlap_start = current_idx
+        overlap_length = 0
+
+        # Go backwards from the current index to get overlap
+        for i in range(current_idx - 1, max(-1, current_idx - 5), -1):  # Look at most 5 sentences back
+            if overlap_length + sentence_lengths[i] > self.config.chunk_overlap:
                 break
+            overlap_length += sentence_lengths[i]
+            overlap_start = i
 
-        return overlap_sentences
+        return overlap_start
 
     def _create_chunk_metadata(self, original_metadata: Dict, position: int, total: int) -> Dict:
         """
@@ -166,7 +427,94 @@ class ContentChunker:
             "chunk_position": position,
             "total_content_segments": total,
             "chunk_size_config": self.config.chunk_size,
-            "chunk_overlap_config": self.config.chunk_overlap
+            "chunk_overlap_config": self.config.chunk_overlap,
+            "chunk_size_unit": self.config.chunk_size_unit
         })
 
-        return chunk_metadata
\ No newline at end of file
+        return chunk_metadata
+
+
+class _SectionGrouping:
+    """Groups consecutive sections into chunk-sized runs along the heading hierarchy."""
+
+    def __init__(self, paths: List[List[str]], content_lengths: List[int], heading_lengths: Dict[str, int],
+                 chunk_size: int, separator_length: int = 0, break_length: int = 0):
+        self.paths = paths
+        self.content_lengths = content_lengths
+        self.heading_lengths = heading_lengths
+        self.chunk_size = chunk_size
+        self.separator_length = separator_length
+        self.break_length = break_length
+
+    def path_length(self, path: List[str]) -> int:
+        """Length of a heading path written out in a chunk, with its " > " separators."""
+        if not path:
+            return 0
+        return sum(self.heading_lengths[heading] for heading in path) + self.separator_length * (len(path) - 1)
+
+    def header_length(self, path: List[str]) -> int:
+        """Length of a heading path line and the paragraph break after it, if there is a path."""
+        return self.path_length(path) + self.break_length if path else 0
+
+    def common_prefix(self, group: List[int]) -> List[str]:
+        """Longest heading path shared by every section of a group."""
+        prefix = self.paths[group[0]]
+        for index in group[1:]:
+            path = self.paths[index]
+            size = 0
+            while size < min(len(prefix), len(path)) and prefix[size] == path[size]:
+                size += 1
+            prefix = prefix[:size]
+        return prefix
+
+    def cost(self, group: List[int]) -> int:
+        """Length of the chunk a group of sections would produce."""
+        prefix = self.common_prefix(group)
+        return self.header_length(prefix) + self.break_length * (len(group) - 1) + sum(
+            self.content_lengths[index] + self.header_length(self.paths[index][len(prefix):]) for index in group
+        )
+
+    def group(self, indexes: List[int], depth: int) -> List[List[int]]:
+        """
+        Group sections sharing the first `depth` headings of their paths.
+
+        Args:
+            indexes: Consecutive section indexes
+            depth: Number of leading headings the sections share
+
+        Returns:
+            List of groups of section indexes, in order
+        """
+        if len(indexes) == 1 or self.cost(indexes) <= self.chunk_size:
+            return [indexes]
+
+        # Split into runs by the heading one level down; a parent's own content is its own run
+        groups = []
+        run = [indexes[0]]
+        for index in indexes[1:]:
+            if self._child_heading(index, depth) == self._child_heading(run[-1], depth):
+                run.append(index)
+            else:
+                groups.extend(self._group_run(run, depth))
+                run = [index]
+        groups.extend(self._group_run(run, depth))
+
+        # Merge adjacent groups back together while they fit
+        merged = [groups[0]]
+        for group in groups[1:]:
+            if self.cost(merged[-1] + group) <= self.chunk_size:
+                merged[-1] = merged[-1] + group
+            else:
+                merged.append(group)
+        return merged
+
+    def _child_heading(self, index: int, depth: int) -> Optional[str]:
+        """Heading of a section at the given depth, or None for the parent's own content."""
+        path = self.paths[index]
+        return path[depth] if len(path) > depth else None
+
+    def _group_run(self, run: List[int], depth: int) -> List[List[int]]:
+        """Group a run of sections sharing the heading at the given depth."""
+        if self._child_heading(run[0], depth) is None:
+            return [[index] for index in run]
+        return self.group(run, depth + 1)
@@ -4,17 +4,116 @@ Content Cleaner Module for Physical AI Book Content
 This module handles cleaning and normalizing extracted text content.
 """
 import re
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
 from ..utils.logger import app_logger
 from ..utils.config import Config
 
+# Common patterns found in documentation sites that aren't meaningful content
+DEFAULT_BOILERPLATE_PATTERNS = [
+    r'Last updated.*',  # Last updated timestamps
+    r'Edit this page.*',  # Edit links
+    r'Was this page helpful\?.*',  # Feedback prompts
+    r'Found an issue\?.*',  # Issue reporting links
+    r'\s+\d+\s+stars\s+\d+\s+forks',  # GitHub stats
+    r'©\s+\d{4}.*',  # Copyright notices
+    r'Did you know we.*',  # Promotional content
+    r'Learn more about.*',  # Call-to-action phrases
+    r'Get started with.*',  # CTA phrases
+]
+
+# Case-folded text every match of a default pattern contains, so a pattern can be
+# skipped with a substring check when its text is absent. Other patterns always run.
+DEFAULT_BOILERPLATE_LITERALS = {
+    r'Last updated.*': 'last updated',
+    r'Edit this page.*': 'edit this page',
+    r'Was this page helpful\?.*': 'was this page helpful?',
+    r'Found an issue\?.*': 'found an issue?',
+    r'\s+\d+\s+stars\s+\d+\s+forks': 'stars',
+    r'©\s+\d{4}.*': '©',
+    r'Did you know we.*': 'did you know we',
+    r'Learn more about.*': 'learn more about',
+    r'Get started with.*': 'get started with',
+}
+
+# Characters that might interfere with embeddings; standard punctuation and basic symbols
+# are kept. Spaces and ASCII word characters come first so the common case exits early.
+_SPECIAL_CHARACTERS_RE = re.compile(r'[^ a-zA-Z0-9_\w\s\-\.\!\?\;\:\,\(\)\[\]\{\}\'\"\/\n]')
+
+# Whitespace around a line break, including blank lines
+_LINE_BREAK_RE = re.compile(r'\s*\n\s*')
+
+
+@lru_cache(maxsize=64)
+def compile_boilerplate(patterns: Tuple[str, ...]) -> Optional[Pattern]:
+    """
+    Combine boilerplate patterns into one case-insensitive alternation.
+
+    Patterns must not use numbered backreferences, since their groups are renumbered
+    in the alternation.
+
+    Args:
+        patterns: Boilerplate regular expressions
+
+    Returns:
+        Compiled pattern, or None if there are no patterns
+
+    Raises:
+        ValueError: If a pattern is not a valid regular expression
+    """
+    for pattern in patterns:
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"Invalid boilerplate pattern {pattern!r}: {str(e)}")
+
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+
+
+def load_boilerplate_patterns(path: str) -> List[str]:
+    """
+    Load boilerplate patterns from a file with one regular expression per line.
+
+    Blank lines and lines starting with '#' are ignored.
+
+    Args:
+        path: Path to the patterns file
+
+    Returns:
+        List of patterns
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
 
 class ContentCleaner:
-    """Class to clean and normalize extracted text content."""
+    """
+    Class to clean and normalize extracted text content.
+
+    Boilerplate rules are DEFAULT_BOILERPLATE_PATTERNS (unless CLEANER_DEFAULT_BOILERPLATE
+    is disabled), plus the patterns in BOILERPLATE_PATTERNS_FILE, plus any passed in.
+    """
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, boilerplate_patterns: Optional[Sequence[str]] = None):
         self.config = config
 
+        patterns = list(DEFAULT_BOILERPLATE_PATTERNS) if config.cleaner_default_boilerplate else []
+        if config.boilerplate_patterns_file:
+            patterns.extend(load_boilerplate_patterns(config.boilerplate_patterns_file))
+        if boilerplate_patterns:
+            patterns.extend(boilerplate_patterns)
+
+        self.boilerplate_patterns = patterns
+        self._boilerplate_rules = [(DEFAULT_BOILERPLATE_LITERALS.get(pattern, ""), pattern)
+                                  for pattern in patterns]
+        self._has_literal_rules = any(literal for literal, _ in self._boilerplate_rules)
+
+        # Validate the full rule set up front
+        compile_boilerplate(tuple(patterns))
+        app_logger.debug(f"Content cleaner using {len(patterns)} boilerplate patterns")
+
     def clean_content(self, content: str, metadata: Dict = None) -> str:
         """
         Clean and normalize text content.
@@ -29,12 +128,9 @@ class ContentCleaner:
         if not content:
             return ""
 
-        # Remove extra whitespace
+        # Collapse whitespace and remove special characters
         content = self._normalize_whitespace(content)
 
-        # Remove special characters and normalize
-        content = self._remove_special_characters(content)
-
         # Remove boilerplate content specific to documentation sites
         content = self._remove_boilerplate(content)
 
@@ -45,95 +141,61 @@ class ContentCleaner:
 
     def _normalize_whitespace(self, content: str) -> str:
         """
-        Normalize whitespace in content.
+        Collapse whitespace runs to single spaces and replace special characters with spaces.
 
         Args:
             content: Text content to normalize
 
         Returns:
-            Content with normalized whitespace
-        """
-        # Replace multiple spaces with single space
-        content = re.sub(r'\s+', ' ', content)
-
-        # Handle newlines - preserve paragraph breaks but normalize others
-        content = re.sub(r'\n\s*\n', '\n\n', content)
-
-        return content.strip()
-
-    def _remove_special_characters(self, content: str) -> str:
+            Content with normalized whitespace and special characters removed
         """
-        Remove special characters and normalize text.
+        # str.split() splits on the same characters as \s and drops empty parts
+        content = ' '.join(content.split())
 
-        Args:
-            content: Text content to process
-
-        Returns:
-            Content with special characters removed or normalized
-        """
         # Remove or replace special characters that might interfere with embeddings
-        # Keep standard punctuation and basic symbols
-        content = re.sub(r'[^\w\s\-\.\!\?\;\:\,\(\)\[\]\{\}\'\"\/\n]', ' ', content)
+        content = _SPECIAL_CHARACTERS_RE.sub(' ', content)
 
         # Normalize quotes
-        content = content.replace("''", '"').replace("``", '"')
-
-        return content
+        return content.replace("''", '"')
 
     def _remove_boilerplate(self, content: str) -> str:
         """
         Remove common boilerplate content from documentation sites.
 
+        All rules run as one alternation, leaving out default rules whose literal
+        from DEFAULT_BOILERPLATE_LITERALS does not occur in the content.
+
         Args:
             content: Text content to process
 
         Returns:
             Content with boilerplate removed
         """
-        # Common patterns found in documentation sites that aren't meaningful content
-        boilerplate_patterns = [
-            r'Last updated.*',  # Last updated timestamps
-            r'Edit this page.*',  # Edit links
-            r'Was this page helpful\?.*',  # Feedback prompts
-            r'Found an issue\?.*',  # Issue reporting links
-            r'\s+\d+\s+stars\s+\d+\s+forks',  # GitHub stats
-            r'©\s+\d{4}.*',  # Copyright notices
-            r'Did you know we.*',  # Promotional content
-            r'Learn more about.*',  # Call-to-action phrases
-            r'Get started with.*',  # CTA phrases
-        ]
-
-        for pattern in boilerplate_patterns:
-            content = re.sub(pattern, '', content, flags=re.IGNORECASE)
+        folded = content.casefold() if self._has_literal_rules else ""
+        patterns = tuple(pattern for literal, pattern in self._boilerplate_rules if not literal or literal in folded)
 
-        return content.strip()
+        boilerplate_re = compile_boilerplate(patterns)
+        if boilerplate_re is None:
+            return content.strip()
+        return boilerplate_re.sub('', content).strip()
 
     def _normalize_paragraphs(self, content: str) -> str:
         """
         Normalize paragraph breaks in content.
 
+        Lines are stripped and runs of blank lines collapse to a single paragraph break.
+
         Args:
             content: Text content to normalize
 
         Returns:
             Content with normalized paragraphs
         """
-        # Ensure proper paragraph separation
-        content = re.sub(r'\n\s*\n', '\n\n', content)
-
-        # Remove extra empty lines
-        lines = content.split('\n')
-        normalized_lines = []
-        prev_line_empty = False
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                if not prev_line_empty:
-                    normalized_lines.append('')
-                    prev_line_empty = True
-            else:
-                normalized_lines.append(line)
-                prev_line_empty = False
-
-        return '\n'.join(normalized_lines).strip()
\ No newline at end of file
+        if '\n' not in content:
+            return content.strip()
+        return _LINE_BREAK_RE.sub(self._line_break, content).strip()
+
+    @staticmethod
+    def _line_break(match) -> str:
+        """Replace a line break with a paragraph break if it spans a blank line."""
+        return '\n\n' if match.group().count('\n') > 1 else '\n'
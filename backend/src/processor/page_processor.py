@@ -0,0 +1,193 @@
+"""
+Page Processor Module for Physical AI Book Content
+
+This module runs the CPU-bound page processing steps (extract, clean, chunk) in a
+pool of worker processes, so parsing does not block the event loop and scales
+across cores.
+"""
+import asyncio
+import hashlib
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+from ..utils.logger import app_logger
+from ..utils.config import Config
+from .text_extractor import TextExtractor
+from .cleaner import ContentCleaner
+from .chunker import ContentChunker
+
+# Processing components of the current worker process, built once by init_worker
+_components: Optional[Dict] = None
+
+
+def init_worker(config: Config):
+    """
+    Build the processing components for the current process.
+
+    Used as the process pool initializer, so each worker builds its components once
+    instead of once per page.
+
+    Args:
+        config: Configuration object
+    """
+    global _components
+    _components = {
+        "chunking_strategy": config.chunking_strategy,
+        "extractor": TextExtractor(config),
+        "cleaner": ContentCleaner(config),
+        "chunker": ContentChunker(config)
+    }
+
+
+def process_page(url: str, html_content: str, known_page_hash: Optional[str] = None) -> Dict:
+    """
+    Extract, clean and chunk one page.
+
+    With CHUNKING_STRATEGY=sections the page is chunked by heading sections;
+    otherwise the flattened page text is chunked by sentences. Runs in a worker
+    process; arguments and the result are plain picklable values.
+
+    Args:
+        url: Page URL
+        html_content: Page HTML
+        known_page_hash: Page hash from the last ingestion; chunking is skipped if it still matches
+
+    Returns:
+        Dictionary with "url", "page_hash" and "chunks" (None if the page is unchanged)
+    """
+    if _components["chunking_strategy"] == "sections":
+        document = _components["extractor"].extract_sections(html_content, url)
+    else:
+        document = _components["extractor"].extract_text(html_content, url)
+    return process_document(url, document, known_page_hash)
+
+
+def process_document(url: str, document: Dict, known_page_hash: Optional[str] = None) -> Dict:
+    """
+    Clean and chunk one already extracted page.
+
+    Args:
+        url: Page URL
+        document: Extraction result with "metadata" and "text" (sentences strategy) or
+            "sections" (sections strategy), as from TextExtractor or DocsLoader
+        known_page_hash: Page hash from the last ingestion; chunking is skipped if it still matches
+
+    Returns:
+        Dictionary with "url", "page_hash" and "chunks" (None if the page is unchanged)
+    """
+    if _components["chunking_strategy"] == "sections":
+        return _process_sections(url, document, known_page_hash)
+
+    cleaned_content = _components["cleaner"].clean_content(document["text"], document["metadata"])
+
+    page_hash = hashlib.sha256(cleaned_content.encode('utf-8')).hexdigest()
+    if page_hash == known_page_hash:
+        return {"url": url, "page_hash": page_hash, "chunks": None}
+
+    chunks = _components["chunker"].chunk_content(cleaned_content, document["metadata"])
+    return {"url": url, "page_hash": page_hash, "chunks": chunks}
+
+
+def _process_sections(url: str, document: Dict, known_page_hash: Optional[str]) -> Dict:
+    """
+    Clean and chunk one page by heading sections.
+
+    Text blocks go through the cleaner; code blocks are kept verbatim.
+
+    Args:
+        url: Page URL
+        document: Extraction result with "sections" and "metadata"
+        known_page_hash: Page hash from the last ingestion; chunking is skipped if it still matches
+
+    Returns:
+        Dictionary with "url", "page_hash" and "chunks" (None if the page is unchanged)
+    """
+    metadata = document["metadata"]
+
+    sections = []
+    for section in document["sections"]:
+        blocks = []
+        for block in section["blocks"]:
+            if block["type"] == "text":
+                block = {"type": "text", "text": _components["cleaner"].clean_content(block["text"], metadata)}
+            if block["text"]:
+                blocks.append(block)
+        if blocks:
+            sections.append({"heading_path": section["heading_path"], "blocks": blocks})
+
+    # Hash the headings and block contents, so structural changes also count as changes
+    page_hash = hashlib.sha256(json.dumps(sections, sort_keys=True).encode('utf-8')).hexdigest()
+    if page_hash == known_page_hash:
+        return {"url": url, "page_hash": page_hash, "chunks": None}
+
+    chunks = _components["chunker"].chunk_sections(sections, metadata)
+    return {"url": url, "page_hash": page_hash, "chunks": chunks}
+
+
+class PageProcessor:
+    """
+    Class to run process_page in a process pool.
+
+    The pool has PROCESS_POOL_WORKERS processes (CPU count by default, at least one).
+    With PROCESS_POOL_WORKERS=0, pages are processed in the calling process instead.
+    """
+
+    def __init__(self, config: Config, max_workers: Optional[int] = None):
+        self.config = config
+        self.max_workers = config.process_pool_workers if max_workers is None else max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        if self.max_workers > 0:
+            # Spawned workers do not inherit the event loop, threads or open connections
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+                initargs=(config,)
+            )
+            app_logger.info(f"Started page processing pool with {self.max_workers} processes")
+        else:
+            init_worker(config)
+
+    async def process(self, url: str, html_content: str, known_page_hash: Optional[str] = None) -> Dict:
+        """
+        Extract, clean and chunk a page without blocking the event loop.
+
+        Args:
+            url: Page URL
+            html_content: Page HTML
+            known_page_hash: Page hash from the last ingestion; chunking is skipped if it still matches
+
+        Returns:
+            Result of process_page
+        """
+        if self._executor is None:
+            return process_page(url, html_content, known_page_hash)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, process_page, url, html_content, known_page_hash)
+
+    async def process_document(self, url: str, document: Dict, known_page_hash: Optional[str] = None) -> Dict:
+        """
+        Clean and chunk an already extracted page without blocking the event loop.
+
+        Args:
+            url: Page URL
+            document: Extraction result, as from TextExtractor or DocsLoader
+            known_page_hash: Page hash from the last ingestion; chunking is skipped if it still matches
+
+        Returns:
+            Result of process_document
+        """
+        if self._executor is None:
+            return process_document(url, document, known_page_hash)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, process_document, url, document, known_page_hash)
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -4,16 +4,151 @@ Text Extractor Module for Physical AI Book Content
 This module handles extracting meaningful text content from HTML pages.
 """
 from typing import Dict, List, Tuple
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString
 from ..utils.logger import app_logger
 from ..utils.config import Config
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    import lxml  # noqa: F401  (enables BeautifulSoup's lxml tree builder)
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Selectors tried in order to find the main content, for Docusaurus and similar documentation sites
+MAIN_CONTENT_SELECTORS = [
+    '[role="main"]',
+    '.main-wrapper',
+    '.container',
+    '.main-content',
+    '.content',
+    '.docs-content',
+    '.theme-doc-markdown',
+    'main',
+    '.article',
+    '.post-content',
+    'body'
+]
+
+HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
+# Elements whose content forms its own text block when splitting a page into sections
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'details', 'div', 'dl', 'dt', 'figcaption',
+    'figure', 'footer', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'section', 'summary',
+    'table', 'td', 'th', 'tr', 'ul'
+}
+
+# Navigation and UI elements left out of sections (sidebar, breadcrumbs, pagination, copy buttons)
+SECTION_SKIP_TAGS = {'aside', 'button', 'footer', 'nav'}
+
+# Class names of Docusaurus table-of-contents containers, also left out of sections
+SECTION_SKIP_CLASSES = ('table-of-contents', 'theme-doc-toc')
+
+# Joins selectolax text nodes so empty ones can be dropped, like BeautifulSoup's get_text(strip=True)
+_TEXT_NODE_SEPARATOR = "\x00"
+
+
+class SectionBuilder:
+    """
+    Collects heading sections and their text and code blocks while a page is walked.
+
+    Shared by every source of sections (the HTML walkers here and the Markdown docs
+    loader), so they all produce the same section structure.
+    """
+
+    def __init__(self):
+        self.sections: List[Dict] = [{"heading_path": [], "blocks": []}]
+        self._heading_stack: List[Tuple[int, str]] = []
+        self._text_parts: List[str] = []
+
+    def add_text(self, text: str):
+        """Add inline text to the current text block."""
+        self._text_parts.append(text)
+
+    def end_block(self):
+        """Close the current text block, if it has any text."""
+        if self._text_parts:
+            text = " ".join(" ".join(self._text_parts).split())
+            self._text_parts = []
+            if text:
+                self.sections[-1]["blocks"].append({"type": "text", "text": text})
+
+    def add_heading(self, level: int, text: str):
+        """Start a new section under a heading."""
+        self.end_block()
+        # Docusaurus puts a zero-width space in each heading's anchor link
+        text = " ".join(text.replace("\u200b", "").split())
+        while self._heading_stack and self._heading_stack[-1][0] >= level:
+            self._heading_stack.pop()
+        self._heading_stack.append((level, text))
+        self.sections.append({"heading_path": [heading for _, heading in self._heading_stack], "blocks": []})
+
+    def add_code(self, code: str):
+        """Add a code block, keeping its line breaks and indentation."""
+        self.end_block()
+        code = code.strip("\n").rstrip()
+        if code.strip():
+            self.sections[-1]["blocks"].append({"type": "code", "text": code})
+
+    def build(self) -> List[Dict]:
+        """
+        Finish the walk.
+
+        Returns:
+            Sections that have at least one block
+        """
+        self.end_block()
+        return [section for section in self.sections if section["blocks"]]
+
+
+def _is_skipped_class(class_names: str) -> bool:
+    """Check whether an element's class attribute marks it as left out of sections."""
+    return any(name in class_names for name in SECTION_SKIP_CLASSES)
+
+
+def _sections_text(sections: List[Dict]) -> str:
+    """Join the blocks of all sections into one text."""
+    return "\n\n".join(block["text"] for section in sections for block in section["blocks"])
+
 
 class TextExtractor:
-    """Class to extract meaningful text content from HTML pages."""
+    """
+    Class to extract meaningful text content from HTML pages.
+
+    The HTML parser is chosen with HTML_PARSER: "selectolax" (Lexbor, fastest), "lxml"
+    or "html.parser" (BeautifulSoup tree builders), or "auto" for the fastest one installed.
+    """
 
     def __init__(self, config: Config):
         self.config = config
+        self.parser = self._resolve_parser(config.html_parser)
+        self.include_html_structure = config.extract_html_structure
+
+    @staticmethod
+    def _resolve_parser(parser: str) -> str:
+        """
+        Pick the HTML parser backend to use.
+
+        Args:
+            parser: Requested parser ("auto", "selectolax", "lxml" or "html.parser")
+
+        Returns:
+            Name of an installed parser backend
+        """
+        available = {"selectolax": SELECTOLAX_AVAILABLE, "lxml": LXML_AVAILABLE, "html.parser": True}
+        if parser == "auto":
+            return next(name for name, installed in available.items() if installed)
+
+        if not available.get(parser, False):
+            app_logger.warning(f"HTML parser '{parser}' is not installed, falling back to html.parser")
+            return "html.parser"
+        return parser
 
     def extract_text(self, html_content: str, url: str = "") -> Dict:
         """
@@ -24,9 +159,13 @@ class TextExtractor:
             url: Source URL for metadata
 
         Returns:
-            Dictionary containing extracted text and metadata
+            Dictionary containing extracted text and metadata, plus the main content's
+            HTML as "html_structure" when EXTRACT_HTML_STRUCTURE is enabled
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if self.parser == "selectolax":
+            return self._extract_with_selectolax(html_content, url)
+
+        soup = BeautifulSoup(html_content, self.parser)
 
         # Remove script and style elements
         for script in soup(["script", "style"]):
@@ -39,26 +178,247 @@ class TextExtractor:
         # Extract main content - focus on content areas typical in Docusaurus sites
         main_content = self._extract_main_content(soup)
 
-        # Extract headings hierarchy
-        headings = self._extract_headings(soup)
-
         # Get text content
         text_content = main_content.get_text(separator=' ', strip=True)
 
-        # Extract metadata
-        metadata = {
+        result = {
+            "text": text_content,
+            "metadata": self._build_metadata(url, title, self._extract_headings(soup), text_content,
+                                             self._determine_content_type(url, soup))
+        }
+        if self.include_html_structure:
+            result["html_structure"] = str(main_content)
+        return result
+
+    def extract_main_text(self, html_content: str) -> str:
+        """
+        Extract only the text of the main content area.
+
+        Args:
+            html_content: HTML content to extract text from
+
+        Returns:
+            Main content text
+        """
+        if self.parser == "selectolax":
+            tree = LexborHTMLParser(html_content)
+            tree.strip_tags(["script", "style"])
+            return self._selectolax_text(self._select_main_node(tree))
+
+        soup = BeautifulSoup(html_content, self.parser)
+        for script in soup(["script", "style"]):
+            script.decompose()
+        return self._extract_main_content(soup).get_text(separator=' ', strip=True)
+
+    def extract_sections(self, html_content: str, url: str = "") -> Dict:
+        """
+        Extract the main content as a list of heading sections.
+
+        Walks the main content once. Each heading starts a new section; text is
+        grouped into blocks at block-level elements, and <pre> elements become code
+        blocks with their line breaks kept.
+
+        Args:
+            html_content: HTML content to extract sections from
+            url: Source URL for metadata
+
+        Returns:
+            Dictionary with "sections" (each with "heading_path" and "blocks" of
+            {"type": "text" | "code", "text"}), "text" (all blocks joined) and "metadata"
+        """
+        builder = SectionBuilder()
+
+        if self.parser == "selectolax":
+            tree = LexborHTMLParser(html_content)
+            tree.strip_tags(["script", "style"])
+            main_node = self._select_main_node(tree)
+            if main_node is not None:
+                self._walk_selectolax(main_node, builder)
+            sections = builder.build()
+            text_content = _sections_text(sections)
+            metadata = self._selectolax_metadata(tree, url, text_content)
+        else:
+            soup = BeautifulSoup(html_content, self.parser)
+            for script in soup(["script", "style"]):
+                script.decompose()
+            title_tag = soup.find('title')
+            self._walk_soup(self._extract_main_content(soup), builder)
+            sections = builder.build()
+            text_content = _sections_text(sections)
+            metadata = self._build_metadata(url, title_tag.get_text().strip() if title_tag else "",
+                                            self._extract_headings(soup), text_content,
+                                            self._determine_content_type(url, soup))
+
+        return {
+            "sections": sections,
+            "text": text_content,
+            "metadata": metadata
+        }
+
+    def _walk_soup(self, node, builder: "SectionBuilder"):
+        """
+        Feed the content of a BeautifulSoup node to a section builder, in document order.
+
+        Args:
+            node: BeautifulSoup tag
+            builder: Section builder collecting the output
+        """
+        for child in node.children:
+            if isinstance(child, NavigableString):
+                # Skip comments, doctypes and other non-text strings
+                if type(child) is NavigableString:
+                    builder.add_text(str(child))
+            elif child.name in SECTION_SKIP_TAGS or _is_skipped_class(" ".join(child.get("class") or [])):
+                continue
+            elif child.name in HEADING_TAGS:
+                builder.add_heading(int(child.name[1]), child.get_text(separator=' ', strip=True))
+            elif child.name == 'pre':
+                builder.add_code("".join(
+                    "\n" if getattr(part, "name", None) == 'br' else str(part)
+                    for part in child.descendants
+                    if getattr(part, "name", None) == 'br' or type(part) is NavigableString
+                ))
+            elif child.name in BLOCK_TAGS:
+                builder.end_block()
+                self._walk_soup(child, builder)
+                builder.end_block()
+            else:
+                self._walk_soup(child, builder)
+
+    def _walk_selectolax(self, node, builder: "SectionBuilder"):
+        """
+        Feed the content of a Lexbor node to a section builder, in document order.
+
+        Args:
+            node: Lexbor node
+            builder: Section builder collecting the output
+        """
+        for child in node.iter(include_text=True):
+            tag = child.tag
+            if tag == '-text':
+                builder.add_text(child.text_content or "")
+            elif tag in SECTION_SKIP_TAGS or _is_skipped_class(child.attributes.get('class') or ""):
+                continue
+            elif tag in HEADING_TAGS:
+                builder.add_heading(int(tag[1]), self._selectolax_text(child))
+            elif tag == 'pre':
+                builder.add_code("".join(
+                    "\n" if part.tag == 'br' else (part.text_content or "")
+                    for part in child.traverse(include_text=True)
+                    if part.tag in ('br', '-text')
+                ))
+            elif tag in BLOCK_TAGS:
+                builder.end_block()
+                self._walk_selectolax(child, builder)
+                builder.end_block()
+            elif not tag.startswith('-'):
+                self._walk_selectolax(child, builder)
+
+    def _selectolax_metadata(self, tree, url: str, text_content: str) -> Dict:
+        """
+        Build page metadata from a Lexbor tree.
+
+        Args:
+            tree: LexborHTMLParser tree
+            url: Source URL
+            text_content: Extracted text, for the word count
+
+        Returns:
+            Metadata dictionary
+        """
+        title_node = tree.css_first('title')
+        headings = [
+            {"level": int(node.tag[1]), "text": node.text().strip()}
+            for node in tree.css(", ".join(HEADING_TAGS))
+        ]
+        return self._build_metadata(url, title_node.text().strip() if title_node else "", headings, text_content,
+                                    self._determine_content_type_selectolax(url, tree))
+
+    @staticmethod
+    def _build_metadata(url: str, title: str, headings: List[Dict], text_content: str, content_type: str) -> Dict:
+        """
+        Assemble the page metadata dictionary.
+
+        Args:
+            url: Source URL
+            title: Page title
+            headings: Heading hierarchy
+            text_content: Extracted text, for the word count
+            content_type: Content type string
+
+        Returns:
+            Metadata dictionary
+        """
+        return {
             "url": url,
             "title": title,
             "headings": headings,
             "word_count": len(text_content.split()),
-            "content_type": self._determine_content_type(url, soup)
+            "content_type": content_type
         }
 
-        return {
+    def _extract_with_selectolax(self, html_content: str, url: str) -> Dict:
+        """
+        Extract text content and metadata using the Lexbor parser.
+
+        Lexbor builds the tree in C; only the title, headings and main content text are
+        turned into Python objects. Produces the same result as the BeautifulSoup path.
+
+        Args:
+            html_content: HTML content to extract text from
+            url: Source URL for metadata
+
+        Returns:
+            Dictionary containing extracted text and metadata
+        """
+        tree = LexborHTMLParser(html_content)
+
+        # Remove script and style elements
+        tree.strip_tags(["script", "style"])
+
+        main_node = self._select_main_node(tree)
+        text_content = self._selectolax_text(main_node)
+
+        result = {
             "text": text_content,
-            "metadata": metadata,
-            "html_structure": str(main_content)
+            "metadata": self._selectolax_metadata(tree, url, text_content)
         }
+        if self.include_html_structure:
+            result["html_structure"] = main_node.html if main_node is not None else ""
+        return result
+
+    @staticmethod
+    def _select_main_node(tree):
+        """
+        Find the main content node in a Lexbor tree.
+
+        Args:
+            tree: LexborHTMLParser tree
+
+        Returns:
+            Main content node
+        """
+        for selector in MAIN_CONTENT_SELECTORS:
+            node = tree.css_first(selector)
+            if node is not None:
+                return node
+        return tree.body or tree.root
+
+    @staticmethod
+    def _selectolax_text(node) -> str:
+        """
+        Get the text of a Lexbor node, joining non-empty stripped text nodes with spaces.
+
+        Args:
+            node: Lexbor node (or None)
+
+        Returns:
+            Text content
+        """
+        if node is None:
+            return ""
+        text = node.text(deep=True, separator=_TEXT_NODE_SEPARATOR, strip=True)
+        return " ".join(part for part in text.split(_TEXT_NODE_SEPARATOR) if part)
 
     def _extract_main_content(self, soup) -> BeautifulSoup:
         """
@@ -71,21 +431,7 @@ class TextExtractor:
             BeautifulSoup object containing main content
         """
         # Try common selectors for Docusaurus and similar documentation sites
-        selectors_to_try = [
-            '[role="main"]',
-            '.main-wrapper',
-            '.container',
-            '.main-content',
-            '.content',
-            '.docs-content',
-            '.theme-doc-markdown',
-            'main',
-            '.article',
-            '.post-content',
-            'body'
-        ]
-
-        for selector in selectors_to_try:
+        for selector in MAIN_CONTENT_SELECTORS:
             content = soup.select_one(selector)
             if content:
                 return content
@@ -105,7 +451,7 @@ class TextExtractor:
             List of heading dictionaries with level and text
         """
         headings = []
-        for heading in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+        for heading in soup.find_all(HEADING_TAGS):
             headings.append({
                 "level": int(heading.name[1]),
                 "text": heading.get_text().strip()
@@ -124,6 +470,29 @@ class TextExtractor:
             Content type string
         """
         # Check for common patterns in the URL
+        content_type = self._content_type_from_url(url)
+        if content_type:
+            return content_type
+
+        # Check for common elements in the HTML
+        if soup.find('article'):
+            return 'article'
+        elif soup.find('div', class_=lambda x: x and 'doc' in x.lower()):
+            return 'documentation'
+        else:
+            return 'general'
+
+    @staticmethod
+    def _content_type_from_url(url: str) -> str:
+        """
+        Determine the content type from common URL patterns.
+
+        Args:
+            url: Source URL
+
+        Returns:
+            Content type string, or an empty string if the URL does not say
+        """
         if '/docs/' in url:
             return 'documentation'
         elif '/blog/' in url or '/posts/' in url:
@@ -132,11 +501,25 @@ class TextExtractor:
             return 'api_reference'
         elif '/tutorial/' in url:
             return 'tutorial'
-        else:
-            # Check for common elements in the HTML
-            if soup.find('article'):
-                return 'article'
-            elif soup.find('div', class_=lambda x: x and 'doc' in x.lower()):
-                return 'documentation'
-            else:
-                return 'general'
\ No newline at end of file
+        return ''
+
+    def _determine_content_type_selectolax(self, url: str, tree) -> str:
+        """
+        Determine the content type based on URL and a Lexbor tree (see _determine_content_type).
+
+        Args:
+            url: Source URL
+            tree: LexborHTMLParser tree
+
+        Returns:
+            Content type string
+        """
+        content_type = self._content_type_from_url(url)
+        if content_type:
+            return content_type
+
+        if tree.css_first('article') is not None:
+            return 'article'
+        if any('doc' in (node.attributes.get('class') or '').lower() for node in tree.css('div[class]')):
+            return 'documentation'
+        return 'general'
@@ -0,0 +1,156 @@
+"""
+Ingestion Manifest Module for Incremental Ingestion
+
+This module tracks which pages and chunks have already been embedded and stored,
+so re-ingestion only needs to process content that actually changed.
+"""
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Set
+from ..utils.logger import app_logger
+from .qdrant_manager import point_id
+
+
+class IngestionManifest:
+    """Class to track page hashes and stored chunk ids between ingestion runs."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pages: Dict[str, Dict] = {}
+        self._load()
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """
+        Hash text content for change detection.
+
+        Args:
+            text: Text to hash
+
+        Returns:
+            SHA-256 hex digest of the text
+        """
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _load(self):
+        """Load the manifest from disk if it exists."""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as manifest_file:
+                self.pages = json.load(manifest_file).get("pages", {})
+            app_logger.info(f"Loaded ingestion manifest with {len(self.pages)} pages from {self.path}")
+        except (OSError, ValueError) as e:
+            app_logger.warning(f"Could not read ingestion manifest {self.path}, starting fresh: {str(e)}")
+            self.pages = {}
+
+    def save(self):
+        """Write the manifest to disk atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump({"pages": self.pages}, manifest_file)
+        os.replace(temp_path, self.path)
+
+        app_logger.debug(f"Saved ingestion manifest with {len(self.pages)} pages to {self.path}")
+
+    def is_page_unchanged(self, url: str, page_hash: str) -> bool:
+        """
+        Check whether a page's cleaned content matches the last ingested version.
+
+        Args:
+            url: Page URL
+            page_hash: Hash of the page's cleaned text
+
+        Returns:
+            True if the page was ingested before with the same content
+        """
+        page = self.pages.get(url)
+        return page is not None and page["page_hash"] == page_hash
+
+    def plan_page(self, url: str, chunks: List[Dict], force: bool = False) -> Dict:
+        """
+        Work out which chunks of a page need to be embedded.
+
+        Each chunk is identified by the hash of its text. Chunks already stored keep
+        their point id; new chunks get the deterministic id from point_id, so a chunk
+        that is embedded again (after a failure, or with a lost manifest) overwrites
+        its earlier point. Stale points are removed by URL after the page is stored
+        (see QdrantManager.delete_by_url).
+
+        Args:
+            url: Page URL
+            chunks: Chunk dictionaries produced by the chunker
+            force: Re-embed every chunk, even if it is already stored
+
+        Returns:
+            Dictionary with "chunks_to_embed" (chunks annotated with chunk_hash and
+            point_id) and "chunk_ids" (the page's new chunk hash to point id mapping)
+        """
+        stored_ids = self.pages.get(url, {}).get("chunks", {})
+        chunk_ids: Dict[str, str] = {}
+        chunks_to_embed = []
+
+        for chunk_index, chunk in enumerate(chunks):
+            chunk_hash = self.hash_text(chunk["text"])
+            if chunk_hash in chunk_ids:
+                # Identical text is only stored once per page
+                continue
+
+            chunk_point_id = stored_ids.get(chunk_hash) or point_id(url, chunk_index, chunk_hash)
+            chunk_ids[chunk_hash] = chunk_point_id
+
+            if force or chunk_hash not in stored_ids:
+                chunks_to_embed.append({**chunk, "chunk_hash": chunk_hash, "point_id": chunk_point_id})
+
+        return {
+            "chunks_to_embed": chunks_to_embed,
+            "chunk_ids": chunk_ids
+        }
+
+    def update_page(self, url: str, page_hash: str, chunk_ids: Dict[str, str],
+                    failed_hashes: Optional[Set[str]] = None):
+        """
+        Record the ingested state of a page.
+
+        Chunks that failed to embed are left out unless an older version of them is
+        still stored, and the page hash is not recorded, so the next run retries them.
+
+        Args:
+            url: Page URL
+            page_hash: Hash of the page's cleaned text
+            chunk_ids: Mapping of chunk hash to stored point id
+            failed_hashes: Hashes of chunks whose embedding or storage failed
+        """
+        if failed_hashes:
+            stored_ids = self.pages.get(url, {}).get("chunks", {})
+            chunk_ids = {
+                chunk_hash: point_id for chunk_hash, point_id in chunk_ids.items()
+                if chunk_hash not in failed_hashes or chunk_hash in stored_ids
+            }
+            page_hash = ""
+
+        self.pages[url] = {"page_hash": page_hash, "chunks": chunk_ids}
+
+    def remove_page(self, url: str):
+        """
+        Forget a page.
+
+        Args:
+            url: Page URL
+        """
+        self.pages.pop(url, None)
+
+    def total_chunks(self) -> int:
+        """
+        Count the chunks recorded across all pages.
+
+        Returns:
+            Total number of stored chunks tracked by the manifest
+        """
+        return sum(len(page["chunks"]) for page in self.pages.values())
@@ -4,12 +4,67 @@ Qdrant Manager Module for Vector Storage
 This module handles interaction with Qdrant Cloud for storing and retrieving embeddings.
 """
 import asyncio
-import time
-from typing import List, Dict, Optional
-from qdrant_client import AsyncQdrantClient
+import hashlib
+import re
+import uuid
+from typing import Iterable, List, Dict, Optional, Union
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http import models
 from ..utils.logger import app_logger
 from ..utils.config import Config
+from ..utils.rate_limiter import get_limiter
+from ..utils.retry import retry_async
+
+# Namespace of the UUIDv5 point ids derived from chunk identity
+POINT_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://github.com/usmanrazansari/physical-ai-book#chunks")
+
+# Page-level chunk ids assigned by the chunker ("chunk_0", "chunk_1", ...)
+_CHUNK_ID_RE = re.compile(r'^chunk_(\d+)$')
+
+
+def point_id(url: str, chunk_index: int, chunk_hash: str) -> str:
+    """
+    Derive the Qdrant point id of a chunk.
+
+    The id is a UUIDv5 of the page URL, the chunk's position on the page and the hash
+    of its text, so ingesting the same chunk again overwrites the same point instead
+    of adding a duplicate.
+
+    Args:
+        url: Page URL
+        chunk_index: Position of the chunk on the page
+        chunk_hash: SHA-256 hex digest of the chunk text
+
+    Returns:
+        Point id as a UUID string
+    """
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{url}\n{chunk_index}\n{chunk_hash}"))
+
+
+def payload_point_id(payload: Dict) -> str:
+    """
+    Derive the Qdrant point id of a chunk from its payload.
+
+    Args:
+        payload: Chunk payload with "url", "chunk_index" (or a page-level "chunk_N"
+            "chunk_id"), and "chunk_hash" (or "text", which is hashed)
+
+    Returns:
+        Point id as a UUID string
+
+    Raises:
+        ValueError: If the payload has no URL or no position on its page
+    """
+    chunk_index = payload.get("chunk_index")
+    if chunk_index is None:
+        match = _CHUNK_ID_RE.match(str(payload.get("chunk_id", "")))
+        chunk_index = int(match.group(1)) if match else None
+    if not payload.get("url") or chunk_index is None:
+        raise ValueError("Payloads need a 'url' and a 'chunk_index' or 'chunk_N' chunk_id to derive point ids; "
+                         "pass ids explicitly otherwise")
+
+    chunk_hash = payload.get("chunk_hash") or hashlib.sha256(payload.get("text", "").encode('utf-8')).hexdigest()
+    return point_id(payload["url"], chunk_index, chunk_hash)
 
 
 class QdrantManager:
@@ -20,10 +75,30 @@ class QdrantManager:
         self.client = AsyncQdrantClient(
             url=config.qdrant_url,
             api_key=config.qdrant_api_key,
-            prefer_grpc=False  # Using HTTP for better compatibility
+            prefer_grpc=config.qdrant_prefer_grpc  # HTTP by default for better compatibility
         )
-        self.last_request_time = 0
-        self.min_request_interval = 60.0 / config.qdrant_rpm_limit  # Respect rate limits
+        # Shared with every other Qdrant caller
+        self.rate_limiter = get_limiter("qdrant", config.qdrant_rpm_limit, config.qdrant_burst)
+        # A point already written with wait=False, re-sent by flush as a consistency barrier
+        self._last_point: Optional[models.PointStruct] = None
+        # Synchronous client for QDRANT_UPSERT_METHOD=upload_points, created on first use
+        self._bulk_client: Optional[QdrantClient] = None
+
+    async def close(self):
+        """Close the Qdrant clients and their pooled connections."""
+        await self.client.close()
+        if self._bulk_client is not None:
+            self._bulk_client.close()
+            self._bulk_client = None
+
+    async def collection_exists(self) -> bool:
+        """
+        Check whether the collection exists.
+
+        Returns:
+            True if the collection exists
+        """
+        return await self.client.collection_exists(self.config.qdrant_collection_name)
 
     async def ensure_collection_exists(self, vector_size: int = 1024, distance: str = "Cosine"):
         """
@@ -31,7 +106,7 @@ class QdrantManager:
 
         Args:
             vector_size: Size of the embedding vectors
-            distance: Distance metric for similarity search
+            distance: Distance metric for similarity search ("Cosine", "Dot", "Euclid" or "Manhattan")
         """
         # Check if collection exists
         try:
@@ -44,7 +119,7 @@ class QdrantManager:
                     collection_name=self.config.qdrant_collection_name,
                     vectors_config=models.VectorParams(
                         size=vector_size,
-                        distance=models.Distance[distance]
+                        distance=models.Distance[distance.upper()]
                     ),
                     # Set up for Qdrant Cloud Free Tier limitations
                     optimizers_config=models.OptimizersConfigDiff(
@@ -55,54 +130,274 @@ class QdrantManager:
                 app_logger.info(f"Created collection: {self.config.qdrant_collection_name}")
             else:
                 app_logger.info(f"Collection already exists: {self.config.qdrant_collection_name}")
+
+            # Keyword index on the page URL, for deleting a page's points by filter
+            await self.client.create_payload_index(
+                collection_name=self.config.qdrant_collection_name,
+                field_name="url",
+                field_schema=models.PayloadSchemaType.KEYWORD
+            )
+
+            if self.config.keyword_search_enabled:
+                # Full-text index on chunk text for keyword retrieval on the chat path
+                await self.client.create_payload_index(
+                    collection_name=self.config.qdrant_collection_name,
+                    field_name="text",
+                    field_schema=models.TextIndexParams(
+                        type=models.TextIndexType.TEXT,
+                        tokenizer=models.TokenizerType.WORD,
+                        lowercase=True
+                    )
+                )
         except Exception as e:
             app_logger.error(f"Error ensuring collection exists: {str(e)}")
             raise
 
-    async def store_vectors(self, vectors: List[List[float]], payloads: List[Dict], ids: List[str] = None):
+    async def store_vectors(self, vectors: List[List[float]], payloads: List[Dict],
+                            ids: Optional[List[Union[str, int]]] = None, wait: bool = True):
         """
         Store vectors with their payloads in Qdrant.
 
+        Points are sent in batches of QDRANT_UPSERT_BATCH_SIZE, with at most
+        QDRANT_UPSERT_PARALLELISM requests in flight, and each batch is only built
+        when it is about to be sent. Batches are written with wait=False and failed
+        batches are retried with backoff; with QDRANT_UPSERT_METHOD=upload_points,
+        the client's bulk uploader is used instead. Points with existing ids are
+        overwritten, so storing (or retrying) the same chunks again is idempotent.
+
         Args:
             vectors: List of embedding vectors to store
             payloads: List of metadata payloads corresponding to each vector
-            ids: Optional list of IDs for the vectors (if not provided, will be auto-generated)
+            ids: Optional list of point ids (UUID strings or unsigned integers). By default,
+                ids are derived from each payload with payload_point_id
+            wait: Wait until the points are applied and searchable; otherwise return once
+                Qdrant has accepted them, and call flush later
         """
         if not vectors or len(vectors) != len(payloads):
             raise ValueError("Vectors and payloads must have the same length and not be empty")
 
-        # Rate limiting
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        if time_since_last_request < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - time_since_last_request)
+        # Derive deterministic IDs if not provided
+        if ids is None:
+            ids = [payload_point_id(payload) for payload in payloads]
+
+        batch_size = self.config.qdrant_upsert_batch_size
+        batch_starts = range(0, len(vectors), batch_size)
+
+        def build_points(start: int) -> List[models.PointStruct]:
+            return [
+                models.PointStruct(id=idx, vector=vector, payload=payload)
+                for idx, vector, payload in zip(ids[start:start + batch_size],
+                                                vectors[start:start + batch_size],
+                                                payloads[start:start + batch_size])
+            ]
 
         try:
-            # Generate IDs if not provided
-            if ids is None:
-                ids = [f"doc_{i}" for i in range(len(vectors))]
-
-            # Prepare points for upsert
-            points = [
-                models.PointStruct(
-                    id=idx,
-                    vector=vector,
-                    payload=payload
+            if self.config.qdrant_upsert_method == "upload_points":
+                last_point = await self._upload_points(build_points, batch_starts)
+            else:
+                semaphore = asyncio.Semaphore(self.config.qdrant_upsert_parallelism)
+                last_points = await asyncio.gather(*(self._upsert_batch(build_points, start, semaphore)
+                                                     for start in batch_starts))
+                last_point = last_points[-1]
+
+            # Wait for this call's own points, so concurrent callers do not share the barrier
+            if wait:
+                await self._barrier(last_point)
+            else:
+                self._last_point = last_point
+
+            app_logger.info(f"Successfully stored {len(vectors)} vectors in Qdrant ({len(batch_starts)} batches)")
+
+        except Exception as e:
+            app_logger.error(f"Error storing vectors in Qdrant: {str(e)}")
+            raise
+
+    async def _upsert_batch(self, build_points, start: int, semaphore: asyncio.Semaphore) -> models.PointStruct:
+        """
+        Send one batch of points with wait=False, retrying retryable failures.
+
+        Args:
+            build_points: Function building the points of the batch starting at an index
+            start: Index of the batch's first point
+            semaphore: Semaphore bounding the requests in flight
+
+        Returns:
+            Last point of the batch
+        """
+        async with semaphore:
+            points = build_points(start)
+
+            async def upsert():
+                # Rate limiting
+                await self.rate_limiter.acquire()
+                return await self.client.upsert(
+                    collection_name=self.config.qdrant_collection_name,
+                    points=points,
+                    wait=False
                 )
-                for idx, vector, payload in zip(ids, vectors, payloads)
-            ]
 
-            # Upsert points to Qdrant
-            await self.client.upsert(
+            await retry_async(
+                upsert,
+                max_attempts=self.config.max_retries + 1,
+                base_delay=self.config.retry_base_delay,
+                max_delay=self.config.retry_max_delay,
+                description=f"Qdrant upsert of {len(points)} points"
+            )
+            return points[-1]
+
+    async def _upload_points(self, build_points, batch_starts: range) -> models.PointStruct:
+        """
+        Send points with the client's bulk uploader (upload_points) and wait=False.
+
+        The uploader is synchronous (with up to QDRANT_UPSERT_PARALLELISM worker
+        processes, but no more than one per batch), so it runs on a synchronous client
+        in a thread to keep the event loop free.
+
+        Args:
+            build_points: Function building the points of the batch starting at an index
+            batch_starts: Index of each batch's first point
+
+        Returns:
+            Last point uploaded
+        """
+        # Rate limiting, one permit per batch request
+        for _ in batch_starts:
+            await self.rate_limiter.acquire()
+
+        last_points: List[models.PointStruct] = []
+
+        def points():
+            for start in batch_starts:
+                batch = build_points(start)
+                last_points[:] = batch[-1:]
+                yield from batch
+
+        if self._bulk_client is None:
+            self._bulk_client = QdrantClient(
+                url=self.config.qdrant_url,
+                api_key=self.config.qdrant_api_key,
+                prefer_grpc=self.config.qdrant_prefer_grpc
+            )
+
+        await asyncio.to_thread(
+            self._bulk_client.upload_points,
+            collection_name=self.config.qdrant_collection_name,
+            points=points(),
+            batch_size=self.config.qdrant_upsert_batch_size,
+            # Worker processes only pay off with more than one batch to spread over them
+            parallel=min(self.config.qdrant_upsert_parallelism, len(batch_starts)),
+            max_retries=self.config.max_retries,
+            wait=False
+        )
+        return last_points[0]
+
+    async def flush(self):
+        """
+        Wait until every point written with wait=False has been applied.
+
+        Safe to call concurrently with writes: the pending barrier point is only
+        cleared if no other write replaced it while the barrier was in flight.
+        """
+        point = self._last_point
+        if point is None:
+            return
+
+        await self._barrier(point)
+        if self._last_point is point:
+            self._last_point = None
+
+    async def _barrier(self, point: models.PointStruct):
+        """
+        Re-send an already written point with wait=True.
+
+        Qdrant applies a shard's updates in the order it accepted them, so this returns
+        only once all earlier updates are applied (on single-shard collections, the
+        default). Rewriting the point is a no-op since its id and content are unchanged.
+
+        Args:
+            point: Point already written to the collection
+        """
+        # Rate limiting
+        await self.rate_limiter.acquire()
+
+        await retry_async(
+            lambda: self.client.upsert(
+                collection_name=self.config.qdrant_collection_name,
+                points=[point],
+                wait=True
+            ),
+            max_attempts=self.config.max_retries + 1,
+            base_delay=self.config.retry_base_delay,
+            max_delay=self.config.retry_max_delay,
+            description="Qdrant consistency barrier"
+        )
+
+    async def delete_vectors(self, ids: List[str]):
+        """
+        Delete vectors from Qdrant by id.
+
+        Args:
+            ids: List of point ids to delete
+        """
+        if not ids:
+            return
+
+        # Rate limiting
+        await self.rate_limiter.acquire()
+
+        try:
+            await self.client.delete(
                 collection_name=self.config.qdrant_collection_name,
-                points=points
+                points_selector=models.PointIdsList(points=ids)
             )
 
-            app_logger.info(f"Successfully stored {len(vectors)} vectors in Qdrant")
+            app_logger.info(f"Deleted {len(ids)} vectors from Qdrant")
 
-            self.last_request_time = time.time()
         except Exception as e:
-            app_logger.error(f"Error storing vectors in Qdrant: {str(e)}")
+            app_logger.error(f"Error deleting vectors from Qdrant: {str(e)}")
+            raise
+
+    async def delete_by_url(self, url: str, keep_ids: Optional[Iterable[Union[str, int]]] = None) -> int:
+        """
+        Delete the points of a page, except the ones to keep.
+
+        Removes stale chunks by payload filter, so points the ingestion manifest does
+        not know about (from an earlier run or a lost manifest) are removed as well.
+
+        Args:
+            url: Page URL, matched against the "url" payload field
+            keep_ids: Point ids of the page's current chunks, which are not deleted
+
+        Returns:
+            Number of points deleted
+        """
+        keep_ids = list(keep_ids or [])
+        points_filter = models.Filter(
+            must=[models.FieldCondition(key="url", match=models.MatchValue(value=url))],
+            must_not=[models.HasIdCondition(has_id=keep_ids)] if keep_ids else None
+        )
+
+        # Rate limiting
+        await self.rate_limiter.acquire()
+
+        try:
+            count = (await self.client.count(
+                collection_name=self.config.qdrant_collection_name,
+                count_filter=points_filter,
+                exact=True
+            )).count
+            if count:
+                await self.rate_limiter.acquire()
+                await self.client.delete(
+                    collection_name=self.config.qdrant_collection_name,
+                    points_selector=models.FilterSelector(filter=points_filter)
+                )
+                app_logger.info(f"Deleted {count} stale vectors of {url} from Qdrant")
+
+            return count
+
+        except Exception as e:
+            app_logger.error(f"Error deleting vectors of {url} from Qdrant: {str(e)}")
             raise
 
     async def search_vectors(self, query_vector: List[float], limit: int = 10, filters: Dict = None):
@@ -118,10 +413,7 @@ class QdrantManager:
             List of search results with scores and payloads
         """
         # Rate limiting
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        if time_since_last_request < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - time_since_last_request)
+        await self.rate_limiter.acquire()
 
         try:
             # Prepare filters if provided
@@ -150,12 +442,44 @@ class QdrantManager:
             search_results = query_response.points
             app_logger.debug(f"Search returned {len(search_results)} results")
 
-            self.last_request_time = time.time()
             return search_results
         except Exception as e:
             app_logger.error(f"Error searching vectors in Qdrant: {str(e)}")
             raise
 
+    async def keyword_search(self, text: str, limit: int = 5):
+        """
+        Find stored chunks whose text contains the words of a query.
+
+        Uses the full-text payload index on "text" when one exists (see ensure_collection_exists).
+
+        Args:
+            text: Query text to match
+            limit: Maximum number of results to return
+
+        Returns:
+            List of matching records with payloads (without similarity scores)
+        """
+        # Rate limiting
+        await self.rate_limiter.acquire()
+
+        try:
+            records, _ = await self.client.scroll(
+                collection_name=self.config.qdrant_collection_name,
+                scroll_filter=models.Filter(
+                    must=[models.FieldCondition(key="text", match=models.MatchText(text=text))]
+                ),
+                limit=limit,
+                with_payload=True,
+                with_vectors=False
+            )
+            app_logger.debug(f"Keyword search returned {len(records)} results")
+
+            return records
+        except Exception as e:
+            app_logger.error(f"Error running keyword search in Qdrant: {str(e)}")
+            raise
+
     async def get_vector_count(self) -> int:
         """
         Get the total number of vectors stored in the collection.
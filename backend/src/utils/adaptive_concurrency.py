@@ -0,0 +1,61 @@
+"""
+Adaptive Concurrency Module
+
+This module provides an AIMD (additive-increase, multiplicative-decrease) concurrency
+limiter that backs off when an upstream throttles and ramps up while calls succeed.
+"""
+import asyncio
+import time
+from .logger import app_logger
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Class limiting the number of in-flight calls with an AIMD-adjusted limit.
+
+    Use as `async with limiter:` around each call, and report outcomes with
+    on_success() and on_throttle().
+    """
+
+    def __init__(self, initial_limit: int, min_limit: int = 1, max_limit: int = None,
+                 decrease_factor: float = 0.5, cooldown_seconds: float = 1.0):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit or initial_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.decrease_factor = decrease_factor
+        self.cooldown_seconds = cooldown_seconds
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self):
+        """Grow the limit by roughly one slot per window of successful calls."""
+        if self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+    def on_throttle(self):
+        """
+        Shrink the limit after the upstream throttled a call.
+
+        Throttles reported within the cooldown of the last decrease are ignored, so a
+        burst of concurrent rejections only halves the limit once.
+        """
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown_seconds:
+            return
+
+        self._last_decrease = now
+        previous_limit = int(self.limit)
+        self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        app_logger.info(f"Upstream throttled, reducing concurrency from {previous_limit} to {int(self.limit)}")
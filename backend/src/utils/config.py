@@ -22,6 +22,11 @@ class Config:
         self.qdrant_url = self._get_required_env_var("QDRANT_URL")
         self.qdrant_api_key = self._get_required_env_var("QDRANT_API_KEY")
         self.qdrant_collection_name = os.getenv("QDRANT_COLLECTION_NAME", "physical_ai_book_content")
+        self.qdrant_prefer_grpc = os.getenv("QDRANT_PREFER_GRPC", "false").lower() in ("1", "true", "yes")
+        # Bulk upserts: points per request, concurrent requests, and "upsert" or the client's "upload_points"
+        self.qdrant_upsert_batch_size = int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", "256"))
+        self.qdrant_upsert_parallelism = int(os.getenv("QDRANT_UPSERT_PARALLELISM", "4"))
+        self.qdrant_upsert_method = os.getenv("QDRANT_UPSERT_METHOD", "upsert").lower()
 
         # Website Configuration
         self.physical_ai_book_base_url = self._get_required_env_var("PHYSICAL_AI_BOOK_BASE_URL")
@@ -29,11 +34,83 @@ class Config:
         # Processing Configuration
         self.chunk_size = int(os.getenv("CHUNK_SIZE", "512"))
         self.chunk_overlap = int(os.getenv("CHUNK_OVERLAP", "64"))
+        self.chunk_size_unit = os.getenv("CHUNK_SIZE_UNIT", "words").lower()  # words or tokens
+        self.chunking_strategy = os.getenv("CHUNKING_STRATEGY", "sentences").lower()  # sentences or sections
+        # Tokenizer for token counts, required when CHUNK_SIZE_UNIT is "tokens": a local
+        # tokenizer.json, or a Hugging Face Hub model id (downloaded from the Hub on first use)
+        self.tokenizer_path = os.getenv("TOKENIZER_PATH", "")
+        self.tokenizer_name = os.getenv("TOKENIZER_NAME", "")
         self.max_concurrent_requests = int(os.getenv("MAX_CONCURRENT_REQUESTS", "5"))
+        self.embed_batch_target_tokens = int(os.getenv("EMBED_BATCH_TARGET_TOKENS", "0"))  # 0 = no target
+
+        # Browser Pool Configuration
+        self.browser_page_max_navigations = int(os.getenv("BROWSER_PAGE_MAX_NAVIGATIONS", "50"))
+        self.discovery_workers = int(os.getenv("DISCOVERY_WORKERS", str(self.max_concurrent_requests)))
+
+        # Discovery Configuration
+        self.discovery_mode = os.getenv("DISCOVERY_MODE", "sitemap").lower()
+        self.sitemap_url = os.getenv("SITEMAP_URL", self.physical_ai_book_base_url.rstrip("/") + "/sitemap.xml")
+
+        # Extraction Configuration
+        self.html_parser = os.getenv("HTML_PARSER", "auto").lower()
+        self.extract_html_structure = os.getenv("EXTRACT_HTML_STRUCTURE", "false").lower() in ("1", "true", "yes")
+        self.cleaner_default_boilerplate = os.getenv("CLEANER_DEFAULT_BOILERPLATE", "true").lower() in ("1", "true", "yes")
+        self.boilerplate_patterns_file = os.getenv("BOILERPLATE_PATTERNS_FILE", "")
+
+        # Local Docs Configuration (Markdown sources of the book, for --mode local)
+        default_docs_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "docs")
+        self.docs_dir = os.getenv("DOCS_DIR", os.path.normpath(default_docs_dir))
+        self.docs_route_base_path = os.getenv("DOCS_ROUTE_BASE_PATH", "docs")
+
+        # Fetch Configuration
+        self.fetch_mode = os.getenv("FETCH_MODE", "auto").lower()
+        self.static_min_content_chars = int(os.getenv("STATIC_MIN_CONTENT_CHARS", "200"))
+
+        # Streaming Pipeline Configuration
+        # One worker process per available core; PROCESS_POOL_WORKERS=0 processes pages in-process
+        available_cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+        self.process_pool_workers = int(os.getenv("PROCESS_POOL_WORKERS", str(max(1, available_cpus))))
+        self.pipeline_fetch_workers = int(os.getenv("PIPELINE_FETCH_WORKERS", str(self.max_concurrent_requests)))
+        self.pipeline_process_workers = int(os.getenv("PIPELINE_PROCESS_WORKERS", str(max(1, self.process_pool_workers))))
+        self.pipeline_embed_workers = int(os.getenv("PIPELINE_EMBED_WORKERS", str(self.max_concurrent_requests)))
+        self.pipeline_upsert_workers = int(os.getenv("PIPELINE_UPSERT_WORKERS", "2"))
+        self.pipeline_queue_size = int(os.getenv("PIPELINE_QUEUE_SIZE", "32"))
+        self.pipeline_embed_batch_size = int(os.getenv("PIPELINE_EMBED_BATCH_SIZE", "96"))
+        self.pipeline_batch_timeout_seconds = float(os.getenv("PIPELINE_BATCH_TIMEOUT_SECONDS", "0.5"))
+
+        # Cache Configuration
+        self.cache_dir = os.getenv("CACHE_DIR", ".cache")
+        self.fetch_cache_enabled = os.getenv("FETCH_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.fetch_cache_path = os.getenv("FETCH_CACHE_PATH", os.path.join(self.cache_dir, "fetch_cache.sqlite3"))
+        self.embedding_cache_enabled = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.embedding_cache_path = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(self.cache_dir, "embedding_cache.sqlite3"))
+        # The chat API may run on a read-only filesystem, so its embedder only uses the disk cache on request
+        self.chat_embedding_cache_enabled = os.getenv("CHAT_EMBEDDING_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+        self.manifest_path = os.getenv("INGESTION_MANIFEST_PATH", os.path.join(self.cache_dir, "ingestion_manifest.json"))
+
+        # Chat Cache Configuration
+        self.query_cache_size = int(os.getenv("QUERY_CACHE_SIZE", "1024"))
+        self.query_cache_ttl_seconds = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "3600"))
+        self.answer_cache_size = int(os.getenv("ANSWER_CACHE_SIZE", "256"))
+        self.answer_cache_similarity = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))
+        self.answer_cache_ttl_seconds = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "86400"))
+
+        # Chat Retrieval Configuration
+        self.keyword_search_enabled = os.getenv("CHAT_KEYWORD_SEARCH", "false").lower() in ("1", "true", "yes")
+        self.keyword_search_limit = int(os.getenv("CHAT_KEYWORD_SEARCH_LIMIT", "2"))
 
         # Rate Limiting Configuration
         self.cohere_rpm_limit = int(os.getenv("COHERE_RPM_LIMIT", "100"))
         self.qdrant_rpm_limit = int(os.getenv("QDRANT_RPM_LIMIT", "1000"))
+        self.cohere_burst = int(os.getenv("COHERE_BURST", "5"))
+        self.qdrant_burst = int(os.getenv("QDRANT_BURST", "10"))
+        self.cohere_embed_inputs_per_minute = int(os.getenv("COHERE_EMBED_INPUTS_PER_MINUTE", "0"))  # 0 disables
+
+        # Retry Configuration
+        self.max_retries = int(os.getenv("MAX_RETRIES", "5"))
+        self.retry_base_delay = float(os.getenv("RETRY_BASE_DELAY", "1.0"))
+        self.retry_max_delay = float(os.getenv("RETRY_MAX_DELAY", "60.0"))
+        self.min_concurrent_requests = int(os.getenv("MIN_CONCURRENT_REQUESTS", "1"))
 
         # Validation
         self._validate_config()
@@ -53,7 +130,67 @@ class Config:
             raise ValueError("CHUNK_OVERLAP must be greater than or equal to 0")
         if self.max_concurrent_requests <= 0:
             raise ValueError("MAX_CONCURRENT_REQUESTS must be greater than 0")
+        if self.browser_page_max_navigations <= 0:
+            raise ValueError("BROWSER_PAGE_MAX_NAVIGATIONS must be greater than 0")
+        if self.discovery_workers <= 0:
+            raise ValueError("DISCOVERY_WORKERS must be greater than 0")
+        if self.discovery_mode not in ("sitemap", "crawl"):
+            raise ValueError("DISCOVERY_MODE must be one of: sitemap, crawl")
+        if self.fetch_mode not in ("auto", "http", "browser"):
+            raise ValueError("FETCH_MODE must be one of: auto, http, browser")
+        if self.static_min_content_chars < 0:
+            raise ValueError("STATIC_MIN_CONTENT_CHARS must be greater than or equal to 0")
+        if self.query_cache_size <= 0:
+            raise ValueError("QUERY_CACHE_SIZE must be greater than 0")
+        if self.answer_cache_size <= 0:
+            raise ValueError("ANSWER_CACHE_SIZE must be greater than 0")
+        if not 0 < self.answer_cache_similarity <= 1:
+            raise ValueError("ANSWER_CACHE_SIMILARITY must be between 0 and 1")
+        if self.keyword_search_limit <= 0:
+            raise ValueError("CHAT_KEYWORD_SEARCH_LIMIT must be greater than 0")
         if self.cohere_rpm_limit <= 0:
             raise ValueError("COHERE_RPM_LIMIT must be greater than 0")
         if self.qdrant_rpm_limit <= 0:
-            raise ValueError("QDRANT_RPM_LIMIT must be greater than 0")
\ No newline at end of file
+            raise ValueError("QDRANT_RPM_LIMIT must be greater than 0")
+        if self.cohere_burst <= 0:
+            raise ValueError("COHERE_BURST must be greater than 0")
+        if self.qdrant_burst <= 0:
+            raise ValueError("QDRANT_BURST must be greater than 0")
+        if self.cohere_embed_inputs_per_minute < 0:
+            raise ValueError("COHERE_EMBED_INPUTS_PER_MINUTE must be greater than or equal to 0")
+        if self.max_retries < 0:
+            raise ValueError("MAX_RETRIES must be greater than or equal to 0")
+        if self.retry_base_delay < 0 or self.retry_max_delay < 0:
+            raise ValueError("RETRY_BASE_DELAY and RETRY_MAX_DELAY must be greater than or equal to 0")
+        if not 0 < self.min_concurrent_requests <= self.max_concurrent_requests:
+            raise ValueError("MIN_CONCURRENT_REQUESTS must be between 1 and MAX_CONCURRENT_REQUESTS")
+        if self.embed_batch_target_tokens < 0:
+            raise ValueError("EMBED_BATCH_TARGET_TOKENS must be greater than or equal to 0")
+        for name in ("pipeline_fetch_workers", "pipeline_process_workers", "pipeline_embed_workers",
+                     "pipeline_upsert_workers", "pipeline_queue_size"):
+            if getattr(self, name) <= 0:
+                raise ValueError(f"{name.upper()} must be greater than 0")
+        if not 0 < self.pipeline_embed_batch_size <= 96:
+            raise ValueError("PIPELINE_EMBED_BATCH_SIZE must be between 1 and 96")
+        if self.pipeline_batch_timeout_seconds <= 0:
+            raise ValueError("PIPELINE_BATCH_TIMEOUT_SECONDS must be greater than 0")
+        if self.process_pool_workers < 0:
+            raise ValueError("PROCESS_POOL_WORKERS must be greater than or equal to 0")
+        if self.html_parser not in ("auto", "selectolax", "lxml", "html.parser"):
+            raise ValueError("HTML_PARSER must be 'auto', 'selectolax', 'lxml' or 'html.parser'")
+        if self.boilerplate_patterns_file and not os.path.isfile(self.boilerplate_patterns_file):
+            raise ValueError(f"BOILERPLATE_PATTERNS_FILE not found: {self.boilerplate_patterns_file}")
+        if self.chunk_size_unit not in ("words", "tokens"):
+            raise ValueError("CHUNK_SIZE_UNIT must be 'words' or 'tokens'")
+        if self.tokenizer_path and not os.path.isfile(self.tokenizer_path):
+            raise ValueError(f"TOKENIZER_PATH not found: {self.tokenizer_path}")
+        if self.chunk_size_unit == "tokens" and not (self.tokenizer_path or self.tokenizer_name):
+            raise ValueError("CHUNK_SIZE_UNIT 'tokens' requires TOKENIZER_PATH or TOKENIZER_NAME")
+        if self.chunking_strategy not in ("sentences", "sections"):
+            raise ValueError("CHUNKING_STRATEGY must be 'sentences' or 'sections'")
+        if self.qdrant_upsert_batch_size <= 0:
+            raise ValueError("QDRANT_UPSERT_BATCH_SIZE must be greater than 0")
+        if self.qdrant_upsert_parallelism <= 0:
+            raise ValueError("QDRANT_UPSERT_PARALLELISM must be greater than 0")
+        if self.qdrant_upsert_method not in ("upsert", "upload_points"):
+            raise ValueError("QDRANT_UPSERT_METHOD must be 'upsert' or 'upload_points'")
\ No newline at end of file
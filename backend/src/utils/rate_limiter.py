@@ -0,0 +1,110 @@
+"""
+Rate Limiter Module
+
+This module provides an async token-bucket rate limiter and a registry of limiters
+keyed by upstream, so every component calling the same API shares one budget.
+"""
+import asyncio
+import time
+from typing import Dict, Optional
+from .logger import app_logger
+
+
+class TokenBucketLimiter:
+    """
+    Class implementing an async token bucket.
+
+    Tokens refill continuously at rate_per_minute up to capacity (the burst size).
+    Each call to acquire() takes `cost` tokens, waiting until enough are available.
+    Waiters are served in arrival order, so concurrent callers are spaced out
+    instead of all firing at once.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = 1.0):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be greater than 0")
+        if capacity <= 0:
+            raise ValueError("capacity must be greater than 0")
+
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity
+        self._rate_per_second = rate_per_minute / 60.0
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _refill(self):
+        """Add the tokens accumulated since the last update."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self._rate_per_second)
+        self._updated_at = now
+
+    def _get_lock(self) -> asyncio.Lock:
+        """
+        Get the lock serializing waiters, recreating it if the event loop changed.
+
+        Returns:
+            Lock bound to the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    async def acquire(self, cost: float = 1.0):
+        """
+        Wait until `cost` tokens are available and take them.
+
+        A cost larger than the capacity waits for a full bucket and leaves the bucket
+        in debt, so oversized requests are still admitted at the configured rate.
+
+        Args:
+            cost: Number of tokens to take (e.g. 1 per request, or 1 per text embedded)
+        """
+        async with self._get_lock():
+            self._refill()
+            needed = min(cost, self.capacity)
+            if self._tokens < needed:
+                wait_time = (needed - self._tokens) / self._rate_per_second
+                await asyncio.sleep(wait_time)
+                self._refill()
+
+            self._tokens -= cost
+
+    def available_tokens(self) -> float:
+        """
+        Get the number of tokens currently available.
+
+        Returns:
+            Available tokens (negative while the bucket is in debt)
+        """
+        self._refill()
+        return self._tokens
+
+
+_limiters: Dict[str, TokenBucketLimiter] = {}
+
+
+def get_limiter(name: str, rate_per_minute: float, capacity: float = 1.0) -> TokenBucketLimiter:
+    """
+    Get the shared limiter for an upstream, creating it on first use.
+
+    All callers passing the same name share one bucket; the rate and capacity of the
+    first caller win.
+
+    Args:
+        name: Upstream name (e.g. "cohere", "qdrant", "website")
+        rate_per_minute: Sustained rate in tokens per minute
+        capacity: Burst capacity in tokens
+
+    Returns:
+        Shared TokenBucketLimiter for the upstream
+    """
+    limiter = _limiters.get(name)
+    if limiter is None:
+        limiter = TokenBucketLimiter(rate_per_minute, capacity)
+        _limiters[name] = limiter
+        app_logger.debug(f"Created rate limiter '{name}': {rate_per_minute}/min, burst {capacity}")
+    return limiter
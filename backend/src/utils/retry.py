@@ -0,0 +1,181 @@
+"""
+Retry Module
+
+This module provides helpers to retry upstream API calls that fail with throttling,
+server errors or transient network errors, using exponential backoff with full jitter
+and honoring Retry-After headers.
+"""
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional, TypeVar
+import httpx
+from .logger import app_logger
+
+T = TypeVar("T")
+
+# HTTP status codes worth retrying: throttling and transient server errors
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# gRPC status codes worth retrying (Qdrant with QDRANT_PREFER_GRPC)
+RETRYABLE_GRPC_CODES = {"UNAVAILABLE", "DEADLINE_EXCEEDED", "RESOURCE_EXHAUSTED", "ABORTED"}
+
+
+def get_status_code(exc: BaseException) -> Optional[int]:
+    """
+    Get the HTTP status code carried by an API exception.
+
+    Works with Cohere's ApiError (status_code attribute) and httpx.HTTPStatusError
+    (response.status_code).
+
+    Args:
+        exc: Exception raised by an API call
+
+    Returns:
+        HTTP status code, or None if the exception has none
+    """
+    status_code = getattr(exc, "status_code", None)
+    if status_code is None:
+        response = getattr(exc, "response", None)
+        status_code = getattr(response, "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+def is_throttled(exc: BaseException) -> bool:
+    """
+    Check whether an exception means the upstream is rate limiting us.
+
+    Args:
+        exc: Exception raised by an API call
+
+    Returns:
+        True for HTTP 429 responses
+    """
+    return get_status_code(exc) == 429
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Check whether a failed call is worth retrying.
+
+    Exceptions wrapping a transport error in a "source" attribute (as Qdrant's
+    ResponseHandlingException does) are judged by the wrapped error.
+
+    Args:
+        exc: Exception raised by an API call
+
+    Returns:
+        True for throttling, 5xx responses, transient gRPC errors, timeouts and connection errors
+    """
+    status_code = get_status_code(exc)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+
+    # gRPC errors expose their status through code()
+    code = getattr(exc, "code", None)
+    if callable(code):
+        try:
+            return getattr(code(), "name", None) in RETRYABLE_GRPC_CODES
+        except TypeError:
+            pass
+
+    source = getattr(exc, "source", None)
+    if isinstance(source, BaseException) and source is not exc:
+        return is_retryable(source)
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError, ConnectionError))
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """
+    Read the Retry-After header from an API exception.
+
+    Args:
+        exc: Exception raised by an API call
+
+    Returns:
+        Seconds to wait before retrying, or None if the header is missing or invalid
+    """
+    headers = getattr(exc, "headers", None)
+    if headers is None:
+        response = getattr(exc, "response", None)
+        headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = None
+    for key, header_value in headers.items():
+        if key.lower() == "retry-after":
+            value = header_value
+            break
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+
+    # Retry-After may also be an HTTP date
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """
+    Compute an exponential backoff delay with full jitter.
+
+    Args:
+        attempt: Zero-based retry attempt number
+        base_delay: Delay ceiling for the first retry, in seconds
+        max_delay: Maximum delay ceiling, in seconds
+
+    Returns:
+        Random delay between 0 and min(max_delay, base_delay * 2 ** attempt)
+    """
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+async def retry_async(func: Callable[[], Awaitable[T]], max_attempts: int = 5, base_delay: float = 1.0,
+                      max_delay: float = 60.0, on_retry: Optional[Callable[[BaseException], None]] = None,
+                      description: str = "request") -> T:
+    """
+    Call an async function, retrying retryable failures with backoff.
+
+    The wait before each retry is the upstream's Retry-After value when present,
+    otherwise an exponential backoff with full jitter.
+
+    Args:
+        func: Function returning a new awaitable for each attempt
+        max_attempts: Maximum number of attempts, including the first
+        base_delay: Backoff delay ceiling for the first retry, in seconds
+        max_delay: Maximum backoff delay, in seconds
+        on_retry: Optional callback invoked with the exception before each retry
+        description: Short description of the call for log messages
+
+    Returns:
+        Result of the first successful attempt
+
+    Raises:
+        The last exception if it is not retryable or all attempts failed
+    """
+    attempt = 0
+    while True:
+        try:
+            return await func()
+        except Exception as e:
+            attempt += 1
+            if attempt >= max_attempts or not is_retryable(e):
+                raise
+
+            delay = retry_after_seconds(e)
+            if delay is None:
+                delay = backoff_delay(attempt - 1, base_delay, max_delay)
+
+            app_logger.warning(f"{description} failed ({str(e)}), retrying in {delay:.1f}s "
+                               f"(attempt {attempt + 1}/{max_attempts})")
+            if on_retry:
+                on_retry(e)
+            await asyncio.sleep(delay)
@@ -0,0 +1,166 @@
+"""
+Tokenizer Module
+
+This module counts tokens with a Hugging Face tokenizer, loaded once per process
+and shared by every caller, and falls back to a length-based estimate when no
+tokenizer is configured or it cannot be loaded.
+"""
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+from .logger import app_logger
+from .config import Config
+
+try:
+    from tokenizers import Tokenizer
+    TOKENIZERS_AVAILABLE = True
+except ImportError:
+    TOKENIZERS_AVAILABLE = False
+
+# Rough average characters per token for English text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Approximate token count (about four characters per token)
+    """
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+class TokenCounter:
+    """
+    Class counting tokens for batches of texts.
+
+    With a tokenizer, counts are exact and a whole batch is encoded in one call
+    (parallelized natively by the tokenizers library). Without one, counts are
+    estimated from text length.
+    """
+
+    def __init__(self, tokenizer=None):
+        self.tokenizer = tokenizer
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether counts come from a real tokenizer rather than an estimate."""
+        return self.tokenizer is not None
+
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        """
+        Count the tokens of each text.
+
+        Args:
+            texts: Texts to measure
+
+        Returns:
+            Token count of each text, in input order
+        """
+        if not texts:
+            return []
+        if self.tokenizer is None:
+            return [estimate_tokens(text) for text in texts]
+
+        encodings = self.tokenizer.encode_batch(texts, add_special_tokens=False)
+        return [len(encoding.ids) for encoding in encodings]
+
+    def split_text(self, text: str, max_tokens: int) -> List[str]:
+        """
+        Split a text into pieces of at most about max_tokens tokens.
+
+        Cuts fall on the last space before the token limit when there is one.
+
+        Args:
+            text: Text to split
+            max_tokens: Maximum tokens per piece
+
+        Returns:
+            Non-empty pieces, in order
+        """
+        # Character offset where each token starts
+        if self.tokenizer is None:
+            token_starts = list(range(0, len(text), CHARS_PER_TOKEN))
+        else:
+            encoding = self.tokenizer.encode(text, add_special_tokens=False)
+            token_starts = [start for start, _ in encoding.offsets]
+
+        pieces = []
+        piece_start = 0
+        token_index = max_tokens
+        while token_index < len(token_starts):
+            cut = token_starts[token_index]
+            space = text.rfind(" ", piece_start, cut + 1)
+            if space > piece_start:
+                cut = space
+            if cut <= piece_start:
+                token_index += 1
+                continue
+
+            pieces.append(text[piece_start:cut])
+            piece_start = cut
+            token_index = bisect_left(token_starts, piece_start) + max_tokens
+        pieces.append(text[piece_start:])
+
+        return [piece.strip() for piece in pieces if piece.strip()]
+
+
+_counters: Dict[Tuple[str, str], TokenCounter] = {}
+
+
+def _load_tokenizer(tokenizer_path: str, tokenizer_name: str):
+    """
+    Load a tokenizer from a local tokenizer.json file or the Hugging Face Hub.
+
+    Loading by name downloads the tokenizer from the Hub (cached locally afterwards),
+    so it needs network access; use TOKENIZER_PATH for offline runs.
+
+    Args:
+        tokenizer_path: Path to a tokenizer.json file (takes precedence)
+        tokenizer_name: Hugging Face Hub model id, fetched over the network
+
+    Returns:
+        Tokenizer, or None if none is configured or it could not be loaded
+    """
+    if not tokenizer_path and not tokenizer_name:
+        return None
+    if not TOKENIZERS_AVAILABLE:
+        app_logger.warning("tokenizers is not installed, estimating token counts from text length")
+        return None
+
+    source = tokenizer_path or tokenizer_name
+    try:
+        if tokenizer_path:
+            tokenizer = Tokenizer.from_file(tokenizer_path)
+        else:
+            tokenizer = Tokenizer.from_pretrained(tokenizer_name)
+    except Exception as e:
+        app_logger.warning(f"Could not load tokenizer '{source}', estimating token counts from text length: {str(e)}")
+        return None
+
+    # Count every token, whatever the tokenizer file was saved with
+    tokenizer.no_truncation()
+    tokenizer.no_padding()
+    app_logger.info(f"Loaded tokenizer '{source}'")
+    return tokenizer
+
+
+def get_token_counter(config: Config) -> TokenCounter:
+    """
+    Get the shared token counter for the configured tokenizer, loading it on first use.
+
+    Args:
+        config: Configuration object (TOKENIZER_PATH, TOKENIZER_NAME)
+
+    Returns:
+        Shared TokenCounter
+    """
+    key = (config.tokenizer_path, config.tokenizer_name)
+    counter = _counters.get(key)
+    if counter is None:
+        counter = TokenCounter(_load_tokenizer(*key))
+        _counters[key] = counter
+    return counter
@@ -143,38 +143,39 @@ class ApiService {
   }
 
   /**
-   * Send a streaming query to the backend (if supported)
+   * Send a streaming query to the backend over Server-Sent Events
    * @param {string} query - The user's question
    * @param {string|null} context - Optional context from selected text
-   * @param {Function} onMessage - Callback for each message chunk
-   * @param {Function} onError - Callback for errors
-   * @returns {Promise<void>}
+   * @param {Object} handlers - Callbacks for stream events
+   * @param {Function} handlers.onSources - Called with the retrieved sources
+   * @param {Function} handlers.onToken - Called with each chunk of answer text
+   * @param {Function} handlers.onMetadata - Called with the response metadata when the answer is complete
+   * @returns {Promise<boolean>} True if any answer text was received; throws if the stream could not be used
    */
-  async askQuestionStreaming(query, context = null, onMessage, onError) {
-    try {
-      // Prepare the payload
-      const payload = {
-        query: query,
-        ...(context && { context: context }),
-        stream: true // Indicate that we want a streaming response
-      };
+  async askQuestionStreaming(query, context = null, handlers = {}) {
+    const { onSources = () => {}, onToken = () => {}, onMetadata = () => {} } = handlers;
 
-      // Check if the browser supports fetch with streaming
-      if (!window.ReadableStream) {
-        throw new Error('Streaming is not supported in this browser');
-      }
+    // Prepare the payload
+    const payload = {
+      query: query,
+      ...(context && { context: context })
+    };
 
-      const controller = new AbortController();
-      const timeoutId = setTimeout(() => controller.abort(), 60000); // 60 second timeout for mobile
+    // Check if the browser supports fetch with streaming
+    if (!window.ReadableStream || !window.TextDecoder) {
+      throw new Error('Streaming is not supported in this browser');
+    }
 
-      // Mobile-optimized headers and request options
-      const response = await fetch(`${this.baseURL}/chat`, {
+    const controller = new AbortController();
+    const timeoutId = setTimeout(() => controller.abort(), 60000); // 60 second timeout for mobile
+
+    try {
+      const response = await fetch(`${this.baseURL}/chat/stream`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
-          'Accept': 'application/json',
+          'Accept': 'text/event-stream',
           'X-Requested-With': 'XMLHttpRequest',
-          // Additional headers that help with mobile connectivity
           'Cache-Control': 'no-cache',
           'X-Client-Type': 'web-app',
           'X-Device-Type': /mobile|android|iphone|ipad/i.test(navigator.userAgent) ? 'mobile' : 'desktop'
@@ -183,36 +184,66 @@ class ApiService {
         signal: controller.signal,
         mode: 'cors',
         cache: 'no-store',
-        credentials: 'omit',
-        // Keep connection alive for mobile
-        keepalive: true
+        credentials: 'omit'
       });
 
-      clearTimeout(timeoutId);
-
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error(`Backend error: ${response.status} - ${response.statusText}`);
       }
 
-      // Handle streaming response
       const reader = response.body.getReader();
       const decoder = new TextDecoder();
+      let buffer = '';
+      let receivedText = false;
+
+      // Dispatch one SSE event ("event: name" and "data: json" lines)
+      const dispatchEvent = (rawEvent) => {
+        let eventName = 'message';
+        const dataLines = [];
+        rawEvent.split('\n').forEach((line) => {
+          if (line.startsWith('event:')) {
+            eventName = line.slice(6).trim();
+          } else if (line.startsWith('data:')) {
+            dataLines.push(line.slice(5).trimStart());
+          }
+        });
+        if (dataLines.length === 0) return;
+
+        const data = JSON.parse(dataLines.join('\n'));
+        if (eventName === 'sources') {
+          onSources(data);
+        } else if (eventName === 'token') {
+          receivedText = true;
+          onToken(data.text);
+        } else if (eventName === 'metadata') {
+          onMetadata(data);
+        } else if (eventName === 'error') {
+          throw new Error(data.message || ERROR_MESSAGES.GENERAL_ERROR);
+        }
+      };
 
       let done = false;
       while (!done) {
         const { value, done: readerDone } = await reader.read();
         done = readerDone;
+        buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
 
-        if (value) {
-          const chunk = decoder.decode(value, { stream: true });
-          // Process the chunk - this would depend on your backend's streaming format
-          // For now, we'll just send the chunk as-is
-          onMessage(chunk);
+        // Events are separated by a blank line
+        let separatorIndex;
+        while ((separatorIndex = buffer.indexOf('\n\n')) !== -1) {
+          const rawEvent = buffer.slice(0, separatorIndex);
+          buffer = buffer.slice(separatorIndex + 2);
+          dispatchEvent(rawEvent);
         }
       }
-    } catch (error) {
-      console.error('Error in streaming askQuestion:', error);
-      onError(error.message);
+
+      if (buffer.trim()) {
+        dispatchEvent(buffer);
+      }
+
+      return receivedText;
+    } finally {
+      clearTimeout(timeoutId);
     }
   }
 
@@ -8,6 +8,7 @@ const ChatInterface = ({ backendUrl = 'http://localhost:8000' }) => {
   const [messages, setMessages] = useState([]);
   const [inputValue, setInputValue] = useState('');
   const [isLoading, setIsLoading] = useState(false);
+  const [streamingMessageId, setStreamingMessageId] = useState(null);
   const [selectedText, setSelectedText] = useState('');
   const [connectionStatus, setConnectionStatus] = useState(CONNECTION_STATUS.CONNECTED);
   const [retryCount, setRetryCount] = useState(0);
@@ -80,6 +81,51 @@ const ChatInterface = ({ backendUrl = 'http://localhost:8000' }) => {
     };
   }, []);
 
+  // Function to stream an answer from the backend, updating the bot message as tokens arrive.
+  // Returns false if nothing was received, so the caller can fall back to the JSON endpoint.
+  const streamAnswer = async (query, context) => {
+    const botMessageId = Date.now() + 1;
+    let started = false;
+
+    const updateBotMessage = (update) => {
+      if (!started) {
+        started = true;
+        setStreamingMessageId(botMessageId);
+        setMessages(prev => [...prev, {
+          id: botMessageId,
+          text: '',
+          sender: 'bot',
+          timestamp: new Date().toISOString(),
+          metadata: null,
+          sources: null
+        }]);
+      }
+      setMessages(prev => prev.map(message => (message.id === botMessageId ? update(message) : message)));
+    };
+
+    try {
+      const receivedText = await apiService.askQuestionStreaming(query, context, {
+        onSources: (sources) => updateBotMessage(message => ({ ...message, sources })),
+        onToken: (text) => updateBotMessage(message => ({ ...message, text: message.text + text })),
+        onMetadata: (metadata) => updateBotMessage(message => ({ ...message, metadata }))
+      });
+      if (!receivedText && started) {
+        setMessages(prev => prev.filter(message => message.id !== botMessageId));
+      }
+      return receivedText;
+    } catch (error) {
+      if (!started) {
+        console.log('Streaming unavailable, falling back to standard request:', error.message);
+        return false;
+      }
+      // Drop the partial answer and report the error as usual
+      setMessages(prev => prev.filter(message => message.id !== botMessageId));
+      throw error;
+    } finally {
+      setStreamingMessageId(null);
+    }
+  };
+
   // Function to send message to backend
   const sendMessage = async (query, context = null) => {
     if (!query.trim() && !context) return;
@@ -103,7 +149,16 @@ const ChatInterface = ({ backendUrl = 'http://localhost:8000' }) => {
     setMessages(prev => [...prev, userMessage]);
 
     try {
-      // Call the backend API using the service
+      // Stream the answer so text appears as soon as it is generated
+      const streamed = await streamAnswer(query, context);
+      if (streamed) {
+        if (connectionManager.current) {
+          connectionManager.current.updateStatus(CONNECTION_STATUS.CONNECTED, 'Message sent successfully');
+        }
+        return;
+      }
+
+      // Fall back to the JSON endpoint if streaming is unavailable
       const result = await apiService.askQuestion(query, context);
 
       if (result.success) {
@@ -307,7 +362,7 @@ const ChatInterface = ({ backendUrl = 'http://localhost:8000' }) => {
             </div>
           ))
         )}
-        {isLoading && (
+        {isLoading && !streamingMessageId && (
           <div className="message bot loading">
             <div className="message-content">
               <div className="typing-indicator">
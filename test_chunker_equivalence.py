@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Property test verifying the linear-time chunker produces exactly the same chunks
+as the original sentence-concatenating implementation
+"""
+import os
+import sys
+import random
+import re
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+# The chunker only needs configuration values; no external services are used
+os.environ.setdefault("COHERE_API_KEY", "test")
+os.environ.setdefault("QDRANT_URL", "http://localhost:6333")
+os.environ.setdefault("QDRANT_API_KEY", "test")
+os.environ.setdefault("PHYSICAL_AI_BOOK_BASE_URL", "https://example.github.io/physical-ai-book/")
+
+from backend.src.processor.chunker import ContentChunker
+from backend.src.utils.config import Config
+
+WORDS = ["robot", "humanoid", "ROS", "2", "node", "topic", "Isaac", "Sim", "e.g.", "VSLAM", "Nav2", "3.14"]
+ENDINGS = [".", "!", "?", "", ",", ":"]
+SEPARATORS = [" ", "  ", "\n", "\n\n", "\t"]
+
+
+class ReferenceChunker:
+    """The original chunking algorithm, kept as the reference for equivalence."""
+
+    def __init__(self, chunk_size: int, chunk_overlap: int):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def split_into_sentences(self, content):
+        sentences = re.split(r'(?<=[.!?])\s+', content)
+        return [sentence.strip() for sentence in sentences if sentence.strip()]
+
+    def create_chunks(self, sentences):
+        chunks = []
+        current_chunk = ""
+        current_length = 0
+        sentence_idx = 0
+
+        while sentence_idx < len(sentences):
+            sentence = sentences[sentence_idx]
+            sentence_length = len(sentence.split())
+
+            if current_length + sentence_length <= self.chunk_size or current_chunk == "":
+                if current_chunk:
+                    current_chunk += " " + sentence
+                else:
+                    current_chunk = sentence
+                current_length += sentence_length
+                sentence_idx += 1
+            else:
+                chunks.append((current_chunk, sentence_idx))
+
+                if self.chunk_overlap > 0 and sentence_idx > 0:
+                    overlap_sentences = self.get_overlap_sentences(sentences, sentence_idx)
+                    current_chunk = " ".join(overlap_sentences) + " " + sentence
+                    current_length = len(current_chunk.split())
+                    sentence_idx += 1
+                else:
+                    current_chunk = sentence
+                    current_length = sentence_length
+                    sentence_idx += 1
+
+        if current_chunk:
+            chunks.append((current_chunk, sentence_idx))
+
+        return chunks
+
+    def get_overlap_sentences(self, sentences, current_idx):
+        overlap_sentences = []
+        words_count = 0
+
+        for i in range(current_idx - 1, max(-1, current_idx - 5), -1):
+            sentence = sentences[i]
+            sentence_words = len(sentence.split())
+            if words_count + sentence_words <= self.chunk_overlap:
+                overlap_sentences.insert(0, sentence)
+                words_count += sentence_words
+            else:
+                break
+
+        return overlap_sentences
+
+
+def random_content(rng: random.Random) -> str:
+    """Generate text with sentences of varied length, including sentences longer than a chunk."""
+    parts = []
+    for _ in range(rng.randint(0, 60)):
+        length = rng.choice([1, 2, 3, 5, 8, 13, 40, 120])
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, length)))
+        parts.append(sentence + rng.choice(ENDINGS) + rng.choice(SEPARATORS))
+    return "".join(parts)
+
+
+def test_chunker_equivalence(iterations: int = 3000, seed: int = 20):
+    """Compare chunk texts, ids and positions for random content and chunk settings."""
+    rng = random.Random(seed)
+    config = Config()
+    chunker = ContentChunker(config)
+
+    for iteration in range(iterations):
+        config.chunk_size = rng.choice([1, 3, 10, 25, 50, 100, 512])
+        config.chunk_overlap = rng.choice([0, 1, 5, 10, 50, config.chunk_size])
+        content = random_content(rng)
+        metadata = {"url": f"https://example.com/{iteration}"}
+
+        chunks = chunker.chunk_content(content, metadata)
+        reference = ReferenceChunker(config.chunk_size, config.chunk_overlap)
+        sentences = reference.split_into_sentences(content) if content else []
+        expected = reference.create_chunks(sentences)
+
+        actual = [(chunk["text"], chunk["metadata"]["chunk_position"]) for chunk in chunks]
+        assert actual == expected, (
+            f"Chunks differ (iteration {iteration}, chunk_size={config.chunk_size}, "
+            f"chunk_overlap={config.chunk_overlap}): {content!r}"
+        )
+        assert [chunk["chunk_id"] for chunk in chunks] == [f"chunk_{i}" for i in range(len(chunks))]
+        assert all(chunk["metadata"]["total_content_segments"] == len(sentences) for chunk in chunks)
+        assert all(chunk["metadata"]["url"] == metadata["url"] for chunk in chunks)
+
+    print(f"[OK] Chunker output matches the reference implementation on {iterations} random inputs")
+
+
+if __name__ == "__main__":
+    test_chunker_equivalence()
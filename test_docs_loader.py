@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script verifying the local docs loader maps Markdown files to their published
+Docusaurus URLs and parses them into sections
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+# The loader only needs configuration values; no external services are used
+os.environ.setdefault("COHERE_API_KEY", "test")
+os.environ.setdefault("QDRANT_URL", "http://localhost:6333")
+os.environ.setdefault("QDRANT_API_KEY", "test")
+os.environ["PHYSICAL_AI_BOOK_BASE_URL"] = "https://usmanrazansari.github.io/physical-ai-book/"
+
+from backend.src.crawler.docs_loader import DocsLoader, parse_front_matter
+from backend.src.utils.config import Config
+
+SITE = "https://usmanrazansari.github.io/physical-ai-book/docs"
+
+SAMPLE_DOC = """---
+title: "Sample Chapter"
+sidebar_position: 2
+---
+
+import Tabs from '@theme/Tabs';
+
+Intro with a [link](https://example.com), **bold** and `inline code`.
+
+## Setup {#setup}
+
+- First item
+  continues here
+- Second item
+
+```python
+def main():
+    print("hello")
+```
+
+| Column | Value |
+|--------|-------|
+| a      | 1     |
+
+:::note Remember
+Admonition body.
+:::
+"""
+
+
+def test_doc_urls():
+    """Check the Docusaurus routing rules for file paths and front matter."""
+    loader = DocsLoader(Config())
+    cases = [
+        ("intro.md", {}, f"{SITE}/intro/"),
+        ("module-1-ros2/ch1-ros2-architecture.md", {}, f"{SITE}/module-1-ros2/ch1-ros2-architecture/"),
+        ("module-1-ros2/index.md", {"slug": "/module-1-ros2"}, f"{SITE}/module-1-ros2/"),
+        ("01-basics/02-setup.md", {}, f"{SITE}/basics/setup/"),
+        ("01-basics/index.mdx", {}, f"{SITE}/basics/"),
+        ("guides/README.md", {}, f"{SITE}/guides/"),
+        ("guides/guides.md", {}, f"{SITE}/guides/"),
+        ("guides/setup.md", {"id": "install"}, f"{SITE}/guides/install/"),
+        ("guides/setup.md", {"slug": "getting-started"}, f"{SITE}/guides/getting-started/"),
+        ("guides/setup.md", {"slug": "../start"}, f"{SITE}/start/"),
+        ("index.md", {}, f"{SITE}/"),
+    ]
+    for relative_path, front_matter, expected in cases:
+        url = loader.doc_url(relative_path, front_matter)
+        assert url == expected, f"{relative_path} {front_matter}: expected {expected}, got {url}"
+        assert loader.is_doc_url(url), url
+    for url in ("https://usmanrazansari.github.io/physical-ai-book/", f"{SITE}-archive/intro/",
+                "https://usmanrazansari.github.io/physical-ai-book/blog/post/"):
+        assert not loader.is_doc_url(url), url
+    print(f"[OK] {len(cases)} docs map to their published URLs")
+
+
+def test_parse_document():
+    """Parse a sample document into headings, text blocks and code blocks."""
+    front_matter, body = parse_front_matter(SAMPLE_DOC)
+    assert front_matter["title"] == "Sample Chapter" and body.lstrip().startswith("import")
+
+    with tempfile.TemporaryDirectory() as docs_dir:
+        Path(docs_dir, "02-chapter.md").write_text(SAMPLE_DOC, encoding="utf-8")
+        Path(docs_dir, "_partial.md").write_text("# Partial", encoding="utf-8")
+        Path(docs_dir, "draft.md").write_text("---\ndraft: true\n---\n# Draft", encoding="utf-8")
+
+        loader = DocsLoader(Config(), docs_dir)
+        documents = list(loader.iter_documents())
+
+    assert len(documents) == 1, "Partials and drafts should be skipped"
+    document = documents[0]
+    assert document["url"] == f"{SITE}/chapter/"
+    assert document["metadata"]["title"] == "Sample Chapter"
+    assert [heading["text"] for heading in document["metadata"]["headings"]] == ["Sample Chapter", "Setup"]
+
+    sections = [(section["heading_path"], [(block["type"], block["text"]) for block in section["blocks"]])
+                for section in document["sections"]]
+    assert sections == [
+        (["Sample Chapter"], [("text", "Intro with a link, bold and inline code.")]),
+        (["Sample Chapter", "Setup"], [
+            ("text", "First item continues here"),
+            ("text", "Second item"),
+            ("code", 'def main():\n    print("hello")'),
+            ("text", "Column"), ("text", "Value"), ("text", "a"), ("text", "1"),
+            ("text", "Remember"),
+            ("text", "Admonition body.")
+        ])
+    ], sections
+    print("[OK] Markdown is parsed into heading sections with text and code blocks")
+
+
+def test_book_docs():
+    """Load the book's own docs: every page gets a unique URL and keeps its code blocks."""
+    loader = DocsLoader(Config(), os.path.join(os.path.dirname(os.path.abspath(__file__)), "docs"))
+    documents = list(loader.iter_documents())
+    urls = [document["url"] for document in documents]
+    assert documents and len(set(urls)) == len(urls)
+
+    for document in documents:
+        source = (loader.docs_dir / document["metadata"]["source_path"]).read_text(encoding="utf-8")
+        code_blocks = sum(1 for section in document["sections"] for block in section["blocks"]
+                          if block["type"] == "code")
+        assert code_blocks == source.count("```") // 2, document["url"]
+    print(f"[OK] Loaded {len(documents)} book docs")
+
+
+if __name__ == "__main__":
+    test_doc_urls()
+    test_parse_document()
+    test_book_docs()
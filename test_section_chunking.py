@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script verifying pages are extracted into heading sections and chunked by
+section, with code blocks kept whole and every chunk within chunk_size
+"""
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+# The extractor and chunker only need configuration values; no external services are used
+os.environ.setdefault("COHERE_API_KEY", "test")
+os.environ.setdefault("QDRANT_URL", "http://localhost:6333")
+os.environ.setdefault("QDRANT_API_KEY", "test")
+os.environ.setdefault("PHYSICAL_AI_BOOK_BASE_URL", "https://example.github.io/physical-ai-book/")
+
+from backend.src.processor.chunker import ContentChunker
+from backend.src.processor.text_extractor import TextExtractor, SELECTOLAX_AVAILABLE, LXML_AVAILABLE
+from backend.src.utils.config import Config
+
+CODE = 'def main():\n    node = Node("talker")\n\n    rclpy.spin(node)'
+
+SAMPLE_PAGE = f"""<html><head><title>ROS 2 Nodes</title></head><body>
+<nav>Navigation links</nav>
+<main><article>
+<h1>ROS 2 Nodes<a class="hash-link" href="#nodes">​</a></h1>
+<p>A node is a process that performs computation.</p>
+<h2>Publishers</h2>
+<p>Publishers send messages on a topic.</p>
+<pre><code>{CODE}</code></pre>
+<h3>Quality of Service</h3>
+<ul><li>Reliable delivery.</li><li>Best effort delivery.</li></ul>
+<h2>Subscribers</h2>
+<p>Subscribers receive messages.</p>
+<footer class="theme-doc-footer">Edit this page</footer>
+<div class="theme-doc-toc">On this page</div>
+</article></main>
+<footer>Copyright</footer>
+</body></html>"""
+
+EXPECTED_SECTIONS = [
+    (["ROS 2 Nodes"], [("text", "A node is a process that performs computation.")]),
+    (["ROS 2 Nodes", "Publishers"], [("text", "Publishers send messages on a topic."), ("code", CODE)]),
+    (["ROS 2 Nodes", "Publishers", "Quality of Service"], [("text", "Reliable delivery."),
+                                                           ("text", "Best effort delivery.")]),
+    (["ROS 2 Nodes", "Subscribers"], [("text", "Subscribers receive messages.")]),
+]
+
+
+def make_chunker(chunk_size: int, chunk_overlap: int) -> ContentChunker:
+    config = Config()
+    config.chunk_size = chunk_size
+    config.chunk_overlap = chunk_overlap
+    return ContentChunker(config)
+
+
+def sentence(index: int) -> str:
+    return f"Sentence {index} explains how the robot plans its next motion."
+
+
+def test_extract_sections():
+    """Every installed parser backend produces the same heading sections."""
+    parsers = ["html.parser"] + (["lxml"] if LXML_AVAILABLE else []) + (["selectolax"] if SELECTOLAX_AVAILABLE else [])
+    for parser in parsers:
+        config = Config()
+        config.html_parser = parser
+        document = TextExtractor(config).extract_sections(SAMPLE_PAGE, "https://example.com/nodes/")
+        sections = [(section["heading_path"], [(block["type"], block["text"]) for block in section["blocks"]])
+                    for section in document["sections"]]
+        assert sections == EXPECTED_SECTIONS, f"{parser}: {sections}"
+        assert "Navigation" not in document["text"] and "Edit this page" not in document["text"] \
+            and "On this page" not in document["text"], parser
+    print(f"[OK] Sections match across parser backends: {', '.join(parsers)}")
+
+
+def test_heading_paths_and_code():
+    """Chunks start with their heading path and code blocks are never split."""
+    document = TextExtractor(Config()).extract_sections(SAMPLE_PAGE, "https://example.com/nodes/")
+    chunks = make_chunker(12, 4).chunk_sections(document["sections"], document["metadata"])
+
+    assert chunks[0]["text"] == "ROS 2 Nodes\n\nA node is a process that performs computation."
+    assert chunks[0]["metadata"]["heading_path"] == ["ROS 2 Nodes"]
+    for chunk in chunks:
+        heading = " > ".join(chunk["metadata"]["heading_path"])
+        assert chunk["text"].startswith(heading + "\n\n"), chunk["text"]
+    assert sum(chunk["text"].count(CODE) for chunk in chunks) == 1, "The code block should stay whole"
+    assert [chunk["chunk_id"] for chunk in chunks] == [f"chunk_{index}" for index in range(len(chunks))]
+    print(f"[OK] {len(chunks)} chunks start with their heading path and keep code whole")
+
+
+def test_merge_small_sections():
+    """Small sibling sections are merged under their common heading."""
+    sections = [
+        {"heading_path": ["Guide"], "blocks": [{"type": "text", "text": "Intro."}]},
+        {"heading_path": ["Guide", "Install"], "blocks": [{"type": "text", "text": "Run the installer."}]},
+        {"heading_path": ["Guide", "Usage"], "blocks": [{"type": "text", "text": "Start the node."}]},
+    ]
+    chunks = make_chunker(512, 50).chunk_sections(sections, {"url": "https://example.com/guide/"})
+
+    assert len(chunks) == 1
+    assert chunks[0]["text"] == "Guide\n\nIntro.\n\nInstall\n\nRun the installer.\n\nUsage\n\nStart the node."
+    assert chunks[0]["metadata"]["heading_path"] == ["Guide"]
+    assert chunks[0]["metadata"]["section_index"] == 0 and chunks[0]["metadata"]["section_count"] == 3
+    print("[OK] Small sibling sections are merged into one chunk")
+
+
+def test_split_oversized_section():
+    """An oversized section is split with overlap and no chunk exceeds chunk_size."""
+    text = " ".join(sentence(index) for index in range(40))
+    sections = [{"heading_path": ["Motion", "Planning"], "blocks": [{"type": "text", "text": text}]}]
+    chunk_size = 50
+    chunks = make_chunker(chunk_size, 15).chunk_sections(sections, {"url": "https://example.com/motion/"})
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk["text"].startswith("Motion > Planning\n\n")
+        assert len(chunk["text"].split()) <= chunk_size, len(chunk["text"].split())
+    for previous, current in zip(chunks, chunks[1:]):
+        last_sentence = previous["text"].rsplit(". ", 1)[-1]
+        assert last_sentence in current["text"], "Consecutive chunks should overlap"
+    print(f"[OK] Oversized section split into {len(chunks)} overlapping chunks within chunk_size")
+
+
+def test_chunk_size_with_headings():
+    """Heading separators and merged subheadings count towards chunk_size."""
+    sections = [{"heading_path": ["Part A", "Chapter B", f"Topic {index}"],
+                 "blocks": [{"type": "text", "text": sentence(index)}]} for index in range(30)]
+    for chunk_size in (16, 32, 64):
+        chunks = make_chunker(chunk_size, 8).chunk_sections(sections, {"url": "https://example.com/a/"})
+        longest = max(len(chunk["text"].split()) for chunk in chunks)
+        assert longest <= chunk_size, f"chunk_size {chunk_size}: longest chunk has {longest} words"
+    print("[OK] Chunks with heading paths stay within chunk_size")
+
+
+def test_empty_page():
+    """A page without content sections has no chunks."""
+    document = TextExtractor(Config()).extract_sections(
+        "<html><body><main><nav>only nav</nav></main></body></html>", "https://example.com/empty/")
+    assert document["sections"] == []
+    assert make_chunker(512, 50).chunk_sections(document["sections"], document["metadata"]) == []
+    print("[OK] Empty pages produce no chunks")
+
+
+if __name__ == "__main__":
+    test_extract_sections()
+    test_heading_paths_and_code()
+    test_merge_small_sections()
+    test_split_oversized_section()
+    test_chunk_size_with_headings()
+    test_empty_page()
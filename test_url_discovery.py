@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script verifying sitemap-mode URL discovery also finds pages the sitemap does
+not list, by crawling links from the listed pages
+"""
+import asyncio
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+# Discovery runs against a fake fetcher; no network or browser is used
+os.environ.setdefault("COHERE_API_KEY", "test")
+os.environ.setdefault("QDRANT_URL", "http://localhost:6333")
+os.environ.setdefault("QDRANT_API_KEY", "test")
+os.environ["PHYSICAL_AI_BOOK_BASE_URL"] = "https://usmanrazansari.github.io/physical-ai-book/"
+
+from backend.src.crawler.url_discovery import URLDiscoverer
+from backend.src.utils.config import Config
+
+SITE = "https://usmanrazansari.github.io/physical-ai-book"
+
+SITEMAP = f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+<url><loc>{SITE}/</loc></url>
+<url><loc>{SITE}/docs/intro/</loc><lastmod>2025-01-01</lastmod></url>
+</urlset>""".encode("utf-8")
+
+PAGES = {
+    f"{SITE}/": f'<a href="{SITE}/docs/intro/">Intro</a>',
+    f"{SITE}/docs/intro/": '<a href="../unlisted/">Unlisted</a> <a href="https://other.example.com/">Other</a>',
+    f"{SITE}/docs/unlisted/": '<a href="../intro/#setup">Back</a>',
+}
+
+
+class FakeHTTPFetcher:
+    """Serves the sitemap in small chunks, like a streamed response."""
+
+    async def iter_bytes(self, url: str):
+        if url.endswith("sitemap.xml"):
+            for start in range(0, len(SITEMAP), 64):
+                yield SITEMAP[start:start + 64]
+
+
+class FakeHTMLFetcher:
+    """Serves the fake site's pages and records which ones were fetched."""
+
+    def __init__(self):
+        self.http_fetcher = FakeHTTPFetcher()
+        self.fetched = []
+
+    async def fetch_html(self, url: str):
+        self.fetched.append(url)
+        return PAGES.get(url)
+
+    async def close(self):
+        pass
+
+
+def test_sitemap_discovery_finds_unlisted_pages():
+    """A page linked from a listed page but missing from the sitemap is discovered."""
+    config = Config()
+    config.sitemap_url = f"{SITE}/sitemap.xml"
+    fetcher = FakeHTMLFetcher()
+    discoverer = URLDiscoverer(config, html_fetcher=fetcher)
+
+    notified = []
+
+    async def on_discovered(url: str):
+        notified.append(url)
+
+    urls = asyncio.run(discoverer.discover_urls(max_depth=2, num_workers=2, mode="sitemap",
+                                                on_discovered=on_discovered))
+
+    assert urls == {f"{SITE}/", f"{SITE}/docs/intro/", f"{SITE}/docs/unlisted/"}, urls
+    assert notified[:2] == [f"{SITE}/", f"{SITE}/docs/intro/"], "Sitemap pages should be passed on first"
+    assert sorted(notified) == sorted(urls), "Every page should be passed on exactly once"
+    assert discoverer.url_lastmod[f"{SITE}/docs/intro/"] == "2025-01-01"
+    assert len(fetcher.fetched) == len(set(fetcher.fetched)), "No page should be fetched twice"
+    print(f"[OK] Sitemap discovery found {len(urls)} pages, including one the sitemap does not list")
+
+
+if __name__ == "__main__":
+    test_sitemap_discovery_finds_unlisted_pages()